@@ -16,7 +16,7 @@ router.include_router(
     documents.router
 )
 
-# Tasks: /tasks/{task_id}
+# Tasks: /tasks/{task_id}, /tasks/status
 router.include_router(
     tasks.router
 )
\ No newline at end of file
@@ -1,6 +1,6 @@
 import logging
 from fastapi import Depends, HTTPException, APIRouter, Request, Body
-from app.infrastructure.db.models import User
+from app.domain.principal import Principal
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 from app.api.v1.schemas import RegisterRequest, LoginRequest
@@ -9,7 +9,7 @@ from app.application.use_case.auth import delete_user as delete_user_uc
 from app.infrastructure.auth.dependencies import get_current_user
 from app.infrastructure.db.session import get_session
 from app.application.use_case.auth import register_user as register_uc, login as login_uc
-from app.domain.exceptions import AuthenticationFailed
+from app.domain.exceptions import AuthenticationFailed, ServiceOverloaded
 from app.core.limiter import limiter
 
 # Initialize logger for security and audit events
@@ -47,6 +47,13 @@ async def register_user_route(
     except AuthenticationFailed as e:
         # Handles 'User already exists' gracefully
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ServiceOverloaded as e:
+        # The bcrypt pool is saturated (e.g., a login storm); ask the client to back off
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Auth Critical: Registration error for {body.email}: {str(e)}")
         raise HTTPException(
@@ -80,6 +87,12 @@ async def login_user_route(
             status_code=status.HTTP_401_UNAUTHORIZED, 
             detail="Invalid email or password"
         )
+    except ServiceOverloaded as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Auth Critical: Login error for {body.email}: {str(e)}")
         raise HTTPException(
@@ -93,7 +106,7 @@ async def change_password_route(
     old_password: str = Body(...),
     new_password: str = Body(...),
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),  # fetched from JWT
+    current_user: Principal = Depends(get_current_user),  # fetched from JWT
 ):
     """
     Allows the currently logged-in user to update their password.
@@ -114,6 +127,12 @@ async def change_password_route(
     
     except HTTPException:
         raise
+    except ServiceOverloaded as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Auth Critical: Change password failed for {current_user.email}: {e}")
         raise HTTPException(
@@ -126,7 +145,7 @@ async def change_password_route(
 async def delete_account_route(
     request: Request,
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Deletes or deactivates the current user's account.
@@ -141,6 +160,12 @@ async def delete_account_route(
     
     except HTTPException:
         raise
+    except ServiceOverloaded as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Auth Critical: Delete account failed for {current_user.email}: {e}")
         raise HTTPException(
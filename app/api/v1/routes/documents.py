@@ -1,5 +1,7 @@
 import logging
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Request
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Request, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 from sqlalchemy import select
@@ -8,6 +10,8 @@ from app.infrastructure.db.session import get_session
 from app.infrastructure.auth.dependencies import get_current_user
 from app.application.use_case.upload_document import handle_upload
 from app.application.use_case.process_document import queue_processing
+from app.application.use_case.list_documents import list_documents, InvalidCursor
+from app.api.v1.schemas import DocumentListResponse
 from app.domain.services.storage_interface import StorageInterface
 from app.dependencies import get_storage_service
 from app.core.security import validate_file_content
@@ -107,16 +111,37 @@ async def get_document(
         "created_at": doc.created_at
     }
 
-@router.get("/")
+@router.get("/", response_model=DocumentListResponse, response_model_exclude_none=True)
 async def list_my_documents(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="'next_cursor' from the previous page"),
+    status_filter: Optional[str] = Query(None, alias="status", description="PENDING, PROCESSING, COMPLETED or FAILED"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    include_analysis: bool = False,
+    include_raw_text: bool = False,
     session: AsyncSession = Depends(get_session),
     user = Depends(get_current_user)
 ):
     """
-    List all documents belonging to the logged-in user.
+    List the logged-in user's documents, newest first, one page at a time.
+
+    Dev Note: raw_text can be megabytes per row, so it is left out unless
+    'include_raw_text' is set. Use GET /documents/{id} for a single document.
     """
-    result = await session.execute(
-        select(Document).where(Document.owner_id == user.id)
-    )
-    documents = result.scalars().all()
-    return documents
\ No newline at end of file
+    try:
+        items, next_cursor = await list_documents(
+            session,
+            owner_id=user.id,
+            limit=limit,
+            cursor=cursor,
+            status=status_filter,
+            created_after=created_after,
+            created_before=created_before,
+            include_analysis=include_analysis,
+            include_raw_text=include_raw_text,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return {"items": items, "next_cursor": next_cursor}
@@ -1,7 +1,8 @@
 import logging
 from fastapi import APIRouter, HTTPException, status, Depends
 from app.infrastructure.auth.dependencies import get_current_user
-from app.application.use_case.get_task_status import get_task_status
+from app.application.use_case.get_task_status import get_task_status, get_task_statuses
+from app.api.v1.schemas import TaskStatusRequest, TaskStatusResponse
 
 # Initialize logger for task tracking
 logger = logging.getLogger(__name__)
@@ -11,6 +12,24 @@ router = APIRouter(
     tags=["tasks"]
 )
 
+@router.post("/status", response_model=TaskStatusResponse)
+async def check_task_statuses(body: TaskStatusRequest, user = Depends(get_current_user)):
+    """
+    Batch version of GET /tasks/{task_id} for dashboards polling many tasks.
+
+    Dev Note: All ids are resolved with one MGET on the Celery result backend
+    through the async Redis client, so the event loop is never blocked.
+    """
+    try:
+        return {"tasks": await get_task_statuses(body.task_ids)}
+
+    except Exception as e:
+        logger.error(f"Task API Error: Could not retrieve batch status for {len(body.task_ids)} tasks: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not reach the task tracking service."
+        )
+
 @router.get("/{task_id}")
 async def check_task_status(task_id: str, user = Depends(get_current_user)):
     """
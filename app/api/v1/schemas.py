@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
 from pydantic import BaseModel, Field, EmailStr
 
 # --- AUTHENTICATION SCHEMES ---
@@ -11,3 +14,31 @@ class RegisterRequest(BaseModel):
     """Schema for new user registration."""
     email: EmailStr = Field(..., description="User email address")
     password: str = Field(..., min_length=8, max_length=100)
+
+# --- DOCUMENT SCHEMES ---
+
+class DocumentListItem(BaseModel):
+    """One row of the document listing. raw_text/analysis are only present when requested."""
+    id: UUID
+    file_name: str
+    content: Optional[str] = None
+    status: str
+    url: Optional[str] = None
+    created_at: Optional[datetime] = None
+    analysis: Optional[dict] = None
+    raw_text: Optional[str] = None
+
+class DocumentListResponse(BaseModel):
+    """A page of documents. Pass 'next_cursor' back as ?cursor= to get the next page."""
+    items: list[DocumentListItem]
+    next_cursor: Optional[str] = None
+
+# --- TASK SCHEMES ---
+
+class TaskStatusRequest(BaseModel):
+    """Batch status lookup for up to 100 tasks."""
+    task_ids: list[str] = Field(..., min_length=1, max_length=100)
+
+class TaskStatusResponse(BaseModel):
+    """Compact per-task status map: {task_id: {"status": ..., "result"/"error": ...}}."""
+    tasks: dict[str, dict]
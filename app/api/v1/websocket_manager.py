@@ -1,71 +1,209 @@
 import json
+import asyncio
 import logging
-import redis.asyncio as aioredis
 from fastapi import WebSocket, WebSocketDisconnect
+from redis.exceptions import RedisError
 from app.infrastructure.config import settings
-from typing import Dict
+from app.infrastructure.redis_client import get_async_redis
+from app.infrastructure.queue.events import CHANNEL_PREFIX, parse_event_id, read_task_events
+from typing import Dict, Optional, Set
 
 # Initialize logger for real-time events
 logger = logging.getLogger(__name__)
 
+TERMINAL_STATES = ["COMPLETED", "FAILED", "SUCCESS"]
+# How long a new client waits for the shared subscription before replaying anyway
+SUBSCRIBE_TIMEOUT_SECONDS = 5
+
+
 class ConnectionManager:
-    def __init__(self):
-        # Maps task_id to the active WebSocket connection
-        self.active_connections: Dict[str, WebSocket] = {}
+    """
+    Streams task notifications from Redis to WebSocket clients.
+
+    Workflow:
+    1. One pubsub connection per process, pattern-subscribed to 'notifications_*',
+       is started lazily by the first client.
+    2. Every message is fanned out to the sockets watching that task_id by
+       putting it on each socket's bounded queue (never awaiting a send).
+    3. Each socket drains its own queue, so a slow browser only delays itself.
+       When its queue is full, the oldest pending update is dropped.
+    4. On connect, events the client missed are replayed from the task's
+       Redis Stream first; live events already replayed are skipped by id.
+       The replay only starts once the subscription is confirmed by Redis,
+       so an event is always either in the replay or in the live feed.
+    """
+
+    def __init__(self, redis_factory=get_async_redis, queue_size: int | None = None):
+        # Maps task_id to every WebSocket watching it (several tabs may track one task)
+        self.active_connections: Dict[str, Set[WebSocket]] = {}
+        self._queues: Dict[WebSocket, asyncio.Queue] = {}
+        self._redis_factory = redis_factory
+        self._queue_size = queue_size or settings.ws_queue_size
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed: Optional[asyncio.Event] = None
 
-    async def connect(self, task_id: str, websocket: WebSocket):
-        """Accepts the connection and initiates the Redis subscription loop."""
+    async def connect(self, task_id: str, websocket: WebSocket, last_event_id: Optional[str] = None):
+        """
+        Accepts the connection and streams the task's notifications until a terminal state.
+        'last_event_id' is the last event the client saw; everything after it is replayed.
+        """
         await websocket.accept()
-        self.active_connections[task_id] = websocket
-        logger.info(f"WS: Client connected to track task {task_id}")
-        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        # Register the socket and wait for the subscription BEFORE replaying,
+        # so nothing published between the replay read and the subscription is lost
+        self.active_connections.setdefault(task_id, set()).add(websocket)
+        self._queues[websocket] = queue
+        self._ensure_listener()
+        logger.info(f"WS: Client connected to track task {task_id} (after event {last_event_id})")
+
         try:
-            # Start the listener loop
-            await self.listen_to_redis(task_id, websocket)
+            await self._wait_subscribed(task_id)
+            last_sent = await self._replay(task_id, websocket, last_event_id)
+            if last_sent is not False:
+                await self._pump(task_id, websocket, queue, last_sent)
         except WebSocketDisconnect:
             logger.info(f"WS: Client disconnected from task {task_id}")
         except Exception as e:
             logger.error(f"WS: Unexpected error for task {task_id}: {e}")
         finally:
-            self.disconnect(task_id)
+            self.disconnect(task_id, websocket)
 
-    def disconnect(self, task_id: str):
-        """Removes the connection from the active tracking map."""
-        if task_id in self.active_connections:
+    def disconnect(self, task_id: str, websocket: WebSocket):
+        """Removes one connection from the tracking maps."""
+        self._queues.pop(websocket, None)
+        sockets = self.active_connections.get(task_id)
+        if sockets is None:
+            return
+        sockets.discard(websocket)
+        if not sockets:
             del self.active_connections[task_id]
-            logger.debug(f"WS: Cleaned up connection for task: {task_id}")
+        logger.debug(f"WS: Cleaned up connection for task: {task_id}")
 
-    async def listen_to_redis(self, task_id: str, websocket: WebSocket):
+    def publish_local(self, task_id: str, data: dict):
+        """Fans one notification out to every socket watching task_id. Never blocks."""
+        for websocket in self.active_connections.get(task_id, ()):
+            queue = self._queues.get(websocket)
+            if queue is None:
+                continue
+            if queue.full():
+                # Slow client: drop the oldest pending update, keep the newest
+                queue.get_nowait()
+                logger.warning(f"WS: Client for task {task_id} is falling behind, dropped an update")
+            queue.put_nowait(data)
+
+    async def close(self):
+        """Stops the shared listener (application shutdown)."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _replay(self, task_id: str, websocket: WebSocket, last_event_id: Optional[str]):
         """
-        Subscribes to a Redis channel specific to a task.
-        Streams messages from the Worker directly to the User's browser.
+        Sends the stored events the client hasn't seen.
+        Returns the id of the last event sent, or False if the task already finished.
         """
-        # Connect to Redis using the same URL as Celery
-        redis = aioredis.from_url(settings.redis_url, decode_responses=True)
-        pubsub = redis.pubsub()
-        channel_name = f"notifications_{task_id}"
-        
-        await pubsub.subscribe(channel_name)
+        if last_event_id:
+            try:
+                parse_event_id(last_event_id)
+            except ValueError:
+                logger.warning(f"WS: Ignoring invalid last_event_id {last_event_id!r} for task {task_id}")
+                last_event_id = None
 
         try:
-            # The async iterator handles message retrieval non-blockingly
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    data = json.loads(message["data"])
-                    
-                    # Push data to the UI (e.g., partial summaries or status updates)
-                    await websocket.send_json(data)
-                    
-                    # Self-terminate the connection once the task hits a terminal state
-                    if data.get("status") in ["COMPLETED", "FAILED", "SUCCESS"]:
-                        logger.info(f"WS: Terminal state reached for {task_id}. Closing.")
-                        break
-        finally:
-            # --- CRITICAL CLEANUP ---
-            # Unsubscribing ensures we don't leak memory in the Redis server
-            await pubsub.unsubscribe(channel_name)
-            await redis.close()
-            logger.debug(f"WS: Redis pubsub closed for {task_id}")
+            events = await read_task_events(self._redis_factory(), task_id, after=last_event_id)
+        except RedisError as e:
+            # Replay is best effort; live events still flow
+            logger.error(f"WS: Could not replay events for task {task_id}: {e}")
+            return last_event_id
+
+        for data in events:
+            await websocket.send_json(data)
+            last_event_id = data["event_id"]
+            if data.get("status") in TERMINAL_STATES:
+                logger.info(f"WS: Task {task_id} already finished, replayed {len(events)} events. Closing.")
+                return False
+
+        return last_event_id
+
+    async def _pump(self, task_id: str, websocket: WebSocket, queue: asyncio.Queue, last_sent: Optional[str] = None):
+        last_position = parse_event_id(last_sent) if last_sent else None
+
+        while True:
+            data = await queue.get()
+
+            # Already delivered by the replay
+            if last_position and data.get("event_id"):
+                if parse_event_id(data["event_id"]) <= last_position:
+                    continue
+
+            # Push data to the UI (e.g., partial summaries or status updates)
+            await websocket.send_json(data)
+
+            # Self-terminate the stream once the task hits a terminal state
+            if data.get("status") in TERMINAL_STATES:
+                logger.info(f"WS: Terminal state reached for {task_id}. Closing.")
+                return
+
+    def _ensure_listener(self):
+        if self._listener is None or self._listener.done():
+            self._subscribed = asyncio.Event()
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _wait_subscribed(self, task_id: str):
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), SUBSCRIBE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            # Redis is unreachable: replay what we can, the listener keeps retrying
+            logger.warning(f"WS: Subscription not confirmed for task {task_id}, replaying anyway")
+
+    async def _listen(self):
+        """
+        The single Redis subscription for this process.
+        Reconnects with backoff if Redis goes away.
+        """
+        backoff = 1
+        while True:
+            pubsub = self._redis_factory().pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                logger.info("WS: Shared Redis subscription started")
+                backoff = 1
+
+                async for message in pubsub.listen():
+                    if message["type"] == "psubscribe":
+                        # Redis confirmed the subscription: replays may start reading
+                        self._subscribed.set()
+                        continue
+                    if message["type"] != "pmessage":
+                        continue
+                    task_id = message["channel"][len(CHANNEL_PREFIX):]
+                    if task_id not in self.active_connections:
+                        continue
+                    try:
+                        data = json.loads(message["data"])
+                    except ValueError:
+                        logger.warning(f"WS: Ignoring malformed notification for task {task_id}")
+                        continue
+                    self.publish_local(task_id, data)
+
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, OSError) as e:
+                self._subscribed.clear()
+                logger.error(f"WS: Redis subscription lost, retrying in {backoff}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                # --- CRITICAL CLEANUP ---
+                try:
+                    await pubsub.punsubscribe()
+                    await pubsub.close()
+                except Exception:
+                    pass
 
 # Global instance to be used in the WebSocket router
-manager = ConnectionManager()
\ No newline at end of file
+manager = ConnectionManager()
@@ -3,8 +3,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.infrastructure.db.models import User
-from app.infrastructure.auth.password import hash_password, verify_password
+from app.infrastructure.auth.password import password_hasher, needs_rehash
 from app.infrastructure.auth.jwt import create_refresh_token, create_access_token
+from app.infrastructure.auth.principal_cache import principal_cache
 from app.domain.exceptions import AuthenticationFailed
 
 # Initialize logger for tracking auth events
@@ -26,10 +27,11 @@ async def register_user(session: AsyncSession, email: str, password: str) -> Use
         raise AuthenticationFailed("A user with this email is already registered.")
 
     # Create and save user
-    # Dev Note: hash_password handles the 72-byte Bcrypt limit check
+    # Dev Note: hash_password handles the 72-byte Bcrypt limit check.
+    # Hashing runs on the bcrypt pool, never on the event loop.
     new_user = User(
         email=email, 
-        hashed_password=hash_password(password)
+        hashed_password=await password_hasher.hash(password)
     )
     
     session.add(new_user)
@@ -56,7 +58,7 @@ async def login(
     user = result.scalar_one_or_none()
 
     # 2. Verify identity and status
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await password_hasher.verify(password, user.hashed_password):
         logger.warning(f"Login failed: Invalid credentials for {email}")
         raise AuthenticationFailed("Invalid email or password.")
     
@@ -64,6 +66,13 @@ async def login(
         logger.warning(f"Login blocked: Account disabled for {email}")
         raise AuthenticationFailed("User account is inactive. Please contact support.")
 
+    # Transparent upgrade: the plain password is only available here, so
+    # hashes made with an older BCRYPT_ROUNDS are re-hashed on login.
+    if needs_rehash(user.hashed_password):
+        user.hashed_password = await password_hasher.hash(password)
+        await session.commit()
+        logger.info(f"Login: Re-hashed password for user {user.id} with the current cost factor")
+
     # 3. Generate tokens
     logger.info(f"Login successful: User {user.id}")
     return {
@@ -79,13 +88,15 @@ async def delete_user(session: AsyncSession, user_id: str) -> None:
         raise AuthenticationFailed("User not found.")
     
     # Soft delete
-    dummy_password = hash_password("deleted_user_dummy_password")
+    dummy_password = await password_hasher.hash("deleted_user_dummy_password")
 
     user.is_active = False
     user.email = f"deleted_{user.id}@example.com"  # anonymize
     user.hashed_password = dummy_password
     
     await session.commit()
+    # Revoke immediately: the cached principal would still say 'active'
+    await principal_cache.invalidate(user_id)
     logger.info(f"User account {user_id} deactivated")
 
 
@@ -95,10 +106,11 @@ async def change_password(session: AsyncSession, user_id: str, old_password: str
     if not user:
         raise AuthenticationFailed("User not found.")
 
-    if not verify_password(old_password, user.hashed_password):
+    if not await password_hasher.verify(old_password, user.hashed_password):
         raise AuthenticationFailed("Old password is incorrect.")
 
-    user.hashed_password = hash_password(new_password)
+    user.hashed_password = await password_hasher.hash(new_password)
     await session.commit()
+    await principal_cache.invalidate(user_id)
     logger.info(f"Password updated for user {user_id}")
 
@@ -1,6 +1,8 @@
+import json
 import logging
 from celery.result import AsyncResult
 from app.infrastructure.queue.celery_app import celery_app
+from app.infrastructure.redis_client import get_async_result_backend
 
 # Initialize logger for tracking task lifecycle
 logger = logging.getLogger(__name__)
@@ -49,4 +51,48 @@ def get_task_status(task_id: str) -> dict:
             "task_id": task_id,
             "status": "UNKNOWN",
             "error": "Could not connect to the task backend."
-        }
\ No newline at end of file
+        }
+
+
+# Key under which Celery's Redis backend stores each task's result
+RESULT_KEY_PREFIX = "celery-task-meta-"
+
+
+async def get_task_statuses(task_ids: list[str], redis_client=None) -> dict:
+    """
+    Resolves many task states with a single MGET against the result backend.
+
+    This backs POST /tasks/status, so dashboards can poll dozens of tasks
+    in one request without blocking the event loop on AsyncResult.
+
+    Returns a compact map: {task_id: {"status": ..., "result"/"error": ...}}.
+    Unknown task ids are reported as PENDING, exactly like AsyncResult does.
+    """
+    redis_client = redis_client or get_async_result_backend()
+    unique_ids = list(dict.fromkeys(task_ids))
+
+    raw_values = await redis_client.mget([f"{RESULT_KEY_PREFIX}{task_id}" for task_id in unique_ids])
+
+    statuses = {}
+    for task_id, raw in zip(unique_ids, raw_values):
+        if raw is None:
+            statuses[task_id] = {"status": "PENDING"}
+            continue
+
+        try:
+            meta = json.loads(raw)
+        except ValueError:
+            logger.warning(f"Task status: Unreadable result meta for task {task_id}")
+            statuses[task_id] = {"status": "UNKNOWN"}
+            continue
+
+        entry = {"status": meta.get("status", "UNKNOWN")}
+        if entry["status"] == "SUCCESS":
+            entry["result"] = meta.get("result")
+        elif entry["status"] == "FAILURE":
+            # Celery stores failures as {"exc_type": ..., "exc_message": ...}
+            error = meta.get("result") or {}
+            entry["error"] = error.get("exc_message") if isinstance(error, dict) else str(error)
+        statuses[task_id] = entry
+
+    return statuses
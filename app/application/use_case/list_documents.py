@@ -0,0 +1,103 @@
+import json
+import uuid
+import base64
+import logging
+import binascii
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.db.models import Document
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Columns every listing returns. raw_text (potentially megabytes per row) and
+# analysis are only loaded when the caller asks for them.
+LIST_COLUMNS = (
+    Document.id,
+    Document.file_name,
+    Document.content,
+    Document.status,
+    Document.url,
+    Document.created_at,
+)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor can't be decoded. Expected Result: 400 Bad Request"""
+    pass
+
+
+def encode_cursor(created_at: datetime, doc_id: uuid.UUID) -> str:
+    """Opaque cursor pointing at the last row of a page: (created_at, id)."""
+    payload = json.dumps({"c": created_at.isoformat(), "i": str(doc_id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["c"]), uuid.UUID(payload["i"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}")
+
+
+async def list_documents(
+    session: AsyncSession,
+    owner_id: uuid.UUID,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    include_analysis: bool = False,
+    include_raw_text: bool = False,
+) -> tuple[list[dict], Optional[str]]:
+    """
+    Returns one page of a user's documents, newest first, plus the cursor for the next page.
+
+    Workflow:
+    1. Select only the listing columns (plus analysis/raw_text when requested).
+    2. Keyset pagination on (created_at, id): the next page starts strictly
+       after the last row of this one, so deep pages cost the same as the
+       first (no OFFSET scan) and inserts don't shift rows between pages.
+    3. Fetch limit + 1 rows; the extra row only tells us whether a next page exists.
+
+    Dev Note: The (owner_id, created_at) index serves both the filter and the ordering.
+    """
+    columns = list(LIST_COLUMNS)
+    if include_analysis:
+        columns.append(Document.analysis)
+    if include_raw_text:
+        columns.append(Document.raw_text)
+
+    query = select(*columns).where(Document.owner_id == owner_id)
+
+    if status:
+        query = query.where(Document.status == status.upper())
+    if created_after:
+        query = query.where(Document.created_at >= created_after)
+    if created_before:
+        query = query.where(Document.created_at < created_before)
+
+    if cursor:
+        last_created_at, last_id = decode_cursor(cursor)
+        query = query.where(
+            or_(
+                Document.created_at < last_created_at,
+                and_(Document.created_at == last_created_at, Document.id < last_id),
+            )
+        )
+
+    query = query.order_by(Document.created_at.desc(), Document.id.desc()).limit(limit + 1)
+
+    rows = (await session.execute(query)).mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
+    return [dict(row) for row in rows], next_cursor
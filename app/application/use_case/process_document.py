@@ -1,6 +1,7 @@
+import uuid
 import logging
 from app.infrastructure.logging import request_id_var
-from app.workers.document_worker import process_document_task
+from app.infrastructure.queue.pipeline import build_pipeline
 
 # Initialize logger for tracking task dispatch
 logger = logging.getLogger(__name__)
@@ -22,13 +23,15 @@ def queue_processing(document_id: str):
     # before the 'worker' container takes over.
     logger.info(f"Dispatching task for document {document_id}. TraceID: {current_rid}")
     
-    # 3. Trigger the Celery Task
-    # .delay() is the standard way to send a message to Redis/RabbitMQ.
+    # 3. Trigger the Celery pipeline (extract -> ocr -> llm, one queue per stage)
+    # The tracking id becomes the final stage's task id, so clients can follow
+    # the whole pipeline through /tasks/{task_id} and /ws/{task_id}.
     # We pass the request_id so the worker can set its own context for logging.
-    task = process_document_task.delay(document_id, request_id=current_rid)
+    tracking_id = str(uuid.uuid4())
+    build_pipeline(document_id, current_rid, tracking_id).apply_async()
     
     return {
-        "task_id": task.id,
+        "task_id": tracking_id,
         "document_id": document_id,
         "trace_id": current_rid
     }
\ No newline at end of file
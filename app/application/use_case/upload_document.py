@@ -1,20 +1,25 @@
 import os
+import time
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.infrastructure.db.models import Document, User
+from app.infrastructure.db.models import Document
+from app.domain.principal import Principal
 from app.domain.services.storage_interface import StorageInterface
+from app.infrastructure.storage.streaming import iter_chunks
+from app.infrastructure.metrics import UPLOAD_BYTES, UPLOAD_SECONDS, record_transfer
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
-async def handle_upload(file, session: AsyncSession, user: User, storage: StorageInterface):
+async def handle_upload(file, session: AsyncSession, user: Principal, storage: StorageInterface):
     """
     Coordinates the document upload workflow.
     
     Workflow:
     1. Sanitize the filename for safe storage.
     2. Create a 'PENDING' record in Postgres to generate a UUID.
-    3. Stream file bytes to the Storage Provider (MinIO or Local) using that UUID.
+    3. Stream the file in chunks to the Storage Provider (MinIO, R2 or Local)
+       using that UUID, hashing it (SHA-256) on the fly.
     4. Update the DB record with the final storage path and commit.
     """
     
@@ -46,20 +51,25 @@ async def handle_upload(file, session: AsyncSession, user: User, storage: Storag
     # 3. Preparation for Storage
     storage_file_id = str(doc.id)
     
+    started = time.perf_counter()
+
     try:
         # Reset file cursor to start before reading
         await file.seek(0)
-        file_bytes = await file.read()
 
         # 4. Storage Provider Handoff
-        # 'final_path' will be the /app/storage/... path or the MinIO URL
-        logger.info(f"Storage: Uploading document {storage_file_id} ({clean_filename})")
-        final_path = await storage.upload(
+        # The file is streamed chunk by chunk (never fully read into memory).
+        # Its size and SHA-256 fingerprint are computed during the same pass,
+        # which lets the worker reuse the analysis of identical uploads.
+        logger.info(f"Storage: Streaming document {storage_file_id} ({clean_filename})")
+        stored = await storage.upload_stream(
             file_id=storage_file_id, 
             file_name=clean_filename, 
-            file_bytes=file_bytes, 
+            chunks=iter_chunks(file), 
             content_type=file.content_type
         )
+        doc.content_hash = stored.sha256
+        final_path = stored.path
 
         # 5. Metadata Finalization
         doc.local_path = final_path
@@ -69,6 +79,10 @@ async def handle_upload(file, session: AsyncSession, user: User, storage: Storag
         # Only now is the user's data officially saved to the DB.
         await session.commit()
         await session.refresh(doc)
+
+        UPLOAD_BYTES.labels(file.content_type).observe(stored.size)
+        UPLOAD_SECONDS.labels(file.content_type).observe(time.perf_counter() - started)
+        record_transfer("upload", stored.size)
         
         logger.info(f"Upload Complete: Document {doc.id} is ready for processing.")
         return doc
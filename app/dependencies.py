@@ -1,6 +1,5 @@
 import os
 import logging
-from app.infrastructure.processing.processor_service import DocumentProcessor
 from app.domain.services.storage_interface import StorageInterface
 
 # Initialize logger
@@ -8,6 +7,7 @@ logger = logging.getLogger(__name__)
 
 # Global variables to cache the instances
 _storage_instance = None
+_processor_instance = None
 
 def get_storage_service() -> StorageInterface:
     """
@@ -40,4 +40,18 @@ def get_storage_service() -> StorageInterface:
     return _storage_instance
 
 def get_document_processor():
-    return DocumentProcessor()
\ No newline at end of file
+    """
+    Worker-only: imported lazily so the API never loads pandas, the OCR stack
+    or the LLM SDKs (the API dispatches tasks by name instead).
+
+    Dev Note: Cached like the storage service, so every caller shares one set
+    of LLM clients (and their connection pools) per process.
+    """
+    global _processor_instance
+
+    if _processor_instance is None:
+        from app.infrastructure.processing.processor_service import DocumentProcessor
+        logger.info("Processor Dependency: Initializing DocumentProcessor")
+        _processor_instance = DocumentProcessor()
+
+    return _processor_instance
@@ -38,4 +38,13 @@ class ProcessingError(Exception):
     
     Expected Result: 500 Internal Server Error (or custom task failure)
     """
-    pass
\ No newline at end of file
+    pass
+
+class ServiceOverloaded(Exception):
+    """
+    Raised when a bounded resource (e.g., the password hashing pool) has
+    too much queued work to accept more. Clients should retry shortly.
+
+    Expected Result: 503 Service Unavailable
+    """
+    pass
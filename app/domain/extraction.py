@@ -0,0 +1,82 @@
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+
+# --- EXTRACTION METHODS ---
+# TEXT_LAYER: text read straight from the file (PDF text layer, DOCX, TXT, ...)
+# OCR: text recognised from rasterized page images (scanned PDFs)
+# HYBRID: mixed PDFs where only some pages needed OCR
+TEXT_LAYER = "text_layer"
+OCR = "ocr"
+HYBRID = "hybrid"
+
+
+@dataclass
+class PageText:
+    """A single page (or logical section, for non-paged formats) of extracted text."""
+    number: int
+    text: str
+    method: str = TEXT_LAYER
+    # Time spent producing this page (only tracked for OCR'd pages)
+    seconds: Optional[float] = None
+
+
+@dataclass
+class ExtractionResult:
+    """
+    The output of one extraction pass over a document.
+
+    Dev Note: This is produced ONCE per task and then shared by the
+    summarizer and the raw_text/analysis builder, so a document is never
+    parsed (or OCR'd) twice.
+    """
+    pages: List[PageText] = field(default_factory=list)
+    method: str = TEXT_LAYER
+    # Stage name -> wall-clock seconds (e.g. {"text_layer": 0.12, "ocr": 8.4})
+    timings: Dict[str, float] = field(default_factory=dict)
+    # Page numbers still waiting for OCR (staged pipeline: set by the extract
+    # stage, cleared by the OCR stage)
+    pending_ocr: List[int] = field(default_factory=list)
+    # Spreadsheets/CSV: one profile per sheet ({"sheet", "rows", "columns": [...]})
+    tables: List[dict] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """The full document text, pages joined in order."""
+        return "\n".join(page.text for page in self.pages if page.text)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    def describe(self) -> dict:
+        """JSON-safe metadata about the extraction (stored alongside the analysis)."""
+        ocr_seconds = [page.seconds for page in self.pages if page.method == OCR and page.seconds is not None]
+
+        description = {
+            "extraction_method": self.method,
+            "page_count": self.page_count,
+            "ocr_pages": sum(1 for page in self.pages if page.method == OCR),
+        }
+        if ocr_seconds:
+            # Per-page OCR latency, used to size the worker containers
+            description["ocr_page_seconds"] = {
+                "mean": round(sum(ocr_seconds) / len(ocr_seconds), 4),
+                "max": round(max(ocr_seconds), 4),
+            }
+        if self.tables:
+            description["tables"] = self.tables
+        return description
+
+    def to_dict(self) -> dict:
+        """JSON-safe copy, used to hand the extraction from one pipeline stage to the next."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ExtractionResult":
+        return cls(
+            pages=[PageText(**page) for page in data.get("pages", [])],
+            method=data.get("method", TEXT_LAYER),
+            timings=data.get("timings", {}),
+            pending_ocr=data.get("pending_ocr", []),
+            tables=data.get("tables", []),
+        )
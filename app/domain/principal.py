@@ -0,0 +1,27 @@
+import uuid
+from dataclasses import dataclass, asdict
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated caller, as seen by route handlers.
+
+    Dev Note: This is a plain snapshot of the User row (no ORM session
+    attached), so it can be cached between requests and shared via Redis.
+    """
+    id: uuid.UUID
+    email: str
+    role: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(id=user.id, email=user.email, role=user.role, is_active=user.is_active)
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "id": str(self.id)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Principal":
+        return cls(**{**data, "id": uuid.UUID(data["id"])})
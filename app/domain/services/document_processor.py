@@ -1,5 +1,8 @@
 from typing import Protocol, Dict, Any, Optional
 
+from app.domain.extraction import ExtractionResult
+from app.domain.summary import SummaryResult
+
 class DocumentProcessorInterface(Protocol):
     """
     The formal contract for Document Processing services.
@@ -23,10 +26,22 @@ class DocumentProcessorInterface(Protocol):
         """
         ...
 
+    def _extract_text_metadata(self, file_path: str, mime_type: Optional[str] = None, run_ocr: bool = True) -> ExtractionResult:
+        """Single extraction pass, shared by the summarizer and the analysis builder."""
+        ...
+
+    def ocr_pending_pages(self, file_path: str, result: ExtractionResult) -> None:
+        """OCRs the pages an extraction left in 'pending_ocr' (staged pipeline)."""
+        ...
+
+    def summarize_sync(self, extraction: ExtractionResult, file_path: Optional[str] = None, mime_type: Optional[str] = None) -> Dict[str, Any]:
+        """Summarizes an existing extraction and returns 'raw_text' and 'analysis'."""
+        ...
+
     def _get_gemini_summary(self, file_path: str, mime_type: str) -> str:
         """Requirement for cloud-based summarization."""
         ...
 
-    def _get_ollama_summary(self, file_path: str) -> str:
+    def _get_ollama_summary_sync(self, extraction: ExtractionResult) -> SummaryResult:
         """Requirement for local-based summarization."""
-        ...
\ No newline at end of file
+        ...
@@ -1,6 +1,16 @@
-from typing import Protocol
+from dataclasses import dataclass
+from typing import AsyncIterator, Protocol
 from abc import ABC, abstractmethod
 
+
+@dataclass
+class StoredObject:
+    """What a streaming upload returns: where the file went, plus its size and SHA-256."""
+    path: str
+    size: int
+    sha256: str
+
+
 class StorageInterface(Protocol):
     """
     The Protocol defines the expected behavior for storage providers.
@@ -13,6 +23,15 @@ class StorageInterface(Protocol):
         """Uploads a file and returns the accessible URL or path."""
         ...
 
+    async def upload_stream(
+        self, file_id: str, file_name: str, chunks: AsyncIterator[bytes], content_type: str
+    ) -> StoredObject:
+        """
+        Uploads a file chunk by chunk without holding it in memory.
+        The size and SHA-256 are computed in the same pass.
+        """
+        ...
+
     async def get_file_path(self, file_id: str) -> str:
         """
         Resolves the file's location on the local filesystem.
@@ -20,6 +39,13 @@ class StorageInterface(Protocol):
         """
         ...
 
+    async def release_file_path(self, file_id: str) -> None:
+        """
+        Tells the adapter the caller is done with a path from get_file_path,
+        so cloud adapters may evict their local copy again.
+        """
+        ...
+
 
 class BaseStorage(ABC):
     """
@@ -30,7 +56,17 @@ class BaseStorage(ABC):
     async def upload(self, file_id: str, file_name: str, file_bytes: bytes, content_type: str) -> str:
         pass
 
+    @abstractmethod
+    async def upload_stream(
+        self, file_id: str, file_name: str, chunks: AsyncIterator[bytes], content_type: str
+    ) -> StoredObject:
+        pass
+
     @abstractmethod
     async def get_file_path(self, file_id: str) -> str:
         """Returns the local string path to the file."""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def release_file_path(self, file_id: str) -> None:
+        pass
@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+@dataclass
+class SummaryResult:
+    """
+    The final AI summary of a document.
+
+    Dev Note: 'timings' holds one entry per summarization stage
+    (e.g. {"summary_map": 4.1, "summary_reduce": 1.2}) so slow stages
+    show up in the stored analysis.
+    """
+    text: str
+    timings: Dict[str, float] = field(default_factory=dict)
+    # Number of chunks that were summarized (1 = single pass)
+    chunks: int = 1
+    # Number of chunks the document was split into; more than 'chunks' when
+    # the document exceeded summary_max_chunks and only a sample was read
+    total_chunks: int = 1
+    # True when the summary came from the summary cache instead of the model
+    cached: bool = False
+
+    @property
+    def sampled(self) -> bool:
+        return self.total_chunks > self.chunks
@@ -9,6 +9,8 @@ from sqlalchemy import select
 from app.infrastructure.config import settings
 from app.infrastructure.db.session import get_session
 from app.infrastructure.db.models import User
+from app.infrastructure.auth.principal_cache import principal_cache
+from app.domain.principal import Principal
 
 # Initialize logger for security events
 logger = logging.getLogger(__name__)
@@ -19,7 +21,7 @@ oauth2_scheme = HTTPBearer()
 async def get_current_user(
     token: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
     session: AsyncSession = Depends(get_session)
-) -> User:
+) -> Principal:
     """
     Dependency that authenticates requests using a JWT.
     
@@ -27,7 +29,11 @@ async def get_current_user(
     1. Extracts credentials from the Bearer token.
     2. Decodes and validates the JWT using the SECRET_KEY.
     3. Converts the string ID to a UUID object for SQLAlchemy compatibility.
-    4. Lookups the user in the database to ensure they still exist and are active.
+    4. Resolves the user from the principal cache, or from the database on a miss,
+       to ensure they still exist and are active.
+
+    Dev Note: Returns a Principal snapshot, not an ORM User. Status polls and
+    other hot paths skip the users SELECT while the principal is cached.
     """
     try:
         # Decode the token
@@ -67,16 +73,22 @@ async def get_current_user(
             detail="Invalid user identifier format"
         )
 
-    # Query the database using the converted UUID object
-    result = await session.execute(select(User).where(User.id == user_uuid))
-    user = result.scalar_one_or_none()
+    user = await principal_cache.get(str(user_uuid))
 
-    if not user:
-        logger.warning(f"Auth Failure: User {user_id_str} not found in database.")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, 
-            detail="User not found"
-        )
+    if user is None:
+        # Query the database using the converted UUID object
+        result = await session.execute(select(User).where(User.id == user_uuid))
+        db_user = result.scalar_one_or_none()
+
+        if not db_user:
+            logger.warning(f"Auth Failure: User {user_id_str} not found in database.")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, 
+                detail="User not found"
+            )
+
+        user = Principal.from_user(db_user)
+        await principal_cache.set(user)
     
     if not user.is_active:
         logger.warning(f"Auth Failure: User {user_id_str} is inactive.")
@@ -1,14 +1,18 @@
+import asyncio
 import logging
 import bcrypt
+from concurrent.futures import ThreadPoolExecutor
+from app.infrastructure.config import settings
+from app.domain.exceptions import ServiceOverloaded
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
-# Bcrypt has a maximum input length of 72 bytes. 
+# Bcrypt has a maximum input length of 72 bytes.
 MAX_BYTE_LENGTH = 72
 
-def hash_password(password: str) -> str:
-    """Hashes a plain-text password using native Bcrypt."""
+def hash_password(password: str, rounds: int | None = None) -> str:
+    """Hashes a plain-text password using native Bcrypt (blocking)."""
     # Ensure UTF-8 byte length check (some emojis/chars are > 1 byte)
     if len(password.encode("utf-8")) > MAX_BYTE_LENGTH:
         logger.warning("Password hashing failed: Input exceeds 72-byte limit.")
@@ -16,17 +20,70 @@ def hash_password(password: str) -> str:
 
     # hashpw returns bytes, so we decode to utf-8 string for DB storage
     return bcrypt.hashpw(
-        password.encode("utf-8"), 
-        bcrypt.gensalt()
+        password.encode("utf-8"),
+        bcrypt.gensalt(rounds=rounds or settings.bcrypt_rounds)
     ).decode("utf-8")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifies a plain-text password against a stored hash."""
+    """Verifies a plain-text password against a stored hash (blocking)."""
     try:
         return bcrypt.checkpw(
-            plain_password.encode("utf-8"), 
+            plain_password.encode("utf-8"),
             hashed_password.encode("utf-8")
         )
     except Exception as e:
         logger.error(f"Password verification error: {str(e)}")
-        return False
\ No newline at end of file
+        return False
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True when a stored hash uses a different cost factor than BCRYPT_ROUNDS."""
+    try:
+        # Format: $2b$<cost>$<salt+hash>
+        return int(hashed_password.split("$")[2]) != settings.bcrypt_rounds
+    except (IndexError, ValueError):
+        return True
+
+
+class PasswordHasher:
+    """
+    Async front-end for bcrypt, for use inside the API's event loop.
+
+    Dev Note: One bcrypt call takes ~200ms at cost 12. Running it inline
+    freezes every request and WebSocket on the worker, so calls go to a
+    small dedicated thread pool (bcrypt releases the GIL while hashing).
+    At most 'max_queue' calls may be in flight; beyond that we fail fast
+    with ServiceOverloaded instead of letting a login storm queue forever.
+    """
+
+    def __init__(self, max_workers: int | None = None, max_queue: int | None = None):
+        self.max_workers = max_workers or settings.password_hash_workers
+        self.max_queue = max_queue or settings.password_hash_max_queue
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        self._in_flight = 0
+        self.rejected = 0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        return {"in_flight": self._in_flight, "rejected": self.rejected, "max_queue": self.max_queue}
+
+    async def _run(self, func, *args):
+        if self._in_flight >= self.max_queue:
+            self.rejected += 1
+            logger.warning(f"PasswordHasher: {self._in_flight} calls in flight, rejecting")
+            raise ServiceOverloaded("Too many password operations in progress. Please retry shortly.")
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._in_flight -= 1
+
+
+# Global instance shared by the auth use cases
+password_hasher = PasswordHasher()
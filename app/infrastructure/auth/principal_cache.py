@@ -0,0 +1,128 @@
+import json
+import time
+import logging
+from collections import OrderedDict
+from typing import Optional
+from redis.exceptions import RedisError
+from app.infrastructure.config import settings
+from app.infrastructure.redis_client import get_async_redis
+from app.infrastructure.metrics import record_cache
+from app.domain.principal import Principal
+
+# Initialize logger for security events
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = "principal:"
+
+
+class PrincipalCache:
+    """
+    TTL + LRU cache of authenticated principals, keyed by the JWT 'sub'.
+
+    Tiers:
+    1. Process-local OrderedDict (no I/O). Entries expire after 'ttl_seconds'
+       and the least recently used are dropped above 'max_entries'.
+    2. Optional shared Redis tier, so a user warmed on one pod is warm on all.
+
+    Dev Note: invalidate() clears the local entry and the Redis entry. Other
+    pods keep their local copy for at most 'ttl_seconds', which is why the
+    local TTL is short.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int | None = None,
+        max_entries: int | None = None,
+        use_redis: bool | None = None,
+        redis_factory=get_async_redis,
+    ):
+        self.ttl_seconds = settings.principal_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.max_entries = max_entries or settings.principal_cache_max_entries
+        self.use_redis = settings.principal_cache_redis if use_redis is None else use_redis
+        self._redis_factory = redis_factory
+        self._entries: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[Principal]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, principal = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.local_hits += 1
+                record_cache("principal", hit=True)
+                return principal
+            del self._entries[key]
+
+        if self.use_redis:
+            try:
+                raw = await self._redis_factory().get(f"{REDIS_PREFIX}{key}")
+                if raw:
+                    principal = Principal.from_dict(json.loads(raw))
+                    self._store_local(key, principal)
+                    self.redis_hits += 1
+                    record_cache("principal", hit=True)
+                    return principal
+            except (RedisError, ValueError, TypeError) as e:
+                logger.warning(f"PrincipalCache: Redis tier unavailable, falling back to DB: {e}")
+
+        self.misses += 1
+        record_cache("principal", hit=False)
+        return None
+
+    async def set(self, principal: Principal):
+        key = str(principal.id)
+        self._store_local(key, principal)
+
+        if self.use_redis:
+            try:
+                await self._redis_factory().set(
+                    f"{REDIS_PREFIX}{key}",
+                    json.dumps(principal.to_dict()),
+                    ex=settings.principal_cache_redis_ttl_seconds,
+                )
+            except RedisError as e:
+                logger.warning(f"PrincipalCache: Could not write Redis tier: {e}")
+
+    async def invalidate(self, user_id):
+        """Drops a user from every tier (password change, deletion, deactivation)."""
+        key = str(user_id)
+        self._entries.pop(key, None)
+
+        if self.use_redis:
+            try:
+                await self._redis_factory().delete(f"{REDIS_PREFIX}{key}")
+            except RedisError as e:
+                logger.error(f"PrincipalCache: Could not invalidate {key} in Redis: {e}")
+
+        logger.info(f"PrincipalCache: Invalidated user {key}")
+
+    def clear(self):
+        """Drops every local entry and resets the counters."""
+        self._entries.clear()
+        self.local_hits = self.redis_hits = self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.local_hits + self.redis_hits) / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def _store_local(self, key: str, principal: Principal):
+        if self.ttl_seconds <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, principal)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Global instance shared by get_current_user and the auth use cases
+principal_cache = PrincipalCache()
@@ -18,6 +18,11 @@ class Settings(BaseSettings):
     redis_port: int | None = None
     celery_broker_url: str | None = None
     celery_result_backend: str | None = None
+    # Pending WebSocket notifications per client; the oldest is dropped when full
+    ws_queue_size: int = 32
+    # Replayable task event streams: retention after the last event, max events per task
+    task_events_ttl_seconds: int = 86400
+    task_events_max_len: int = 100
     minio_endpoint: str | None = None
     minio_bucket: str | None = None
     minio_access_key: str | None = None
@@ -34,16 +39,88 @@ class Settings(BaseSettings):
     s3_secret_key: str | None = None
     s3_bucket: str | None = None
     s3_region: str = "auto"
+    # Threads used to run blocking storage SDK calls off the event loop
+    storage_io_workers: int = 8
+    # Worker-side download cache for R2/MinIO objects (LRU, evicts above the cap)
+    blob_cache_dir: str = "/tmp/blob-cache"
+    blob_cache_max_mb: int = 2048
 
     # --- 3. AI & SECURITY ---
     gemini_api: str | None = None
+    # Gemini uploads: first poll of a PROCESSING file (doubles up to 5s), how long to wait
+    # for it to become ACTIVE, and how long before its expiry a handle stops being reused
+    gemini_file_poll_seconds: float = 0.5
+    gemini_file_ready_timeout_seconds: float = 120.0
+    gemini_file_reuse_margin_seconds: int = 3600
     ai_provider: str | None = None
     ollama_model: str | None = None
     ollama_base_url: str | None = None
+    # Async Ollama client (API/async path): requests in flight per host, prompts allowed
+    # to wait for a slot before we fail fast, request timeout, idle keep-alive
+    ollama_max_concurrency: int = 4
+    ollama_max_waiting: int = 64
+    ollama_timeout_seconds: float = 300.0
+    ollama_keepalive_seconds: float = 30.0
+    # Ollama host pool: comma-separated URLs (defaults to ollama_base_url). A host is
+    # ejected after N consecutive connection/5xx failures, sits out the cool-down,
+    # then gets one probation request. keep_alive keeps the model loaded between prompts.
+    ollama_hosts: str | None = None
+    ollama_eject_after_failures: int = 3
+    ollama_eject_seconds: float = 30.0
+    ollama_probe_timeout_seconds: float = 2.0
+    ollama_keep_alive: str = "30m"
     secret_key: str | None = None
     access_token_expire_minutes: int | None = None
     refresh_token_expire_days: int | None = None
     jwt_algorithm: str | None = None
+    # Authenticated-user cache: per-process TTL/size, and an optional shared Redis tier.
+    # The per-process TTL bounds how long another pod may serve a revoked user.
+    principal_cache_ttl_seconds: int = 30
+    principal_cache_max_entries: int = 10000
+    principal_cache_redis: bool = False
+    principal_cache_redis_ttl_seconds: int = 300
+    # Password hashing: bcrypt cost factor (existing hashes are upgraded on login),
+    # dedicated threads, and how many hash/verify calls may wait before we return 503
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 64
+
+    # --- 4. DOCUMENT PROCESSING ---
+    # Number of tesseract processes used to OCR scanned PDF pages in parallel
+    ocr_max_workers: int = 2
+    # Pages whose text layer has fewer characters than this are OCR'd
+    ocr_min_page_chars: int = 50
+    # Scanned pages beyond this limit are not OCR'd
+    ocr_max_pages: int = 20
+    # Rasterization settings: lower DPI / grayscale keep page images small
+    ocr_dpi: int = 200
+    ocr_grayscale: bool = True
+    # Map-reduce summarization: chunk size/overlap in characters, parallel LLM requests
+    summary_chunk_size: int = 8000
+    summary_chunk_overlap: int = 200
+    summary_concurrency: int = 2
+    summary_max_chunks: int = 32
+    # Summary cache (same text + provider/model/prompt => same summary): TTL of both tiers,
+    # process-local entries, Redis entries before the oldest are evicted, largest summary cached
+    summary_cache_enabled: bool = True
+    summary_cache_ttl_seconds: int = 7 * 86400
+    summary_cache_local_entries: int = 256
+    summary_cache_max_entries: int = 50000
+    summary_cache_max_bytes: int = 64 * 1024
+    # Spreadsheets/CSV: rows rendered for the LLM (per file, all sheets), rows profiled per chunk
+    tabular_max_rows: int = 500
+    tabular_chunk_rows: int = 5000
+    # Duplicate uploads: how long a task may own the work, how long a twin waits for it,
+    # and how often the waiting twin checks back (it is retried, not sleeping in its slot)
+    dedup_lock_seconds: int = 900
+    dedup_wait_seconds: int = 120
+    dedup_poll_seconds: float = 2.0
+    # Staged pipeline: how long intermediate results (e.g. extracted pages) are kept in Redis
+    pipeline_handoff_ttl_seconds: int = 86400
+
+    # --- 5. OBSERVABILITY ---
+    # Port of the Celery worker's Prometheus exporter (0 disables it); the API serves /metrics
+    worker_metrics_port: int = 9808
     
     def __init__(self, **values):
         super().__init__(**values)
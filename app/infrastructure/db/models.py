@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, Boolean, ForeignKey, Text, DateTime, JSON
+from sqlalchemy import String, Boolean, ForeignKey, Text, DateTime, JSON, Index
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 class Base(DeclarativeBase):
@@ -49,6 +49,10 @@ class User(Base):
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        # Serves the paginated listing: WHERE owner_id = ? ORDER BY created_at DESC
+        Index("ix_documents_owner_id_created_at", "owner_id", "created_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True,
@@ -63,6 +67,9 @@ class Document(Base):
     url: Mapped[str] = mapped_column(String(500), nullable=True)
     local_path: Mapped[str] = mapped_column(String(500), nullable=False)
     
+    # SHA-256 of the uploaded bytes. Used to reuse the analysis of identical uploads.
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
+    
     # Tracking state: PENDING, PROCESSING, COMPLETED, FAILED
     status: Mapped[str] = mapped_column(String(20), default="PENDING", index=True)
 
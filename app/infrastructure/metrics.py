@@ -0,0 +1,116 @@
+import os
+import logging
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    start_http_server,
+)
+from prometheus_client import multiprocess
+from app.infrastructure.config import settings
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# --- BUCKETS ---
+# Dev Note: Uploads range from a few KB (TXT) to tens of MB (scanned PDFs);
+# pipeline stages from milliseconds (text layer) to minutes (OCR, LLM).
+SIZE_BUCKETS = (10e3, 100e3, 500e3, 1e6, 5e6, 10e6, 25e6, 50e6, 100e6)
+SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+CHARS_BUCKETS = (100, 1e3, 5e3, 10e3, 50e3, 100e3, 500e3, 1e6)
+
+# --- API ---
+UPLOAD_BYTES = Histogram(
+    "document_upload_bytes", "Size of uploaded documents", ["mime_type"], buckets=SIZE_BUCKETS
+)
+UPLOAD_SECONDS = Histogram(
+    "document_upload_seconds", "Time to stream an upload to storage and commit it", ["mime_type"], buckets=SECONDS_BUCKETS
+)
+
+# --- PIPELINE ---
+QUEUE_WAIT_SECONDS = Histogram(
+    "pipeline_queue_wait_seconds", "Time from dispatch in queue_processing to the first stage starting",
+    buckets=SECONDS_BUCKETS,
+)
+STAGE_SECONDS = Histogram(
+    "pipeline_stage_seconds", "Duration of each pipeline stage (extract, ocr, llm)",
+    ["stage", "mime_type", "provider"], buckets=SECONDS_BUCKETS,
+)
+OCR_PAGES = Counter("pipeline_ocr_pages", "Pages recognised with OCR", ["mime_type"])
+EXTRACTED_CHARS = Histogram(
+    "pipeline_extracted_characters", "Characters of text extracted per document", ["mime_type"], buckets=CHARS_BUCKETS
+)
+TASK_RETRIES = Counter("pipeline_task_retries", "Stage retries", ["stage", "reason"])
+TASK_FAILURES = Counter("pipeline_task_failures", "Pipelines that failed after their last retry", ["stage", "reason"])
+
+# --- LLM HOSTS ---
+# Dev Note: 'host' is one of the configured OLLAMA_HOSTS, so cardinality is bounded.
+LLM_ROUTED = Counter("llm_routing_decisions", "Prompts routed to each Ollama host", ["host"])
+LLM_REQUESTS = Counter(
+    "llm_host_requests", "Ollama requests by host and outcome (ok, host_error, error, overloaded)", ["host", "outcome"]
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_host_request_seconds", "Latency of one prompt round trip per Ollama host", ["host"], buckets=SECONDS_BUCKETS
+)
+LLM_HOST_HEALTHY = Gauge(
+    "llm_host_healthy", "1 while the Ollama host is in rotation, 0 while ejected", ["host"], multiprocess_mode="livemin"
+)
+LLM_HOST_TRANSITIONS = Counter("llm_host_transitions", "Ejections and readmissions of Ollama hosts", ["host", "event"])
+
+# --- CACHES & STORAGE ---
+CACHE_LOOKUPS = Counter("cache_lookups", "Cache lookups by cache and result (hit/miss)", ["cache", "result"])
+STORAGE_BYTES = Counter("storage_transfer_bytes", "Bytes moved to/from object storage", ["backend", "direction"])
+
+
+def failure_reason(e: Exception) -> str:
+    """Low-cardinality label for retry/failure counters."""
+    message = str(e)
+    if "Rate Limit" in message or "429" in message:
+        return "rate_limit"
+    if "Event loop" in message:
+        return "event_loop"
+    return type(e).__name__
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_transfer(direction: str, size: int):
+    STORAGE_BYTES.labels(settings.storage_type or "local", direction).inc(size)
+
+
+def _registry():
+    """
+    The registry to expose.
+
+    Dev Note: With several processes (uvicorn --workers, Celery prefork), set
+    PROMETHEUS_MULTIPROC_DIR so every process writes its samples there and the
+    exposition aggregates them. Otherwise the process-local registry is used.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_latest() -> tuple[bytes, str]:
+    """The current metrics in the Prometheus text format, and its content type."""
+    return generate_latest(_registry()), CONTENT_TYPE_LATEST
+
+
+def start_worker_exporter():
+    """Serves /metrics for the Celery worker on 'worker_metrics_port' (0 disables it)."""
+    if not settings.worker_metrics_port:
+        return
+    try:
+        start_http_server(settings.worker_metrics_port, registry=_registry())
+        logger.info(f"Metrics: Worker exporter listening on :{settings.worker_metrics_port}")
+    except OSError as e:
+        # e.g. a second worker on the same host; metrics are optional
+        logger.warning(f"Metrics: Could not start the worker exporter: {e}")
@@ -0,0 +1,157 @@
+import logging
+from typing import Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy.orm import Session
+
+from app.infrastructure.config import settings
+from app.infrastructure.db.models import Document
+
+logger = logging.getLogger(__name__)
+
+
+class TwinInFlight(Exception):
+    """An identical document of the same owner is being processed right now."""
+
+
+def find_cached_result(
+    db: Session,
+    content_hash: str,
+    provider: str,
+    model: str,
+    owner_id,
+    exclude_id=None,
+) -> Optional[Document]:
+    """
+    Finds the owner's most recent COMPLETED document with the same bytes that
+    was analysed by the same provider and model.
+
+    Dev Note: Scoped to one owner on purpose. Reusing another user's analysis
+    would reveal that someone else uploaded the same file (and which
+    document it was). Identical text across users still skips the LLM via
+    the summary cache, which stores no document ids.
+    """
+    query = db.query(Document).filter(
+        Document.owner_id == owner_id,
+        Document.content_hash == content_hash,
+        Document.status == "COMPLETED",
+    )
+    if exclude_id is not None:
+        query = query.filter(Document.id != exclude_id)
+
+    # Provider/model live in the analysis JSON, so they are matched in Python
+    # over the (few) documents sharing this hash.
+    for candidate in query.order_by(Document.created_at.desc()).limit(20):
+        analysis = candidate.analysis or {}
+        if analysis.get("ai_provider") == provider and analysis.get("ai_model") == model:
+            return candidate
+    return None
+
+
+class AnalysisDeduplicator:
+    """
+    Short-circuits the OCR + LLM pipeline for content we've already analysed.
+
+    Workflow:
+    1. If the owner has a completed document with the same hash/provider/model, reuse it.
+    2. Otherwise claim the work with a Redis lock, so that when two identical
+       uploads are in flight only one of them runs the pipeline.
+    3. The task that loses the race raises TwinInFlight; the worker retries it
+       later (freeing its slot) instead of repeating the work. Once its wait
+       budget is spent, claim(..., wait=False) lets it process the document.
+    """
+
+    def __init__(self, db: Session, redis_client, provider: str, model: str):
+        self.db = db
+        self.redis = redis_client
+        self.provider = provider
+        self.model = model
+        self._lock = None
+
+    def claim(self, doc: Document, wait: bool = True) -> Optional[dict]:
+        """
+        Returns a reusable result for doc, or None if this task must process it.
+        When None is returned the caller owns the work until release() is called
+        (unless the twin still held the lock with wait=False).
+
+        Raises TwinInFlight if an identical document is being processed and
+        'wait' is True.
+        """
+        if not doc.content_hash:
+            return None
+
+        cached = self._find(doc)
+        if cached:
+            return self._reuse(cached)
+
+        try:
+            lock = self.redis.lock(
+                f"dedup:{doc.owner_id}:{self.provider}:{self.model}:{doc.content_hash}",
+                timeout=settings.dedup_lock_seconds,
+            )
+            if lock.acquire(blocking=False):
+                self._lock = lock
+                # The previous owner may have finished between our lookup and the lock
+                cached = self._find(doc)
+                return self._reuse(cached) if cached else None
+
+            if wait:
+                logger.info(f"Dedup: Identical document {doc.id} is already being processed, checking back later")
+                raise TwinInFlight(str(doc.id))
+
+            logger.warning(f"Dedup: No result from the in-flight twin of {doc.id}, processing it ourselves")
+            return None
+
+        except RedisError as e:
+            # Dedup is an optimisation only; never fail the task because of it
+            logger.warning(f"Dedup: Redis unavailable, processing without dedup lock: {e}")
+            return None
+
+    def release(self):
+        if self._lock is None:
+            return
+        try:
+            self._lock.release()
+        except RedisError as e:
+            # LockNotOwnedError: the lock expired while we were still processing
+            logger.warning(f"Dedup: Could not release lock: {e}")
+        finally:
+            self._lock = None
+
+    def detach(self) -> Optional[dict]:
+        """
+        Hands the lock over to a later pipeline stage instead of releasing it.
+        Returns a JSON-safe reference for release_detached(), or None if no lock is held.
+        """
+        if self._lock is None:
+            return None
+        token = self._lock.local.token
+        lock_ref = {
+            "name": self._lock.name,
+            "token": token.decode() if isinstance(token, bytes) else token,
+        }
+        self._lock = None
+        return lock_ref
+
+    def _find(self, doc: Document) -> Optional[Document]:
+        return find_cached_result(
+            self.db, doc.content_hash, self.provider, self.model, doc.owner_id, exclude_id=doc.id
+        )
+
+    def _reuse(self, cached: Document) -> dict:
+        logger.info(f"Dedup: Reusing analysis of document {cached.id}")
+        return {
+            "raw_text": cached.raw_text,
+            "analysis": {**(cached.analysis or {}), "deduplicated_from": str(cached.id)},
+        }
+
+
+def release_detached(redis_client, lock_ref: Optional[dict]):
+    """Releases a lock handed over with AnalysisDeduplicator.detach()."""
+    if not lock_ref:
+        return
+    try:
+        redis_client.lock(lock_ref["name"], timeout=settings.dedup_lock_seconds).do_release(lock_ref["token"])
+    except RedisError as e:
+        # LockNotOwnedError: the lock expired while the pipeline was still running
+        logger.warning(f"Dedup: Could not release lock {lock_ref['name']}: {e}")
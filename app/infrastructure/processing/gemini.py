@@ -0,0 +1,214 @@
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Callable, Coroutine, Optional
+
+from google.genai import errors, types
+from redis.exceptions import RedisError
+
+from app.infrastructure.config import settings
+from app.domain.exceptions import ProcessingError
+from app.infrastructure.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = "gemini_file:"
+# Gemini keeps uploaded files for 48h; used when the API doesn't report an expiry
+FILE_LIFETIME_SECONDS = 48 * 3600
+MAX_POLL_SECONDS = 5.0
+LOCAL_ENTRIES = 1024
+
+
+class FileHandleCache:
+    """
+    Names of files already uploaded to Gemini, keyed by content hash.
+
+    Tiers:
+    1. Process-local LRU.
+    2. Optional shared Redis tier, so a duplicate processed by another worker
+       reuses the upload too.
+
+    Entries expire 'gemini_file_reuse_margin_seconds' before Gemini deletes
+    the file, so a handle is never handed out just as it disappears.
+
+    Dev Note: upload_once() calls it from executor threads (asyncio.to_thread),
+    so the local tier is guarded by a lock; Redis I/O stays outside it.
+    """
+
+    def __init__(self, redis_factory: Optional[Callable] = None, namespace: str = ""):
+        self._redis_factory = redis_factory
+        # Files belong to one API key/project: never share handles across keys
+        self.namespace = hashlib.sha256(namespace.encode()).hexdigest()[:12]
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[str]:
+        name = self._get_local(digest)
+        if name is not None:
+            return name
+
+        if self._redis_factory is not None:
+            try:
+                raw = self._redis_factory().get(self._redis_key(digest))
+                if raw:
+                    entry = json.loads(raw)
+                    self._store_local(digest, entry["expires_at"], entry["name"])
+                    return entry["name"]
+            except (RedisError, ValueError, KeyError) as e:
+                logger.warning(f"Gemini: File handle cache (Redis) unavailable: {e}")
+        return None
+
+    def set(self, digest: str, file: types.File):
+        expires_at = _expires_at(file) - settings.gemini_file_reuse_margin_seconds
+        ttl = int(expires_at - time.time())
+        if ttl <= 0:
+            return
+        self._store_local(digest, expires_at, file.name)
+
+        if self._redis_factory is not None:
+            try:
+                self._redis_factory().set(
+                    self._redis_key(digest), json.dumps({"name": file.name, "expires_at": expires_at}), ex=ttl
+                )
+            except RedisError as e:
+                logger.warning(f"Gemini: Could not share file handle in Redis: {e}")
+
+    def invalidate(self, digest: str):
+        with self._lock:
+            self._entries.pop(digest, None)
+        if self._redis_factory is not None:
+            try:
+                self._redis_factory().delete(self._redis_key(digest))
+            except RedisError as e:
+                logger.warning(f"Gemini: Could not invalidate file handle in Redis: {e}")
+
+    def _redis_key(self, digest: str) -> str:
+        return f"{REDIS_PREFIX}{self.namespace}:{digest}"
+
+    def _get_local(self, digest: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            expires_at, name = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(digest)
+                return name
+            del self._entries[digest]
+            return None
+
+    def _store_local(self, digest: str, expires_at: float, name: str):
+        with self._lock:
+            self._entries[digest] = (expires_at, name)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > LOCAL_ENTRIES:
+                self._entries.popitem(last=False)
+
+
+async def upload_once(client, cache: FileHandleCache, file_path: str, mime_type: str) -> types.File:
+    """
+    Returns an ACTIVE Gemini file for 'file_path', uploading it only if no
+    live upload of the same bytes exists.
+
+    Workflow:
+    1. Hash the file (sha256 + mime type) and look the handle up in the cache.
+    2. On a hit, confirm the file still exists (files.get); otherwise upload.
+    3. Poll the file's state until it is ACTIVE, then remember the handle.
+
+    Dev Note: Retries of the summary (rate limits) and duplicate documents
+    therefore reuse one upload for the file's whole server-side lifetime.
+    """
+    digest = f"{await asyncio.to_thread(file_sha256, file_path)}:{mime_type}"
+
+    file = None
+    name = await asyncio.to_thread(cache.get, digest)
+    if name:
+        try:
+            file = await client.aio.files.get(name=name)
+        except errors.ClientError as e:
+            # Deleted early or not visible to this key: upload again
+            logger.info(f"Gemini: Cached file {name} is gone ({e.code}), re-uploading")
+            await asyncio.to_thread(cache.invalidate, digest)
+    record_cache("gemini_file", hit=file is not None)
+
+    if file is None:
+        file = await client.aio.files.upload(file=file_path, config={"mime_type": mime_type})
+        logger.info(f"Gemini: Uploaded {file_path} as {file.name}")
+
+    file = await wait_until_active(client, file)
+    await asyncio.to_thread(cache.set, digest, file)
+    return file
+
+
+async def wait_until_active(client, file: types.File) -> types.File:
+    """Polls files.get with backoff while the file is PROCESSING."""
+    deadline = time.monotonic() + settings.gemini_file_ready_timeout_seconds
+    delay = settings.gemini_file_poll_seconds
+
+    while file.state == types.FileState.PROCESSING:
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Gemini file {file.name} still processing after {settings.gemini_file_ready_timeout_seconds}s")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, MAX_POLL_SECONDS)
+        file = await client.aio.files.get(name=file.name)
+
+    if file.state == types.FileState.FAILED:
+        raise ProcessingError(f"NON_RETRYABLE: Gemini could not process the file: {file.error}")
+    return file
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _expires_at(file: types.File) -> float:
+    if file.expiration_time is not None:
+        expiration = file.expiration_time
+        if expiration.tzinfo is None:
+            expiration = expiration.replace(tzinfo=timezone.utc)
+        return expiration.timestamp()
+    created = file.create_time or datetime.now(timezone.utc)
+    return created.timestamp() + FILE_LIFETIME_SECONDS
+
+
+class LoopThread:
+    """
+    One long-lived event loop on a daemon thread; coroutines submitted from any
+    thread (Celery threads, the API loop) run on it.
+
+    Dev Note: The Gemini client owns a single async HTTP pool, which is bound
+    to the loop it first runs on. Running every Gemini call on this loop keeps
+    that pool valid, instead of a new loop per call ("Event loop is closed").
+    Started lazily, so a Celery prefork child starts its own after the fork.
+    """
+
+    def __init__(self, name: str = "gemini-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, coro: Coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_running())
+
+    def run(self, coro: Coroutine):
+        """Blocking: runs 'coro' on the loop and returns its result."""
+        return self.submit(coro).result()
+
+    def _ensure_running(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name=self.name, daemon=True)
+                self._thread.start()
+            return self._loop
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+
+import httpx
+from ollama import AsyncClient
+
+from app.infrastructure.config import settings
+from app.domain.exceptions import ServiceOverloaded
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncOllamaClient:
+    """
+    Long-lived async client for ONE Ollama host, shared process-wide.
+
+    Guarantees:
+    - Connection reuse: one httpx pool (keep-alive) instead of a fresh
+      connection, or a fresh executor thread, per prompt.
+    - Bounded concurrency: at most 'max_concurrency' requests in flight
+      against the host; further prompts wait on a semaphore.
+    - Backpressure: when 'max_waiting' prompts are already waiting, new
+      ones fail fast with ServiceOverloaded instead of piling up.
+
+    Dev Note: httpx clients and semaphores belong to one event loop. If the
+    client is used from a different loop (e.g. asyncio.run() per call), it
+    transparently opens a new pool for that loop.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        max_concurrency: int | None = None,
+        max_waiting: int | None = None,
+        timeout: float | None = None,
+    ):
+        self.host = host
+        self.max_concurrency = max_concurrency or settings.ollama_max_concurrency
+        self.max_waiting = settings.ollama_max_waiting if max_waiting is None else max_waiting
+        self.timeout = timeout or settings.ollama_timeout_seconds
+
+        self._client: Optional[AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight = 0
+        self._waiting = 0
+        self.rejected = 0
+
+    async def chat(self, model: str, prompt: str, options: Optional[dict] = None) -> str:
+        """One prompt -> text round trip."""
+        client, semaphore = self._bind()
+
+        if self._waiting >= self.max_waiting:
+            self.rejected += 1
+            logger.warning(f"Ollama {self.host}: {self._waiting} prompts waiting, rejecting")
+            raise ServiceOverloaded(f"Ollama host {self.host} is saturated. Please retry shortly.")
+
+        self._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        try:
+            response = await client.chat(
+                model=model,
+                options=options or {"temperature": 0.2},
+                messages=[{"role": "user", "content": prompt}],
+                keep_alive=settings.ollama_keep_alive,
+            )
+            return response["message"]["content"]
+        finally:
+            self._in_flight -= 1
+            semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "host": self.host,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "rejected": self.rejected,
+            "max_concurrency": self.max_concurrency,
+        }
+
+    async def close(self):
+        # A pool opened on another (finished) loop can't be closed from here; drop it
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.close()
+        self._client = None
+
+    def _bind(self):
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = AsyncClient(
+                host=self.host,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                    keepalive_expiry=settings.ollama_keepalive_seconds,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client, self._semaphore
+
+
+# One client (pool + semaphore) per Ollama host, per process
+_clients: Dict[str, AsyncOllamaClient] = {}
+
+
+def get_async_ollama(host: Optional[str] = None) -> AsyncOllamaClient:
+    key = host or ""
+    if key not in _clients:
+        logger.info(f"LLM: Creating shared async Ollama client for {host or 'default host'}")
+        _clients[key] = AsyncOllamaClient(host)
+    return _clients[key]
+
+
+async def close_async_ollama():
+    """Closes every shared pool (application shutdown)."""
+    for client in _clients.values():
+        await client.close()
+    _clients.clear()
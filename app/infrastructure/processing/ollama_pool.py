@@ -0,0 +1,255 @@
+import time
+import logging
+import threading
+from typing import Dict, List, Optional
+
+import httpx
+from ollama import Client, ResponseError
+
+from app.infrastructure.config import settings
+from app.domain.exceptions import ServiceOverloaded
+from app.infrastructure.metrics import (
+    LLM_HOST_HEALTHY,
+    LLM_HOST_TRANSITIONS,
+    LLM_REQUEST_SECONDS,
+    LLM_REQUESTS,
+    LLM_ROUTED,
+)
+from app.infrastructure.processing.llm_client import get_async_ollama
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "http://localhost:11434"
+# Weight of the newest sample in a host's moving-average latency
+LATENCY_SMOOTHING = 0.3
+
+
+def _is_host_error(e: Exception) -> bool:
+    """Failures that say something about the HOST (down, timing out, 5xx), not the prompt."""
+    if isinstance(e, ResponseError):
+        return e.status_code >= 500
+    return isinstance(e, (ConnectionError, httpx.TransportError))
+
+
+def _keep_host_error(last_error: Optional[Exception], e: Exception) -> Optional[Exception]:
+    """The error to report if failover runs out: a full queue only counts when no host actually failed."""
+    return last_error if isinstance(e, ServiceOverloaded) else e
+
+
+class OllamaHost:
+    """One Ollama endpoint and its routing state."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.client = Client(host=url, timeout=settings.ollama_timeout_seconds)
+        self.aclient = get_async_ollama(url)
+        self.outstanding = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.latency: Optional[float] = None
+
+    def available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "outstanding": self.outstanding,
+            "failures": self.failures,
+            "ejected": not self.available(time.monotonic()),
+            "latency": round(self.latency, 3) if self.latency is not None else None,
+        }
+
+
+class OllamaPool:
+    """
+    Routes prompts across several Ollama hosts.
+
+    Workflow:
+    1. Routing: each prompt goes to the available host with the fewest
+       outstanding requests (ties: lowest moving-average latency).
+    2. Failover: a connection error, timeout or 5xx marks the host and the
+       prompt is retried on the next host; prompt errors (4xx) are raised.
+       When every host has been tried, the last host error is raised;
+       ServiceOverloaded only means no host could even be tried (all
+       ejected or their queues full).
+    3. Ejection: after 'eject_after' consecutive host failures the host sits
+       out 'eject_seconds'. Afterwards it is on probation: one success
+       readmits it, one failure ejects it again.
+    4. Probing and warm-up: probe() checks /api/tags; warm_up() probes every
+       host and loads the model (keep_alive) so the first prompt doesn't pay
+       the model load.
+
+    Dev Note: Routing state is in-process. Each Celery worker process (and the
+    API) keeps its own view of the hosts, which is fine for least-outstanding
+    routing since it only has to balance its own requests.
+    """
+
+    def __init__(self, urls: List[str], eject_after: int | None = None, eject_seconds: float | None = None):
+        self.hosts = [OllamaHost(url) for url in urls]
+        self.eject_after = eject_after or settings.ollama_eject_after_failures
+        self.eject_seconds = settings.ollama_eject_seconds if eject_seconds is None else eject_seconds
+        self._lock = threading.Lock()
+        for host in self.hosts:
+            LLM_HOST_HEALTHY.labels(host.url).set(1)
+
+    # --- PROMPTS ---
+
+    def complete(self, model: str, prompt: str, options: Optional[dict] = None) -> str:
+        """Blocking prompt -> text (Celery path)."""
+        tried: List[OllamaHost] = []
+        last_error: Optional[Exception] = None
+        while True:
+            host = self._acquire(tried, last_error)
+            started = time.perf_counter()
+            try:
+                response = host.client.chat(
+                    model=model,
+                    options=options or {"temperature": 0.2},
+                    messages=[{"role": "user", "content": prompt}],
+                    keep_alive=settings.ollama_keep_alive,
+                )
+            except Exception as e:
+                if self._release(host, started, e):
+                    last_error = _keep_host_error(last_error, e)
+                    continue
+                raise
+            self._release(host, started)
+            return response["message"]["content"]
+
+    async def acomplete(self, model: str, prompt: str, options: Optional[dict] = None) -> str:
+        """Async prompt -> text, over each host's shared AsyncOllamaClient."""
+        tried: List[OllamaHost] = []
+        last_error: Optional[Exception] = None
+        while True:
+            host = self._acquire(tried, last_error)
+            started = time.perf_counter()
+            try:
+                text = await host.aclient.chat(model, prompt, options)
+            except Exception as e:
+                if self._release(host, started, e):
+                    last_error = _keep_host_error(last_error, e)
+                    continue
+                raise
+            self._release(host, started)
+            return text
+
+    # --- HEALTH ---
+
+    def probe(self, host: OllamaHost) -> bool:
+        """Cheap liveness check (GET /api/tags). Readmits or ejects the host."""
+        try:
+            httpx.get(f"{host.url}/api/tags", timeout=settings.ollama_probe_timeout_seconds).raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"Ollama {host.url}: Probe failed: {e}")
+            with self._lock:
+                host.failures = max(host.failures, self.eject_after - 1)
+                self._record_failure(host)
+            return False
+
+        with self._lock:
+            self._record_success(host)
+        return True
+
+    def warm_up(self, model: str) -> Dict[str, bool]:
+        """Probes every host and loads 'model' on the healthy ones. Returns url -> warmed."""
+        warmed = {}
+        for host in self.hosts:
+            warmed[host.url] = False
+            if not self.probe(host):
+                continue
+            try:
+                # An empty prompt only loads the model and pins it for keep_alive
+                host.client.generate(model=model, prompt="", keep_alive=settings.ollama_keep_alive)
+                warmed[host.url] = True
+                logger.info(f"Ollama {host.url}: {model} loaded (keep_alive {settings.ollama_keep_alive})")
+            except Exception as e:
+                logger.warning(f"Ollama {host.url}: Warm-up of {model} failed: {e}")
+        return warmed
+
+    def stats(self) -> List[dict]:
+        return [host.to_dict() for host in self.hosts]
+
+    # --- ROUTING STATE ---
+
+    def _acquire(self, tried: List[OllamaHost], last_error: Optional[Exception] = None) -> OllamaHost:
+        """
+        Picks the next host for a prompt. Once none is left, raises the last
+        host error of this prompt, or ServiceOverloaded if no host failed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            candidates = [host for host in self.hosts if host not in tried and host.available(now)]
+            host = min(candidates, key=lambda h: (h.outstanding, h.latency or 0.0)) if candidates else None
+            if host is not None:
+                host.outstanding += 1
+                tried.append(host)
+
+        if host is None:
+            if last_error is not None:
+                logger.error(f"Ollama: All {len(tried)} tried host(s) failed, last error: {last_error}")
+                raise last_error
+            raise ServiceOverloaded("No Ollama host is available. Please retry shortly.")
+        LLM_ROUTED.labels(host.url).inc()
+        return host
+
+    def _release(self, host: OllamaHost, started: float, error: Optional[Exception] = None) -> bool:
+        """Books the outcome of one request. Returns True if the prompt should fail over."""
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            host.outstanding -= 1
+            if error is None:
+                host.latency = elapsed if host.latency is None else (
+                    LATENCY_SMOOTHING * elapsed + (1 - LATENCY_SMOOTHING) * host.latency
+                )
+                self._record_success(host)
+                outcome = "ok"
+            elif isinstance(error, ServiceOverloaded):
+                # That host's wait queue is full: try another, but it isn't unhealthy
+                outcome = "overloaded"
+            elif _is_host_error(error):
+                self._record_failure(host)
+                outcome = "host_error"
+            else:
+                outcome = "error"
+
+        LLM_REQUESTS.labels(host.url, outcome).inc()
+        if outcome != "overloaded":
+            LLM_REQUEST_SECONDS.labels(host.url).observe(elapsed)
+        if outcome == "host_error":
+            logger.warning(f"Ollama {host.url}: {type(error).__name__} ({host.failures} consecutive), failing over")
+        return outcome in ("host_error", "overloaded")
+
+    def _record_success(self, host: OllamaHost):
+        if host.failures >= self.eject_after:
+            logger.info(f"Ollama {host.url}: Readmitted")
+            LLM_HOST_TRANSITIONS.labels(host.url, "readmit").inc()
+            LLM_HOST_HEALTHY.labels(host.url).set(1)
+        host.failures = 0
+        host.ejected_until = 0.0
+
+    def _record_failure(self, host: OllamaHost):
+        host.failures += 1
+        if host.failures >= self.eject_after:
+            host.ejected_until = time.monotonic() + self.eject_seconds
+            logger.warning(f"Ollama {host.url}: Ejected for {self.eject_seconds:.0f}s")
+            LLM_HOST_TRANSITIONS.labels(host.url, "eject").inc()
+            LLM_HOST_HEALTHY.labels(host.url).set(0)
+
+
+def ollama_host_urls() -> List[str]:
+    """OLLAMA_HOSTS (comma-separated), else OLLAMA_BASE_URL, else the local default."""
+    raw = settings.ollama_hosts or settings.ollama_base_url or DEFAULT_HOST
+    return [url.strip().rstrip("/") for url in raw.split(",") if url.strip()]
+
+
+# One pool per process, shared by every DocumentProcessor
+_pool: Optional[OllamaPool] = None
+
+
+def get_ollama_pool() -> OllamaPool:
+    global _pool
+    if _pool is None:
+        _pool = OllamaPool(ollama_host_urls())
+        logger.info(f"LLM: Ollama pool with {len(_pool.hosts)} host(s): {', '.join(h.url for h in _pool.hosts)}")
+    return _pool
@@ -1,54 +1,97 @@
 import os
+import time
 import logging
 import asyncio
-import pandas as pd
-import pytesseract
-from ollama import Client
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_message
 from pypdf import PdfReader
 from google import genai
 from docx import Document as DocxReader
-from pdf2image import convert_from_path
 
 from app.infrastructure.config import settings
-from app.domain.exceptions import ProcessingError
+from app.domain.exceptions import ProcessingError, ServiceOverloaded
+from app.domain.extraction import ExtractionResult, PageText, OCR, HYBRID
 from app.domain.services.document_processor import DocumentProcessorInterface
+from app.domain.summary import SummaryResult
+from app.infrastructure.processing.gemini import FileHandleCache, LoopThread, file_sha256, upload_once
+from app.infrastructure.processing.ocr_engine import OcrEngine
+from app.infrastructure.processing.ollama_pool import get_ollama_pool
+from app.infrastructure.redis_client import get_sync_redis
+from app.infrastructure.processing.summarizer import ChunkedSummarizer, PROMPT_VERSION, TEMPERATURE
+from app.infrastructure.processing.summary_cache import SummaryCache, summary_key
+from app.infrastructure.processing.text_sanitizer import sanitize_text
+from app.infrastructure.processing.tabular import extract_csv, extract_spreadsheet
 
 logger = logging.getLogger(__name__)
 
+GEMINI_MODEL = "gemini-2.0-flash"
+GEMINI_PROMPT = (
+    "Analyze the document below and extract its most important insights.\n"
+    "Rules:\n"
+    "- Provide EXACTLY 4 bullet points\n"
+    "- Each bullet should capture a key insight\n"
+    "- No intro, no conclusion\n"
+    "- Output ONLY bullet points\n\n"
+    "Document:"
+)
+# Part of the summary cache key: bump whenever GEMINI_PROMPT changes
+GEMINI_PROMPT_VERSION = "1"
+# Texts shorter than this are never summarized, so never cached either
+MIN_SUMMARY_CHARS = 50
+# Extraction text of a scanned PDF nothing could be read from (never cached: every such scan has it)
+OCR_FAILED_TEXT = "[This appears to be a scanned PDF with no extractable text. OCR failed.]"
+
 
 class DocumentProcessor(DocumentProcessorInterface):
     def __init__(self):
         self.provider = settings.ai_provider.lower()
         self.api_key = settings.gemini_api.strip('"')
 
-        # Gemini client (async)
+        # Gemini client (async surface, client.aio), its uploads reused by content
+        # hash, and the one loop every Gemini call runs on (see LoopThread)
         self.gemini_client = genai.Client(api_key=self.api_key)
+        self.gemini_files = FileHandleCache(get_sync_redis, namespace=self.api_key)
+        self.gemini_loop = LoopThread()
 
         # Ollama
         self.ollama_model = settings.ollama_model
-        self.ollama_client = Client(host=settings.ollama_base_url)
+        # Least-loaded routing over OLLAMA_HOSTS (sync + shared async clients per host)
+        self.ollama_pool = get_ollama_pool()
 
-    # TEXT SANITIZATION (GLOBAL – CRITICAL)
-    
-    def _sanitize_text(self, text: str) -> str:
-        if not text:
-            return ""
+        # OCR (process pool, created lazily on the first scanned PDF)
+        self.ocr_engine = OcrEngine()
 
-        # Remove NULL bytes (DB / JSON killers)
-        text = text.replace("\x00", "")
+        # Map-reduce summarizer for long documents
+        self.summarizer = ChunkedSummarizer(self._ollama_complete, acomplete=self._ollama_acomplete)
 
-        # Remove other control characters except whitespace
-        text = "".join(
-            c for c in text
-            if c.isprintable() or c in "\n\r\t"
-        )
+        # Identical text is summarized once (retries, templates, duplicate scans)
+        self.summary_cache = SummaryCache(get_sync_redis) if settings.summary_cache_enabled else None
 
-        return text.strip()
+    @property
+    def model_name(self) -> str:
+        """The model that produces summaries for the configured provider."""
+        return self.ollama_model if self.provider == "ollama" else GEMINI_MODEL
+
+    # TEXT SANITIZATION (GLOBAL – CRITICAL)
+    
+    def _sanitize_text(self, text: str) -> str:
+        # Removes NULs (DB / JSON killers) and control characters except whitespace.
+        # Every piece of text is sanitized exactly once: per page, per OCR page, per summary.
+        return sanitize_text(text)
 
     # TEXT EXTRACTION (EXTENSION + MIME SAFE)
     
-    def _extract_text_metadata(self, file_path: str, mime_type: str | None = None) -> str:
+    def _extract_text_metadata(self, file_path: str, mime_type: str | None = None, run_ocr: bool = True) -> ExtractionResult:
+        """
+        Runs a single extraction pass over the document.
+
+        The returned ExtractionResult is shared by the summarizer and the
+        analysis builder, so callers must not extract the same file twice.
+
+        With run_ocr=False (the staged pipeline's extract stage), PDF pages
+        that need OCR are only listed in 'pending_ocr'; see ocr_pending_pages().
+        """
+        result = ExtractionResult()
+        started = time.perf_counter()
         text = ""
 
         try:
@@ -74,41 +117,9 @@ class DocumentProcessor(DocumentProcessorInterface):
 
             # ---------------- PDF ----------------
             if is_pdf:
-                reader = PdfReader(file_path)
-
-                for i, page in enumerate(reader.pages):
-                    page_text = page.extract_text() or ""
-                    page_text = self._sanitize_text(page_text)
-                    text += page_text
-                    logger.debug(f"PDF page {i + 1}: {len(page_text)} chars")
-
-                logger.info(f"PDF extraction complete: {len(text)} characters")
-
-                # OCR fallback
-                if not text.strip():
-                    logger.warning("PDF appears to be scanned. Using OCR...")
-                    try:
-                        pages = convert_from_path(file_path)
-                        ocr_text = ""
-
-                        for i, page_image in enumerate(pages[:20]):
-                            ocr_page_text = pytesseract.image_to_string(page_image)
-                            ocr_page_text = self._sanitize_text(ocr_page_text)
-                            ocr_text += ocr_page_text
-                            logger.debug(f"OCR page {i + 1}: {len(ocr_page_text)} chars")
-
-                        if not ocr_text.strip():
-                            logger.error("OCR failed to extract any text.")
-                            text = "[This appears to be a scanned PDF with no extractable text. OCR failed.]"
-                        else:
-                            text = ocr_text
-                            logger.info(f"OCR extraction complete: {len(text)} characters")
-
-                    except Exception as e:
-                        logger.error("OCR processing failed", exc_info=True)
-                        raise ProcessingError(f"Text extraction error: {e}")
-
-                return self._sanitize_text(text)
+                self._extract_pdf(file_path, result, run_ocr)
+                result.timings["total"] = time.perf_counter() - started
+                return result
 
             # ---------------- DOCX ----------------
             elif is_docx:
@@ -116,17 +127,21 @@ class DocumentProcessor(DocumentProcessorInterface):
                 text = "\n".join(p.text for p in doc.paragraphs)
                 logger.info(f"DOCX extraction: {len(text)} characters")
 
-            # ---------------- EXCEL ----------------
-            elif is_excel:
-                df = pd.read_excel(file_path, nrows=500)
-                text = df.to_string(index=False)
-                logger.info(f"Excel extraction: {len(text)} characters")
-
-            # ---------------- CSV ----------------
-            elif is_csv:
-                df = pd.read_csv(file_path, nrows=500)
-                text = df.to_string(index=False)
-                logger.info(f"CSV extraction: {len(text)} characters")
+            # ---------------- EXCEL / CSV ----------------
+            # Streamed: every sheet, compact 'a | b' rows, per-column profiles over all rows
+            elif is_excel or is_csv:
+                if is_excel:
+                    legacy = ext == ".xls" or mime_type == "application/vnd.ms-excel"
+                    tabular = extract_spreadsheet(file_path, legacy=legacy)
+                else:
+                    tabular = extract_csv(file_path)
+                result.pages = [
+                    PageText(number=number, text=self._sanitize_text(section))
+                    for number, section in enumerate(tabular.sections, start=1)
+                ] or [PageText(number=1, text="")]
+                result.tables = tabular.tables
+                result.timings["total"] = time.perf_counter() - started
+                return result
 
             # ---------------- TXT ----------------
             elif is_txt:
@@ -137,11 +152,101 @@ class DocumentProcessor(DocumentProcessorInterface):
             else:
                 logger.warning(f"Unsupported file type: {mime_type or ext}")
 
+        except ProcessingError:
+            raise
+
         except Exception as e:
             logger.error("Text extraction failed", exc_info=True)
             raise ProcessingError(f"Text extraction error: {e}")
 
-        return self._sanitize_text(text)
+        # Non-paged formats are stored as a single logical page
+        result.pages = [PageText(number=1, text=self._sanitize_text(text))]
+        result.timings["total"] = time.perf_counter() - started
+        return result
+
+    # PDF (PER-PAGE TEXT LAYER / OCR ROUTING)
+
+    def _extract_pdf(self, file_path: str, result: ExtractionResult, run_ocr: bool = True) -> None:
+        """
+        Reads the text layer page by page and OCRs only the pages that need it.
+
+        Dev Note: A page is routed to OCR when its text layer has fewer than
+        'ocr_min_page_chars' characters, so mixed PDFs (a few digital pages
+        followed by scans) keep their digital text AND get the scans OCR'd.
+        """
+        started = time.perf_counter()
+        reader = PdfReader(file_path)
+
+        for i, page in enumerate(reader.pages):
+            page_text = self._sanitize_text(page.extract_text() or "")
+            result.pages.append(PageText(number=i + 1, text=page_text))
+            logger.debug(f"PDF page {i + 1}: {len(page_text)} chars")
+
+        result.timings["text_layer"] = time.perf_counter() - started
+        logger.info(f"PDF text layer: {sum(len(p.text) for p in result.pages)} characters")
+
+        needs_ocr = [page.number for page in result.pages if len(page.text) < settings.ocr_min_page_chars]
+        if not needs_ocr:
+            return
+
+        if len(needs_ocr) > settings.ocr_max_pages:
+            logger.warning(f"OCR: {len(needs_ocr)} pages need OCR, only the first {settings.ocr_max_pages} will be processed")
+            needs_ocr = needs_ocr[:settings.ocr_max_pages]
+
+        logger.warning(f"{len(needs_ocr)} of {len(result.pages)} PDF pages have no usable text layer. Using OCR...")
+        result.pending_ocr = needs_ocr
+
+        if run_ocr:
+            self.ocr_pending_pages(file_path, result)
+
+    def ocr_pending_pages(self, file_path: str, result: ExtractionResult) -> None:
+        """
+        OCRs the pages listed in result.pending_ocr and merges them into result.
+
+        Dev Note: Split out of _extract_pdf so the staged pipeline can run
+        it on a separate (CPU-sized) queue.
+        """
+        needs_ocr, result.pending_ocr = result.pending_ocr, []
+        if not needs_ocr:
+            return
+
+        ocr_started = time.perf_counter()
+
+        try:
+            ocr_results = self.ocr_engine.ocr_pdf(file_path, needs_ocr)
+        except Exception as e:
+            logger.error("OCR processing failed", exc_info=True)
+            raise ProcessingError(f"Text extraction error: {e}")
+
+        # Merge back in page order; keep the text layer if OCR found less on that page
+        for ocr_page in ocr_results:
+            ocr_text = self._sanitize_text(ocr_page.text)
+            if len(ocr_text) > len(result.pages[ocr_page.number - 1].text):
+                result.pages[ocr_page.number - 1] = PageText(
+                    number=ocr_page.number,
+                    text=ocr_text,
+                    method=OCR,
+                    seconds=ocr_page.seconds,
+                )
+
+        result.timings["ocr"] = time.perf_counter() - ocr_started
+
+        ocr_page_count = sum(1 for page in result.pages if page.method == OCR)
+        if ocr_page_count == len(result.pages):
+            result.method = OCR
+        elif ocr_page_count:
+            result.method = HYBRID
+
+        if not any(page.text.strip() for page in result.pages):
+            logger.error("OCR failed to extract any text.")
+            result.method = OCR
+            result.pages = [PageText(
+                number=1,
+                text=OCR_FAILED_TEXT,
+                method=OCR,
+            )]
+        else:
+            logger.info(f"OCR extraction complete: {ocr_page_count} pages recovered")
 
     # GEMINI (ASYNC)
 
@@ -151,76 +256,93 @@ class DocumentProcessor(DocumentProcessorInterface):
         retry=retry_if_exception_message(match=".*Rate Limit.*|.*429.*"),
     )
     async def _get_gemini_summary(self, file_path: str, mime_type: str) -> str:
+        """
+        Dev Note: Must run on self.gemini_loop (use _run_gemini_summary*).
+        A retry (rate limit) reuses the upload instead of sending the file again.
+        """
         try:
-            uploaded_file = self.gemini_client.files.upload(
-                file=file_path,
-                config={"mime_type": mime_type},
-            )
+            uploaded_file = await upload_once(self.gemini_client, self.gemini_files, file_path, mime_type)
 
-            await asyncio.sleep(2)
-
-            response = self.gemini_client.models.generate_content(
-                model="gemini-2.0-flash",
-                contents=[
-                    "Analyze the document below and extract its most important insights.\n"
-                    "Rules:\n"
-                    "- Provide EXACTLY 4 bullet points\n"
-                    "- Each bullet should capture a key insight\n"
-                    "- No intro, no conclusion\n"
-                    "- Output ONLY bullet points\n\n"
-                    "Document:",
-                    uploaded_file,
-                ],
+            response = await self.gemini_client.aio.models.generate_content(
+                model=GEMINI_MODEL,
+                contents=[GEMINI_PROMPT, uploaded_file],
             )
 
             return response.text.strip()
 
+        except ProcessingError:
+            raise
+
         except Exception as e:
             if "429" in str(e):
                 raise Exception("Gemini Rate Limit")
             raise Exception(f"Gemini error: {e}")
 
+    async def _run_gemini_summary(self, file_path: str, mime_type: str) -> str:
+        """From any event loop (FastAPI): awaits the summary running on the Gemini loop."""
+        return await asyncio.wrap_future(self.gemini_loop.submit(self._get_gemini_summary(file_path, mime_type)))
+
+    def _run_gemini_summary_sync(self, file_path: str, mime_type: str) -> str:
+        """From a plain thread (Celery): blocks until the summary is ready."""
+        return self.gemini_loop.run(self._get_gemini_summary(file_path, mime_type))
+
     
     # OLLAMA (SYNC – CELERY SAFE)
     
-    def _get_ollama_summary_sync(self, file_path: str, mime_type: str | None = None) -> str:
-        try:
-            extracted_text = self._sanitize_text(
-                self._extract_text_metadata(file_path, mime_type)
-            )
+    def _ollama_complete(self, prompt: str) -> str:
+        """One blocking prompt -> text round trip (used by the chunked summarizer)."""
+        return self.ollama_pool.complete(self.ollama_model, prompt, {"temperature": TEMPERATURE})
 
-            if not extracted_text or len(extracted_text) < 50:
-                raise ProcessingError(
-                    f"NON_RETRYABLE: document too short ({len(extracted_text)} chars)"
-                )
+    def _get_ollama_summary_sync(self, extraction: ExtractionResult) -> SummaryResult:
+        try:
+            self._check_summarizable(extraction)
 
-            if len(extracted_text) > 8000:
-                extracted_text = extracted_text[:8000] + "...(truncated)"
+            # Long documents are map-reduced chunk by chunk instead of truncated
+            summary = self.summarizer.summarize(extraction.pages)
+            summary.text = self._sanitize_text(summary.text)
+            return summary
 
-            logger.info(f"Sending {len(extracted_text)} chars to Ollama")
+        except ProcessingError:
+            raise
 
-            response = self.ollama_client.chat(
-                model=self.ollama_model,
-                options={"temperature": 0.2},
-                messages=[{
-                    "role": "user",
-                    "content": f"""Analyze the document below and extract its most important insights.
+        except Exception as e:
+            if "NUL" in str(e):
+                raise ProcessingError("NON_RETRYABLE: NUL character detected")
+            logger.error("Ollama processing failed", exc_info=True)
+            raise ProcessingError(f"AI Engine failed: {e}")
 
-RULES (STRICT):
-- EXACTLY 4 bullet points
-- One sentence per bullet
-- No intro, no conclusion
-- Output ONLY bullet points
+    def _check_summarizable(self, extraction: ExtractionResult) -> None:
+        extracted_text = extraction.text
 
-DOCUMENT:
-{extracted_text}
-"""
-                }],
+        if not extracted_text or len(extracted_text) < MIN_SUMMARY_CHARS:
+            raise ProcessingError(
+                f"NON_RETRYABLE: document too short ({len(extracted_text)} chars)"
             )
 
-            return self._sanitize_text(response["message"]["content"])
+        logger.info(f"Sending {len(extracted_text)} chars to Ollama")
 
-        except ProcessingError:
+    
+    # OLLAMA (ASYNC – FASTAPI)
+    
+    async def _ollama_acomplete(self, prompt: str) -> str:
+        """Async twin of _ollama_complete(), over the hosts' shared async clients."""
+        return await self.ollama_pool.acomplete(self.ollama_model, prompt, {"temperature": TEMPERATURE})
+
+    async def _get_ollama_summary(self, extraction: ExtractionResult) -> SummaryResult:
+        """
+        Dev Note: Runs on the event loop instead of a default-executor thread,
+        so concurrent requests are bounded by the client's per-host semaphore
+        rather than by the thread pool size. ServiceOverloaded passes through
+        untouched so the API can answer 503 instead of 500.
+        """
+        try:
+            self._check_summarizable(extraction)
+
+            summary = await self.summarizer.asummarize(extraction.pages)
+            summary.text = self._sanitize_text(summary.text)
+            return summary
+
+        except (ProcessingError, ServiceOverloaded):
             raise
 
         except Exception as e:
@@ -234,29 +356,30 @@ DOCUMENT:
     
     async def process(self, file_path: str, mime_type: str | None = None) -> dict:
         logger.info(f"Processing document with {self.provider}: {file_path}")
+        loop = asyncio.get_running_loop()
 
-        if self.provider == "ollama":
-            loop = asyncio.get_running_loop()
-            summary = await loop.run_in_executor(
-                None, self._get_ollama_summary_sync, file_path, mime_type
-            )
-        else:
-            summary = await self._get_gemini_summary(file_path, mime_type)
-
-        raw_text = self._sanitize_text(
-            self._extract_text_metadata(file_path, mime_type)
+        # Single extraction pass, shared by the summarizer and the analysis builder
+        extraction = await loop.run_in_executor(
+            None, self._extract_text_metadata, file_path, mime_type
         )
 
-        return {
-            "raw_text": raw_text,
-            "analysis": {
-                "summary": summary,
-                "word_count": len(raw_text.split()),
-                "contains_email": "@" in raw_text,
-                "contains_money": any(s in raw_text for s in ["$", "USD", "NGN", "€"]),
-                "ai_provider": self.provider,
-            },
-        }
+        # Summary cache lookups may hit Redis (blocking client) and the Gemini key
+        # hashes the file: keep both off the loop
+        key = await loop.run_in_executor(None, self._summary_key, extraction, file_path, mime_type)
+        summary = await loop.run_in_executor(None, self._cached_summary, key)
+
+        if summary is None:
+            if self.provider == "ollama":
+                summary = await self._get_ollama_summary(extraction)
+            else:
+                summary_started = time.perf_counter()
+                summary = SummaryResult(
+                    text=await self._run_gemini_summary(file_path, mime_type),
+                    timings={"summary": time.perf_counter() - summary_started},
+                )
+            await loop.run_in_executor(None, self._remember_summary, key, summary)
+
+        return self._build_result(extraction, summary)
 
     
     # CELERY (SYNC)
@@ -264,29 +387,104 @@ DOCUMENT:
     def process_sync(self, file_path: str, mime_type: str | None = None) -> dict:
         logger.info(f"Processing document with {self.provider}: {file_path}")
 
-        if self.provider == "ollama":
-            summary = self._get_ollama_summary_sync(file_path, mime_type)
-        else:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                summary = loop.run_until_complete(
-                    self._get_gemini_summary(file_path, mime_type)
+        # Single extraction pass, shared by the summarizer and the analysis builder
+        extraction = self._extract_text_metadata(file_path, mime_type)
+
+        return self.summarize_sync(extraction, file_path, mime_type)
+
+    def summarize_sync(self, extraction: ExtractionResult, file_path: str | None = None, mime_type: str | None = None) -> dict:
+        """
+        Summarizes an existing extraction and builds the final result.
+        Used directly by the staged pipeline's LLM stage ('file_path' is only needed for Gemini).
+        """
+        # A retry of the LLM stage (e.g. after the DB commit failed) hits the cache
+        # instead of paying for a second generation
+        key = self._summary_key(extraction, file_path, mime_type)
+        summary = self._cached_summary(key)
+
+        if summary is None:
+            if self.provider == "ollama":
+                summary = self._get_ollama_summary_sync(extraction)
+            else:
+                summary_started = time.perf_counter()
+                summary = SummaryResult(
+                    text=self._run_gemini_summary_sync(file_path, mime_type),
+                    timings={"summary": time.perf_counter() - summary_started},
                 )
-            finally:
-                loop.close()
+            self._remember_summary(key, summary)
+
+        return self._build_result(extraction, summary)
 
-        raw_text = self._sanitize_text(
-            self._extract_text_metadata(file_path, mime_type)
+    
+    # SUMMARY CACHE
+
+    def _summary_key(self, extraction: ExtractionResult, file_path: str | None = None, mime_type: str | None = None) -> str | None:
+        """
+        None when the summary must not be cached (caching disabled, text too
+        short, OCR found nothing).
+
+        Dev Note: Ollama summarizes the extracted text, so its key is the text.
+        Gemini summarizes the uploaded FILE, so its key is the file's content
+        hash and mime type: different files with the same (or no) text must
+        never share a summary.
+        """
+        text = extraction.text
+        if self.summary_cache is None or text.strip() == OCR_FAILED_TEXT:
+            return None
+        if self.provider == "ollama":
+            if not text or len(text) < MIN_SUMMARY_CHARS:
+                return None
+            return summary_key(
+                text, self.provider, self.model_name, TEMPERATURE, PROMPT_VERSION,
+                chunk_size=self.summarizer.chunk_size,
+                overlap=self.summarizer.overlap,
+                max_chunks=self.summarizer.max_chunks,
+            )
+        if not file_path:
+            return None
+        return summary_key(
+            "", self.provider, self.model_name, None, GEMINI_PROMPT_VERSION,
+            file=file_sha256(file_path), mime_type=mime_type,
         )
 
+    def _cached_summary(self, key: str | None) -> SummaryResult | None:
+        if key is None:
+            return None
+        started = time.perf_counter()
+        summary = self.summary_cache.get(key)
+        if summary is not None:
+            logger.info(f"Summary cache hit ({self.provider}/{self.model_name}), skipping the LLM")
+            summary.timings = {"summary": time.perf_counter() - started}
+        return summary
+
+    def _remember_summary(self, key: str | None, summary: SummaryResult):
+        if key is not None:
+            self.summary_cache.set(key, summary)
+
+    
+    # RESULT BUILDER
+
+    def _build_result(self, extraction: ExtractionResult, summary: SummaryResult) -> dict:
+        raw_text = extraction.text
+
         return {
             "raw_text": raw_text,
             "analysis": {
-                "summary": summary,
+                "summary": summary.text,
+                "summary_chunks": summary.chunks,
+                # Only part of a very long document was read (see summary_max_chunks)
+                "summary_chunks_total": summary.total_chunks,
+                "summary_sampled": summary.sampled,
+                "summary_cached": summary.cached,
                 "word_count": len(raw_text.split()),
                 "contains_email": "@" in raw_text,
                 "contains_money": any(s in raw_text for s in ["$", "USD", "NGN", "€"]),
                 "ai_provider": self.provider,
+                "ai_model": self.model_name,
+                **extraction.describe(),
+                "timings": {
+                    stage: round(seconds, 4)
+                    for stage, seconds in {**extraction.timings, **summary.timings}.items()
+                },
             },
         }
@@ -0,0 +1,249 @@
+import re
+import time
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Optional
+
+from app.infrastructure.config import settings
+from app.domain.extraction import PageText
+from app.domain.summary import SummaryResult
+
+logger = logging.getLogger(__name__)
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+# --- PROMPTS ---
+# Part of the summary cache key: bump whenever a prompt (or TEMPERATURE) changes
+PROMPT_VERSION = "1"
+TEMPERATURE = 0.2
+
+# FINAL_PROMPT is used as-is when the whole document fits in one chunk.
+FINAL_PROMPT = """Analyze the document below and extract its most important insights.
+
+RULES (STRICT):
+- EXACTLY 4 bullet points
+- One sentence per bullet
+- No intro, no conclusion
+- Output ONLY bullet points
+
+DOCUMENT:
+{document}
+"""
+
+MAP_PROMPT = """Below is section {index} of {total} of a longer document.
+Summarize the key facts, figures, names and conclusions of THIS section.
+
+RULES (STRICT):
+- At most 5 short bullet points
+- Keep numbers and names exactly as written
+- Output ONLY bullet points
+
+SECTION:
+{document}
+"""
+
+REDUCE_PROMPT = """Below are notes taken from every section of a long document, in order.
+Using ONLY these notes, extract the document's most important insights.
+
+RULES (STRICT):
+- EXACTLY 4 bullet points
+- One sentence per bullet
+- No intro, no conclusion
+- Output ONLY bullet points
+
+NOTES:
+{notes}
+"""
+
+
+# --- CHUNKING ---
+
+def _pack(units: list[str], chunk_size: int, overlap: int = 0) -> list[str]:
+    """Greedily packs text units into chunks of at most ~chunk_size characters."""
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+
+    for unit in units:
+        if current and size + len(unit) > chunk_size:
+            chunks.append("\n\n".join(current))
+            tail = _tail(chunks[-1], overlap)
+            current, size = ([tail], len(tail) + 2) if tail else ([], 0)
+        current.append(unit)
+        size += len(unit) + 2
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _tail(text: str, overlap: int) -> str:
+    """The last 'overlap' characters of a chunk, starting on a word boundary."""
+    if overlap <= 0:
+        return ""
+    tail = text[-overlap:]
+    space = tail.find(" ")
+    return tail[space + 1:] if space != -1 and len(text) > overlap else tail
+
+
+def chunk_pages(pages: list[PageText], chunk_size: int, overlap: int = 0) -> list[str]:
+    """
+    Splits extracted pages into summarization chunks.
+
+    Chunks break on page and paragraph boundaries; only paragraphs that are
+    themselves longer than a chunk are cut (on the last space that fits).
+    Consecutive chunks share 'overlap' characters of context.
+    """
+    overlap = max(0, min(overlap, chunk_size // 2))
+    limit = chunk_size - overlap
+    units: list[str] = []
+
+    for page in pages:
+        for paragraph in PARAGRAPH_BREAK.split(page.text):
+            paragraph = paragraph.strip()
+            while len(paragraph) > limit:
+                cut = paragraph.rfind(" ", 0, limit)
+                if cut <= 0:
+                    cut = limit
+                units.append(paragraph[:cut])
+                paragraph = paragraph[cut:].lstrip()
+            if paragraph:
+                units.append(paragraph)
+
+    return _pack(units, chunk_size, overlap)
+
+
+# --- MAP-REDUCE SUMMARIZER ---
+
+class ChunkedSummarizer:
+    """
+    Map-reduce summarization for documents that don't fit in one prompt.
+
+    Workflow:
+    1. MAP: every chunk is summarized into short notes, with at most
+       'concurrency' requests in flight against the LLM host.
+    2. COLLAPSE: if the notes are still too long for one prompt, they are
+       re-chunked and summarized again.
+    3. REDUCE: the notes are turned into the final 4 bullet points.
+
+    Dev Note: 'complete' is any blocking prompt -> text callable, so the
+    same pipeline works for every LLM backend. 'acomplete' is its async
+    twin, used by asummarize() (the API's async path) without threads.
+    """
+
+    def __init__(
+        self,
+        complete: Callable[[str], str],
+        chunk_size: int | None = None,
+        overlap: int | None = None,
+        concurrency: int | None = None,
+        max_chunks: int | None = None,
+        acomplete: Optional[Callable[[str], Awaitable[str]]] = None,
+    ):
+        self.complete = complete
+        self.acomplete = acomplete
+        self.chunk_size = chunk_size or settings.summary_chunk_size
+        self.overlap = settings.summary_chunk_overlap if overlap is None else overlap
+        self.concurrency = max(1, concurrency or settings.summary_concurrency)
+        self.max_chunks = max_chunks or settings.summary_max_chunks
+
+    def summarize(self, pages: list[PageText]) -> SummaryResult:
+        started = time.perf_counter()
+        chunks, total = self._chunks(pages)
+
+        # Short documents: one request, exactly like before chunking existed
+        if len(chunks) <= 1:
+            text = self.complete(FINAL_PROMPT.format(document=chunks[0] if chunks else ""))
+            return SummaryResult(text=text, timings={"summary": time.perf_counter() - started})
+
+        logger.info(f"Summarizer: Map stage over {len(chunks)} chunks (concurrency {self.concurrency})")
+        notes = self._map(MAP_PROMPT, chunks)
+        map_seconds = time.perf_counter() - started
+
+        # Collapse until the notes fit into a single reduce prompt
+        reduce_started = time.perf_counter()
+        while len(notes) > 1 and sum(len(n) for n in notes) > self.chunk_size:
+            groups = _pack(notes, self.chunk_size)
+            if len(groups) >= len(notes):
+                break
+            logger.info(f"Summarizer: Collapsing {len(notes)} notes into {len(groups)}")
+            notes = self._map(MAP_PROMPT, groups)
+
+        text = self.complete(REDUCE_PROMPT.format(notes="\n\n".join(notes)))
+
+        return self._result(text, len(chunks), total, started, map_seconds, reduce_started)
+
+    async def asummarize(self, pages: list[PageText]) -> SummaryResult:
+        """summarize() for the event loop: same prompts and stages, awaited via 'acomplete'."""
+        started = time.perf_counter()
+        chunks, total = self._chunks(pages)
+
+        if len(chunks) <= 1:
+            text = await self.acomplete(FINAL_PROMPT.format(document=chunks[0] if chunks else ""))
+            return SummaryResult(text=text, timings={"summary": time.perf_counter() - started})
+
+        logger.info(f"Summarizer: Async map stage over {len(chunks)} chunks (concurrency {self.concurrency})")
+        notes = await self._amap(MAP_PROMPT, chunks)
+        map_seconds = time.perf_counter() - started
+
+        reduce_started = time.perf_counter()
+        while len(notes) > 1 and sum(len(n) for n in notes) > self.chunk_size:
+            groups = _pack(notes, self.chunk_size)
+            if len(groups) >= len(notes):
+                break
+            logger.info(f"Summarizer: Collapsing {len(notes)} notes into {len(groups)}")
+            notes = await self._amap(MAP_PROMPT, groups)
+
+        text = await self.acomplete(REDUCE_PROMPT.format(notes="\n\n".join(notes)))
+
+        return self._result(text, len(chunks), total, started, map_seconds, reduce_started)
+
+    def _chunks(self, pages: list[PageText]) -> tuple[list[str], int]:
+        """
+        The chunks to summarize, and how many the document was split into.
+
+        Dev Note: 'max_chunks' caps the LLM cost of one document. Beyond it
+        an even sample is summarized and the result records the truncation
+        (summary_chunks < summary_chunks_total), so it is never silent.
+        """
+        chunks = chunk_pages(pages, self.chunk_size, self.overlap)
+        total = len(chunks)
+        if total > self.max_chunks:
+            logger.warning(f"Summarizer: {total} chunks exceed the limit, sampling {self.max_chunks} evenly")
+            step = total / self.max_chunks
+            chunks = [chunks[int(i * step)] for i in range(self.max_chunks)]
+        return chunks, total
+
+    @staticmethod
+    def _result(text: str, chunks: int, total: int, started: float, map_seconds: float, reduce_started: float) -> SummaryResult:
+        return SummaryResult(
+            text=text,
+            chunks=chunks,
+            total_chunks=total,
+            timings={
+                "summary_map": map_seconds,
+                "summary_reduce": time.perf_counter() - reduce_started,
+                "summary": time.perf_counter() - started,
+            },
+        )
+
+    def _map(self, template: str, chunks: list[str]) -> list[str]:
+        prompts = [
+            template.format(index=i + 1, total=len(chunks), document=chunk)
+            for i, chunk in enumerate(chunks)
+        ]
+        # Bounded fan-out; map() keeps the notes in document order
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(prompts))) as executor:
+            return [note.strip() for note in executor.map(self.complete, prompts)]
+
+    async def _amap(self, template: str, chunks: list[str]) -> list[str]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(index: int, chunk: str) -> str:
+            async with semaphore:
+                return await self.acomplete(template.format(index=index + 1, total=len(chunks), document=chunk))
+
+        # gather() keeps the notes in document order
+        notes = await asyncio.gather(*(run(i, chunk) for i, chunk in enumerate(chunks)))
+        return [note.strip() for note in notes]
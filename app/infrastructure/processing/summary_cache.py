@@ -0,0 +1,163 @@
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from redis.exceptions import RedisError
+
+from app.infrastructure.config import settings
+from app.infrastructure.metrics import record_cache
+from app.domain.summary import SummaryResult
+
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = "summary:"
+# Sorted set of cached keys scored by write time; bounds the Redis tier's size
+REDIS_INDEX = "summary:index"
+# After a Redis error the shared tier is skipped for this long (local tier only)
+REDIS_RETRY_SECONDS = 30
+
+
+def summary_key(text: str, provider: str, model: str, temperature, prompt_version: str, **params) -> str:
+    """
+    Cache key of one summary: sha256 over the normalized input text and
+    everything else that changes the output.
+
+    Dev Note: Whitespace is collapsed before hashing, so the same content
+    re-extracted with different line breaks (re-scans, re-exports) still hits.
+    Bump the prompt version whenever a summary prompt changes.
+    """
+    digest = hashlib.sha256()
+    header = {"provider": provider, "model": model, "temperature": temperature, "prompt": prompt_version, **params}
+    digest.update(json.dumps(header, sort_keys=True).encode())
+    digest.update(b"\0")
+    digest.update(" ".join(text.split()).encode("utf-8", errors="replace"))
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """
+    Cache of LLM summaries, so identical text is never summarized twice.
+
+    Tiers:
+    1. Process-local LRU (OrderedDict) with 'ttl_seconds' expiry.
+    2. Shared Redis tier (sync client, like the pipeline handoff): entries
+       expire after 'ttl_seconds', and the oldest are evicted once more than
+       'max_entries' are stored. Summaries larger than 'max_bytes' are not cached.
+
+    Dev Note: Both tiers are optimisations only; a Redis error is logged and
+    the summary is generated as if it were a miss. The local tier is shared
+    by executor threads (and '-P threads' workers), so it is guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        redis_factory: Optional[Callable] = None,
+        ttl_seconds: int | None = None,
+        local_entries: int | None = None,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+    ):
+        self._redis_factory = redis_factory
+        self.ttl_seconds = settings.summary_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.local_entries = settings.summary_cache_local_entries if local_entries is None else local_entries
+        self.max_entries = max_entries or settings.summary_cache_max_entries
+        self.max_bytes = max_bytes or settings.summary_cache_max_bytes
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_down_until = 0.0
+
+    def get(self, key: str) -> Optional[SummaryResult]:
+        payload = self._get_local(key)
+        if payload is not None:
+            record_cache("summary", hit=True)
+            return _to_summary(payload)
+
+        redis = self._redis()
+        if redis is not None:
+            try:
+                raw = redis.get(f"{REDIS_PREFIX}{key}")
+                if raw:
+                    payload = json.loads(raw)
+                    self._store_local(key, payload)
+                    record_cache("summary", hit=True)
+                    return _to_summary(payload)
+            except (RedisError, ValueError, TypeError) as e:
+                self._redis_failed(e)
+
+        record_cache("summary", hit=False)
+        return None
+
+    def set(self, key: str, summary: SummaryResult):
+        payload = {"text": summary.text, "chunks": summary.chunks, "total_chunks": summary.total_chunks}
+        raw = json.dumps(payload)
+        if len(raw) > self.max_bytes:
+            logger.info(f"SummaryCache: Not caching a {len(raw)}-byte summary (limit {self.max_bytes})")
+            return
+        self._store_local(key, payload)
+
+        redis = self._redis()
+        if redis is None:
+            return
+        try:
+            pipe = redis.pipeline(transaction=False)
+            pipe.set(f"{REDIS_PREFIX}{key}", raw, ex=self.ttl_seconds)
+            pipe.zadd(REDIS_INDEX, {key: time.time()})
+            pipe.execute()
+            self._evict(redis)
+        except RedisError as e:
+            self._redis_failed(e)
+
+    def clear(self):
+        """Drops every local entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self, redis):
+        """Drops the oldest Redis entries beyond 'max_entries' (and index entries that already expired)."""
+        redis.zremrangebyscore(REDIS_INDEX, 0, time.time() - self.ttl_seconds)
+        overflow = redis.zcard(REDIS_INDEX) - self.max_entries
+        if overflow <= 0:
+            return
+        oldest = [k.decode() if isinstance(k, bytes) else k for k, _ in redis.zpopmin(REDIS_INDEX, overflow)]
+        if oldest:
+            redis.delete(*(f"{REDIS_PREFIX}{k}" for k in oldest))
+            logger.info(f"SummaryCache: Evicted {len(oldest)} oldest summaries")
+
+    def _redis(self):
+        if self._redis_factory is None or time.monotonic() < self._redis_down_until:
+            return None
+        return self._redis_factory()
+
+    def _redis_failed(self, e: Exception):
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+        logger.warning(f"SummaryCache: Redis tier unavailable, local tier only for {REDIS_RETRY_SECONDS}s: {e}")
+
+    def _get_local(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return payload
+            del self._entries[key]
+            return None
+
+    def _store_local(self, key: str, payload: dict):
+        if self.local_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.local_entries:
+                self._entries.popitem(last=False)
+
+
+def _to_summary(payload: dict) -> SummaryResult:
+    chunks = payload.get("chunks", 1)
+    return SummaryResult(text=payload["text"], chunks=chunks, total_chunks=payload.get("total_chunks", chunks), cached=True)
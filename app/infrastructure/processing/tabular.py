@@ -0,0 +1,245 @@
+import csv
+import math
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Iterable, Iterator, List, Optional
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from app.infrastructure.config import settings
+
+logger = logging.getLogger(__name__)
+
+CELL_SEPARATOR = " | "
+# Distinct values tracked per column for 'top_values'; beyond this the
+# rarest are pruned, so very high-cardinality columns stay bounded in memory
+MAX_TRACKED_VALUES = 5000
+TOP_VALUES = 5
+
+
+@dataclass
+class TabularExtraction:
+    """Text (one section per sheet) and per-column profiles of a spreadsheet or CSV."""
+    sections: List[str] = field(default_factory=list)
+    tables: List[dict] = field(default_factory=list)
+
+
+class ColumnProfile:
+    """
+    Running statistics for one column, updated one chunk (pandas Series) at a time.
+    Every row is counted, not only the rows rendered for the LLM.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows = 0
+        self.nulls = 0
+        self.kinds: Counter = Counter()
+        # kind -> [min, max]; numbers and dates are never compared with each other
+        self.ranges: dict = {}
+        self.values: Counter = Counter()
+
+    def update(self, series: pd.Series):
+        self.rows += len(series)
+        values = series.dropna()
+        self.nulls += len(series) - len(values)
+        if values.empty:
+            return
+
+        if pd.api.types.is_bool_dtype(values):
+            self.kinds["bool"] += len(values)
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            self.kinds["datetime"] += len(values)
+            self._extend("datetime", values.min(), values.max())
+        else:
+            # Object column: dates mixed with other values are still dates, never "text"
+            is_date = values.map(lambda value: isinstance(value, date))
+            if is_date.any():
+                dates = pd.to_datetime(values[is_date])
+                self.kinds["datetime"] += len(dates)
+                self._extend("datetime", dates.min(), dates.max())
+            others = values[~is_date]
+            numbers = pd.to_numeric(others, errors="coerce").dropna()
+            self.kinds["number"] += len(numbers)
+            self.kinds["text"] += len(others) - len(numbers)
+            if not numbers.empty:
+                self._extend("number", numbers.min(), numbers.max())
+
+        # Same rendering as the rendered rows, whatever dtype the chunk was inferred as
+        self.values.update(values.map(_cell_text).value_counts().to_dict())
+        if len(self.values) > MAX_TRACKED_VALUES:
+            self.values = Counter(dict(self.values.most_common(MAX_TRACKED_VALUES // 2)))
+
+    def to_dict(self) -> dict:
+        kinds = [kind for kind, count in self.kinds.most_common() if count]
+        low, high = self.ranges.get(kinds[0], (None, None)) if kinds else (None, None)
+        return {
+            "name": self.name,
+            "type": "empty" if not kinds else kinds[0] if len(kinds) == 1 else "mixed",
+            "null_ratio": round(self.nulls / self.rows, 4) if self.rows else 0.0,
+            # Range of the dominant type (e.g. the numbers of a mostly numeric column)
+            "min": _json_value(low),
+            "max": _json_value(high),
+            "top_values": [[value, count] for value, count in self.values.most_common(TOP_VALUES)],
+        }
+
+    def _extend(self, kind: str, low, high):
+        current = self.ranges.get(kind)
+        self.ranges[kind] = [low, high] if current is None else [min(current[0], low), max(current[1], high)]
+
+
+class _Sheet:
+    """Renders up to 'row_budget' rows and profiles all of them."""
+
+    def __init__(self, name: Optional[str], header: list, row_budget: int):
+        self.name = name
+        self.header = _column_names(header)
+        self.profiles = [ColumnProfile(column) for column in self.header]
+        self.lines = [CELL_SEPARATOR.join(self.header)]
+        self.row_budget = row_budget
+        self.rows = 0
+
+    def add_chunk(self, rows: list):
+        width = len(self.header)
+        rows = [(list(row) + [None] * width)[:width] for row in rows]
+        frame = pd.DataFrame(rows, columns=range(width))
+        for index, profile in enumerate(self.profiles):
+            profile.update(frame[index])
+
+        room = self.row_budget - (len(self.lines) - 1)
+        for row in rows[:max(room, 0)]:
+            self.lines.append(CELL_SEPARATOR.join(_cell_text(value) for value in row))
+        self.rows += len(rows)
+
+    def finish(self, result: TabularExtraction):
+        rendered = len(self.lines) - 1
+        if self.rows > rendered:
+            self.lines.append(f"... {self.rows - rendered} more rows (see column profile)")
+        title = f"## Sheet: {self.name}\n" if self.name else ""
+        result.sections.append(title + "\n".join(self.lines))
+        result.tables.append({
+            "sheet": self.name,
+            "rows": self.rows,
+            "columns": [profile.to_dict() for profile in self.profiles],
+        })
+        return rendered
+
+
+def extract_spreadsheet(file_path: str, legacy: bool = False) -> TabularExtraction:
+    """
+    Streams every sheet of an .xlsx workbook (openpyxl read-only mode).
+
+    Workflow:
+    1. Rows are read lazily and grouped into chunks of 'tabular_chunk_rows'.
+    2. Each chunk updates the column profiles (vectorized, via pandas).
+    3. The first 'tabular_max_rows' rows of the workbook (shared by all sheets)
+       are rendered as compact 'a | b | c' lines for the LLM.
+
+    Dev Note: Legacy .xls files (legacy=True) are not supported by openpyxl;
+    they fall back to pandas, which loads each sheet fully.
+    """
+    if legacy:
+        return _extract_legacy_xls(file_path)
+
+    result = TabularExtraction()
+    budget = settings.tabular_max_rows
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for worksheet in workbook.worksheets:
+            rows = (row for row in worksheet.iter_rows(values_only=True) if any(v is not None for v in row))
+            budget -= _stream_sheet(result, worksheet.title, rows, budget)
+    finally:
+        workbook.close()
+
+    logger.info(f"Spreadsheet extraction: {len(result.tables)} sheets, {sum(t['rows'] for t in result.tables)} rows")
+    return result
+
+
+def extract_csv(file_path: str) -> TabularExtraction:
+    """Streams a CSV file in chunks; see extract_spreadsheet() for the output format."""
+    result = TabularExtraction()
+    with open(file_path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        sample = f.read(64 * 1024)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel
+        rows = (row for row in csv.reader(f, dialect) if any(cell.strip() for cell in row))
+        _stream_sheet(result, None, rows, settings.tabular_max_rows, blank_as_null=True)
+
+    logger.info(f"CSV extraction: {result.tables[0]['rows'] if result.tables else 0} rows")
+    return result
+
+
+def _stream_sheet(result: TabularExtraction, name: Optional[str], rows: Iterable, budget: int, blank_as_null: bool = False) -> int:
+    """Consumes one sheet's rows. Returns how many rows were rendered."""
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return 0
+
+    sheet = _Sheet(name, list(header), budget)
+    for chunk in _chunks(rows, settings.tabular_chunk_rows):
+        if blank_as_null:
+            chunk = [[cell if cell != "" else None for cell in row] for row in chunk]
+        sheet.add_chunk(chunk)
+    return sheet.finish(result)
+
+
+def _extract_legacy_xls(file_path: str) -> TabularExtraction:
+    result = TabularExtraction()
+    budget = settings.tabular_max_rows
+    for name, frame in pd.read_excel(file_path, sheet_name=None, header=None).items():
+        rows = (list(row) for row in frame.itertuples(index=False))
+        budget -= _stream_sheet(result, str(name), rows, budget)
+    return result
+
+
+def _chunks(rows: Iterator, size: int) -> Iterator[list]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _column_names(header: list) -> List[str]:
+    names, seen = [], Counter()
+    for index, value in enumerate(header, start=1):
+        name = _cell_text(value) or f"column_{index}"
+        seen[name] += 1
+        names.append(name if seen[name] == 1 else f"{name}_{seen[name]}")
+    return names
+
+
+def _cell_text(value) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == datetime.min.time() else value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    # Keep one row per line
+    return str(value).replace("\n", " ").replace("|", "/").strip()
+
+
+def _json_value(value):
+    """numpy/pandas scalars and timestamps -> JSON-safe values."""
+    if value is None:
+        return None
+    if hasattr(value, "isoformat"):
+        return _cell_text(value.to_pydatetime() if hasattr(value, "to_pydatetime") else value)
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
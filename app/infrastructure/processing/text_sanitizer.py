@@ -0,0 +1,37 @@
+import re
+
+# Whitespace control characters we keep
+KEPT_CONTROLS = "\n\r\t"
+
+# Above this many distinct characters to strip, one regex pass beats repeated replace()
+MAX_REPLACE_PASSES = 16
+
+
+def unprintable_chars(text: str) -> list[str]:
+    """The distinct characters of text that sanitize_text() removes."""
+    return [c for c in set(text) if not c.isprintable() and c not in KEPT_CONTROLS]
+
+
+def sanitize_text(text: str) -> str:
+    """
+    Strips NULs and control characters (keeping newlines, carriage returns
+    and tabs), then trims surrounding whitespace.
+
+    Same result as keeping 'c.isprintable() or c in KEPT_CONTROLS' per
+    character, without a Python-level loop over the text:
+    1. set(text) finds the distinct characters (C speed); only those are
+       tested with isprintable().
+    2. The few offenders (typically NUL, form feed, NBSP) are removed with
+       str.replace, or one regex pass when there are many of them.
+    """
+    if not text:
+        return ""
+
+    bad = unprintable_chars(text)
+    if len(bad) <= MAX_REPLACE_PASSES:
+        for c in bad:
+            text = text.replace(c, "")
+    else:
+        text = re.sub(f"[{''.join(re.escape(c) for c in bad)}]+", "", text)
+
+    return text.strip()
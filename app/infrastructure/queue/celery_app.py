@@ -1,6 +1,8 @@
 import logging
 from celery import Celery
+from celery.signals import worker_init, worker_ready
 from app.infrastructure.config import settings
+from app.infrastructure.metrics import start_worker_exporter
 
 # Initialize logger for Celery startup events
 logger = logging.getLogger(__name__)
@@ -34,13 +36,41 @@ celery_app.conf.update(
     # Ensures the worker only takes one task at a time (better for heavy AI workloads)
     worker_prefetch_multiplier=1,
     
+    # --- STAGED PIPELINE QUEUES ---
+    # extract: download + text layer, ocr: CPU bound (prefork), llm: I/O bound (threads/gevent).
+    # A single worker can consume all of them: celery ... worker -Q celery,extract,ocr,llm
+    task_routes={
+        "extract_document_task": {"queue": "extract"},
+        "ocr_document_task": {"queue": "ocr"},
+        "summarize_document_task": {"queue": "llm"},
+    },
+
     # Optional: Automatically discover tasks in the workers folder
     # celery_app.autodiscover_tasks(['app.workers']),
 )
 
-# Dev Note: This check helps a developer verify Redis connectivity during startup
-try:
-    celery_app.control.inspect().ping()
-    logger.info("Celery: Successfully connected to Redis broker.")
-except Exception:
-    logger.warning("Celery: Broker connection not verified yet. (Expected during initial Docker boot)")
\ No newline at end of file
+# --- METRICS ---
+# Dev Note: Only fires inside 'celery worker'; the API imports this module too
+# but serves its metrics on /metrics instead.
+@worker_init.connect
+def _start_metrics_exporter(**kwargs):
+    start_worker_exporter()
+
+# Dev Note: The API imports this module only to SEND tasks (by name). The broker
+# connection is opened lazily on the first publish, so nothing here may touch
+# the network: an import-time ping used to block every API start-up.
+@worker_ready.connect
+def _log_broker_connected(**kwargs):
+    logger.info("Celery: Worker connected to the broker and ready.")
+
+# --- LLM WARM-UP ---
+# Dev Note: Loads the Ollama model on every configured host (keep_alive) before
+# the first task arrives, so the first summary doesn't pay the model load.
+# Imported lazily for the same reason as above: the API must not load the LLM stack.
+@worker_ready.connect
+def _warm_up_llm(**kwargs):
+    if (settings.ai_provider or "").lower() != "ollama" or not settings.ollama_model:
+        return
+    from app.infrastructure.processing.ollama_pool import get_ollama_pool
+    warmed = get_ollama_pool().warm_up(settings.ollama_model)
+    logger.info(f"Celery: Ollama warm-up {sum(warmed.values())}/{len(warmed)} hosts ready")
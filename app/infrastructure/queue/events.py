@@ -0,0 +1,80 @@
+import json
+import logging
+from typing import Optional
+from app.infrastructure.config import settings
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "notifications_"
+STREAM_PREFIX = "task_events:"
+
+
+def event_channel(task_id: str) -> str:
+    """Pub/Sub channel used for live delivery of a task's events."""
+    return f"{CHANNEL_PREFIX}{task_id}"
+
+
+def event_stream(task_id: str) -> str:
+    """Redis Stream that keeps a replayable copy of a task's events."""
+    return f"{STREAM_PREFIX}{task_id}"
+
+
+def parse_event_id(event_id: str) -> tuple[int, int]:
+    """Stream ids look like '<ms>-<seq>'; tuples of ints compare in stream order."""
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def publish_task_event(redis_client, task_id: str, payload: dict) -> str:
+    """
+    Records a task lifecycle event and notifies live listeners (sync, used by workers).
+
+    Workflow:
+    1. XADD the event to the task's stream (capped at 'task_events_max_len').
+    2. Refresh the stream's TTL, so finished tasks clean themselves up.
+    3. PUBLISH the event, including its stream id, for connected WebSockets.
+
+    Dev Note: Clients that connect late (or reconnect) replay the stream from
+    their last seen id instead of polling /tasks/{task_id}.
+    """
+    stream = event_stream(task_id)
+
+    event_id = redis_client.xadd(
+        stream,
+        {"data": json.dumps(payload)},
+        maxlen=settings.task_events_max_len,
+        approximate=True,
+    )
+    if isinstance(event_id, bytes):
+        event_id = event_id.decode()
+
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.expire(stream, settings.task_events_ttl_seconds)
+    pipe.publish(event_channel(task_id), json.dumps({**payload, "event_id": event_id}))
+    pipe.execute()
+
+    logger.debug(f"Events: {payload.get('status')} for task {task_id} ({event_id})")
+    return event_id
+
+
+async def read_task_events(redis_client, task_id: str, after: Optional[str] = None) -> list[dict]:
+    """
+    Returns the stored events of a task that come after 'after' (all of them when None).
+    Every event carries its stream id as 'event_id'.
+    """
+    entries = await redis_client.xrange(event_stream(task_id), min=after or "-", max="+")
+
+    events = []
+    for event_id, fields in entries:
+        if isinstance(event_id, bytes):
+            event_id = event_id.decode()
+        # XRANGE is inclusive; the client already has 'after'
+        if event_id == after:
+            continue
+        data = fields.get("data") or fields.get(b"data")
+        try:
+            events.append({**json.loads(data), "event_id": event_id})
+        except (TypeError, ValueError):
+            logger.warning(f"Events: Skipping malformed event {event_id} for task {task_id}")
+    return events
@@ -0,0 +1,49 @@
+import json
+import zlib
+import logging
+from app.infrastructure.config import settings
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "pipeline:"
+
+
+class StageHandoff:
+    """
+    Passes intermediate pipeline results between Celery stages by reference.
+
+    Workflow:
+    1. A stage stores its output (e.g. the extracted pages) under
+       'pipeline:<tracking_id>:<name>' and returns only that key.
+    2. The next stage loads the payload from Redis using the key.
+    3. The final stage deletes the keys; a TTL cleans up pipelines that died.
+
+    Dev Note: Extracted text can be megabytes. Keeping it out of the broker
+    messages keeps the queues small and fast, and zlib keeps Redis memory low.
+    """
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+
+    @staticmethod
+    def key(tracking_id: str, name: str) -> str:
+        return f"{KEY_PREFIX}{tracking_id}:{name}"
+
+    def put(self, tracking_id: str, name: str, payload: dict) -> str:
+        key = self.key(tracking_id, name)
+        data = zlib.compress(json.dumps(payload).encode("utf-8"))
+        self.redis.set(key, data, ex=settings.pipeline_handoff_ttl_seconds)
+        logger.debug(f"Handoff: Stored {key} ({len(data)} bytes)")
+        return key
+
+    def get(self, key: str) -> dict:
+        data = self.redis.get(key)
+        if data is None:
+            # Expired or never written; the pipeline must start over
+            raise LookupError(f"Pipeline handoff {key} not found (expired?)")
+        return json.loads(zlib.decompress(data).decode("utf-8"))
+
+    def delete(self, tracking_id: str, *names: str):
+        if names:
+            self.redis.delete(*(self.key(tracking_id, name) for name in names))
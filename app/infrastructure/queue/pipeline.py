@@ -0,0 +1,25 @@
+import time
+from celery import chain
+from app.infrastructure.queue.celery_app import celery_app
+
+# Task names registered by app/workers/document_worker.py (routed in celery_app.py)
+EXTRACT_TASK = "extract_document_task"
+OCR_TASK = "ocr_document_task"
+SUMMARIZE_TASK = "summarize_document_task"
+
+
+def build_pipeline(document_id: str, request_id: str, tracking_id: str):
+    """
+    The document pipeline as a Celery chain: extract -> ocr -> llm.
+
+    Dev Note: Stages are referenced by NAME, so the API can dispatch without
+    importing the worker module (and with it the DocumentProcessor, pandas,
+    OCR and LLM SDKs). The last stage runs under 'tracking_id', so
+    GET /tasks/{tracking_id} reports the final result, and every stage
+    publishes its events to that id.
+    """
+    return chain(
+        celery_app.signature(EXTRACT_TASK, args=(document_id, tracking_id, request_id), kwargs={"queued_at": time.time()}),
+        celery_app.signature(OCR_TASK),
+        celery_app.signature(SUMMARIZE_TASK).set(task_id=tracking_id),
+    )
@@ -0,0 +1,63 @@
+import logging
+import redis
+import redis.asyncio as aioredis
+from app.infrastructure.config import settings
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+_async_client: aioredis.Redis | None = None
+_result_backend_client: aioredis.Redis | None = None
+_sync_client: redis.Redis | None = None
+
+
+def get_async_redis() -> aioredis.Redis:
+    """
+    Returns the process-wide async Redis client.
+
+    Dev Note: The client owns a connection pool, so every caller in the API
+    process shares the same few connections instead of opening its own.
+    """
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.from_url(settings.redis_url, decode_responses=True)
+        logger.debug("Redis: Created shared async client")
+    return _async_client
+
+
+def get_sync_redis() -> redis.Redis:
+    """
+    Returns the process-wide blocking Redis client, for code that runs in
+    Celery tasks or worker threads (e.g. the summary cache).
+    """
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = redis.from_url(settings.redis_url)
+        logger.debug("Redis: Created shared sync client")
+    return _sync_client
+
+
+def get_async_result_backend() -> aioredis.Redis:
+    """
+    Returns an async client for the Celery result backend.
+
+    Dev Note: CELERY_RESULT_BACKEND may point at a different Redis database
+    than REDIS_URL, so it gets its own client unless the URLs match.
+    """
+    global _result_backend_client
+    backend_url = settings.celery_result_backend or settings.redis_url
+    if backend_url == settings.redis_url:
+        return get_async_redis()
+    if _result_backend_client is None:
+        _result_backend_client = aioredis.from_url(backend_url, decode_responses=True)
+    return _result_backend_client
+
+
+async def close_async_redis():
+    """Closes the shared clients (application shutdown)."""
+    global _async_client, _result_backend_client
+    for client in (_async_client, _result_backend_client):
+        if client is not None:
+            await client.close()
+    _async_client = None
+    _result_backend_client = None
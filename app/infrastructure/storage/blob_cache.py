@@ -0,0 +1,226 @@
+import os
+import time
+import fcntl
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+from app.infrastructure.metrics import record_cache, record_transfer
+
+logger = logging.getLogger(__name__)
+
+# Hidden entries: per-key download locks and the directory-wide eviction lock
+LOCK_DIR = ".locks"
+INDEX_LOCK = ".index.lock"
+# Temp downloads older than this are leftovers of a crashed process
+STALE_TEMP_SECONDS = 3600
+
+
+class BlobCache:
+    """
+    Bounded, LRU-evicting on-disk cache for objects downloaded by workers.
+
+    Guarantees:
+    - Size cap: once the cache grows past 'max_bytes', the least recently
+      used files are deleted (files currently leased by a task are skipped).
+    - Atomic writes: downloads go to a temp file in the cache directory and
+      are renamed into place, so nobody ever reads a partially written file.
+    - Single flight: concurrent requests for the same key share one download.
+
+    Dev Note: Every process on the host (Celery prefork children, uvicorn
+    workers) shares 'root', so all state lives on the filesystem, not in memory:
+    - a lease is a shared flock() on the cached file; eviction needs an
+      exclusive non-blocking flock, so a file another process is reading is
+      never deleted (and the kernel drops the lease if that process dies);
+    - size and recency (mtime, refreshed on every hit) are read from the
+      directory under a directory-wide lock, so the cap holds for the host
+      as a whole and a restarted worker keeps its warm cache.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int):
+        self.root = Path(root)
+        self.lock_dir = self.root / LOCK_DIR
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self._leases: dict[str, list] = {}  # key -> [fd holding LOCK_SH, count]
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load_existing()
+
+    def path_for(self, key: str) -> Path:
+        # Keys are object names (document UUIDs); never let one escape the cache dir
+        return self.root / os.path.basename(key)
+
+    def get_or_fetch(self, key: str, download: Callable[[str], None]) -> str:
+        """
+        Returns the local path for 'key', calling download(temp_path) on a miss.
+
+        The returned file is leased to the caller and will not be evicted
+        (by any process) until release(key) is called.
+        """
+        path = self.path_for(key)
+
+        with self._single_flight(key):
+            if self._lease(key, path):
+                _touch(path)
+                with self._lock:
+                    self.hits += 1
+                record_cache("blob", hit=True)
+                return str(path)
+
+            with self._lock:
+                self.misses += 1
+            record_cache("blob", hit=False)
+
+            fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=f".{path.name}.", suffix=".part")
+            os.close(fd)
+            try:
+                download(temp_path)
+                _touch(temp_path)
+                os.replace(temp_path, path)
+            except Exception:
+                Path(temp_path).unlink(missing_ok=True)
+                raise
+
+            record_transfer("download", path.stat().st_size)
+            if not self._lease(key, path):
+                raise FileNotFoundError(f"BlobCache: {path} vanished right after download")
+
+        self._evict()
+        return str(path)
+
+    def release(self, key: str):
+        """Ends a lease taken by get_or_fetch, making the file evictable again."""
+        with self._lock:
+            entry = self._leases.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._leases[key]
+                # Closing the descriptor drops the shared flock
+                os.close(entry[0])
+        self._evict()
+
+    def stats(self) -> dict:
+        files = self._scan()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(files),
+                "bytes": sum(size for _, _, size in files),
+                "max_bytes": self.max_bytes,
+            }
+
+    def _lease(self, key: str, path: Path) -> bool:
+        """Takes (or re-counts) this process's shared lock on 'path'. False if the file doesn't exist."""
+        with self._lock:
+            entry = self._leases.get(key)
+            if entry is not None:
+                entry[1] += 1
+                return True
+
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                return False
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            # An evictor may have unlinked the file between open() and flock()
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                current = None
+            if current is None or current.st_ino != os.fstat(fd).st_ino:
+                os.close(fd)
+                return False
+
+            self._leases[key] = [fd, 1]
+            return True
+
+    def _evict(self):
+        """Deletes least recently used, unleased files until the directory is under the cap."""
+        with self._exclusive(self.root / LOCK_DIR / INDEX_LOCK):
+            files = self._scan()
+            total = sum(size for _, _, size in files)
+            for _, name, size in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                if self._try_delete(name):
+                    total -= size
+                    with self._lock:
+                        self.evictions += 1
+                    logger.debug(f"BlobCache: Evicted {name} ({size} bytes)")
+
+    def _try_delete(self, name: str) -> bool:
+        path = self.root / name
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return False
+        try:
+            # Held shared by whoever is reading it (in any process): skip
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        try:
+            path.unlink(missing_ok=True)
+            (self.lock_dir / name).unlink(missing_ok=True)
+        finally:
+            os.close(fd)
+        return True
+
+    def _scan(self) -> list[tuple[int, str, int]]:
+        """(mtime, name, size) of every cached file."""
+        files = []
+        for entry in os.scandir(self.root):
+            if entry.name.startswith(".") or not entry.is_file(follow_symlinks=False):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime_ns, entry.name, stat.st_size))
+        return files
+
+    @contextmanager
+    def _single_flight(self, key: str):
+        # Serialises threads AND processes asking for the same key
+        with self._exclusive(self.lock_dir / os.path.basename(key)):
+            yield
+
+    @contextmanager
+    def _exclusive(self, lock_path: Path):
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _load_existing(self):
+        now = time.time()
+        for entry in os.scandir(self.root):
+            if entry.name.endswith(".part") and now - entry.stat().st_mtime > STALE_TEMP_SECONDS:
+                # Leftover temp file from a crashed download (recent ones may be in progress elsewhere)
+                Path(entry.path).unlink(missing_ok=True)
+
+        self._evict()
+        files = self._scan()
+        if files:
+            logger.info(f"BlobCache: Found {len(files)} cached files ({sum(f[2] for f in files)} bytes) in {self.root}")
+
+
+def _touch(path):
+    """Marks 'path' as just used. Explicit ns timestamps: the kernel's own clock is too coarse to order hits."""
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
@@ -0,0 +1,24 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from app.infrastructure.config import settings
+
+logger = logging.getLogger(__name__)
+
+# --- STORAGE I/O EXECUTOR ---
+# Dev Note: boto3 and the MinIO SDK are blocking. Calling them directly inside
+# 'async def' stalls the whole uvicorn worker (health checks, WebSockets, ...)
+# for the duration of every PUT/GET. All SDK calls go through this dedicated,
+# size-limited pool instead, so a slow bucket can't starve the default executor.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.storage_io_workers,
+    thread_name_prefix="storage-io",
+)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Runs a blocking storage call on the storage I/O pool and awaits the result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
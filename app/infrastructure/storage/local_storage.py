@@ -1,6 +1,10 @@
+import os
 import logging
 from pathlib import Path
-from app.domain.services.storage_interface import StorageInterface
+from typing import AsyncIterator
+from app.domain.services.storage_interface import StorageInterface, StoredObject
+from app.infrastructure.storage.executor import run_blocking
+from app.infrastructure.storage.streaming import StreamDigest, iter_chunks
 
 # Initialize logger for storage operations
 logger = logging.getLogger(__name__)
@@ -45,9 +49,8 @@ class LocalStorage(StorageInterface):
         file_path = LOCAL_UPLOAD_DIR / file_id
         
         try:
-            # Using 'wb' for Write Binary mode
-            with open(file_path, "wb") as f:
-                f.write(file_bytes)
+            # Disk write runs on the storage I/O pool, not the event loop
+            await run_blocking(file_path.write_bytes, file_bytes)
             
             logger.info(f"File stored successfully: {file_id} at {file_path}")
             return str(file_path)
@@ -58,6 +61,41 @@ class LocalStorage(StorageInterface):
             logger.error(f"UPLOAD FAILED: {str(e)}")
             raise
 
+    async def upload_stream(
+        self, file_id: str, file_name: str, chunks: AsyncIterator[bytes], content_type: str
+    ) -> StoredObject:
+        """
+        Writes chunks to disk as they arrive, hashing them in the same pass.
+
+        Dev Note: We write to a '.part' file and rename it at the end, so the
+        worker can never pick up a half-written upload. Every file operation
+        (open, write, close, rename) runs on the storage I/O pool, and a failed
+        upload never leaves its '.part' file behind.
+        """
+        file_path = LOCAL_UPLOAD_DIR / file_id
+        part_path = LOCAL_UPLOAD_DIR / f"{file_id}.part"
+        digest = StreamDigest()
+
+        try:
+            f = await run_blocking(open, part_path, "wb")
+            try:
+                async for chunk in digest.wrap(iter_chunks(chunks)):
+                    await run_blocking(f.write, chunk)
+            finally:
+                await run_blocking(f.close)
+            await run_blocking(os.replace, part_path, file_path)
+
+            logger.info(f"File streamed successfully: {file_id} ({digest.size} bytes) at {file_path}")
+            return digest.stored(str(file_path))
+        except PermissionError:
+            logger.error(f"PERMISSION DENIED: Cannot write to {file_path}. Check Docker volume permissions.")
+            await run_blocking(part_path.unlink, missing_ok=True)
+            raise
+        except Exception as e:
+            logger.error(f"UPLOAD FAILED: {str(e)}")
+            await run_blocking(part_path.unlink, missing_ok=True)
+            raise
+
     async def get_file_path(self, file_id: str) -> str:
         """
         Resolves the local path for a given file ID.
@@ -70,4 +108,8 @@ class LocalStorage(StorageInterface):
         if not file_path.exists():
             logger.warning(f"File lookup failed: {file_id} not found at {file_path}")
             
-        return str(file_path)
\ No newline at end of file
+        return str(file_path)
+
+    async def release_file_path(self, file_id: str) -> None:
+        """Nothing to release: the file lives on the shared volume, not in a cache."""
+        return None
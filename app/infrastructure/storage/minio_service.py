@@ -1,9 +1,18 @@
-import os
 import logging
+import tempfile
+from typing import AsyncIterator
 from minio import Minio
 from io import BytesIO
 from app.infrastructure.config import settings
-from app.domain.services.storage_interface import StorageInterface
+from app.domain.services.storage_interface import StorageInterface, StoredObject
+from app.infrastructure.storage.blob_cache import BlobCache
+from app.infrastructure.storage.executor import run_blocking
+from app.infrastructure.storage.streaming import (
+    MULTIPART_PART_SIZE,
+    UPLOAD_CHUNK_SIZE,
+    StreamDigest,
+    iter_chunks,
+)
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -24,6 +33,10 @@ class MinioStorage(StorageInterface):
             secure=settings.minio_secure
         )
         self.bucket = settings.minio_bucket
+        # Set once the bucket has been verified, so uploads skip the round trip
+        self._bucket_ready = False
+        # Bounded local copies of downloaded objects (worker side)
+        self.cache = BlobCache(settings.blob_cache_dir, settings.blob_cache_max_mb * 1024 * 1024)
 
     async def upload(self, file_id: str, file_name: str, file_bytes: bytes, content_type: str) -> str:
         """
@@ -34,13 +47,14 @@ class MinioStorage(StorageInterface):
         """
         is_secure = settings.minio_secure
         try:
-            self.ensure_bucket_exists(self.bucket)
+            await self._ensure_bucket()
             
             # Wrap bytes in a stream for the MinIO SDK
             buffer = BytesIO(file_bytes)
 
             # Dev Note: We store using 'file_id' (the UUID) so get_file_path can find it easily
-            self.client.put_object(
+            await run_blocking(
+                self.client.put_object,
                 bucket_name=self.bucket,
                 object_name=file_id, 
                 data=buffer,
@@ -57,32 +71,82 @@ class MinioStorage(StorageInterface):
             logger.error(f"MinIO Upload Error: {str(e)}")
             raise
 
+    async def upload_stream(
+        self, file_id: str, file_name: str, chunks: AsyncIterator[bytes], content_type: str
+    ) -> StoredObject:
+        """
+        Streams an upload into MinIO using multipart upload.
+
+        Dev Note: The MinIO SDK reads from a sync file object, so chunks are
+        spooled into a SpooledTemporaryFile (only the first chunk stays in
+        memory, the rest rolls over to disk) and handed to put_object, which
+        switches to multipart once the object is larger than one part.
+        """
+        is_secure = settings.minio_secure
+        digest = StreamDigest()
+
+        try:
+            await self._ensure_bucket()
+
+            with tempfile.SpooledTemporaryFile(max_size=UPLOAD_CHUNK_SIZE) as spool:
+                async for chunk in digest.wrap(iter_chunks(chunks)):
+                    # Past the first chunk this is a disk write, so keep it off the loop too
+                    await run_blocking(spool.write, chunk)
+                spool.seek(0)
+
+                await run_blocking(
+                    self.client.put_object,
+                    bucket_name=self.bucket,
+                    object_name=file_id,
+                    data=spool,
+                    length=digest.size,
+                    part_size=MULTIPART_PART_SIZE,
+                    content_type=content_type
+                )
+
+            logger.info(f"MinIO: Successfully streamed {file_id} ({file_name}, {digest.size} bytes)")
+
+            protocol = "https" if is_secure else "http"
+            return digest.stored(f"{protocol}://{settings.minio_endpoint}/{self.bucket}/{file_id}")
+
+        except Exception as e:
+            logger.error(f"MinIO Upload Error: {str(e)}")
+            raise
+
     async def get_file_path(self, file_id: str) -> str:
         """
         Provides a local filesystem path for the AI processor to read.
         
         Workflow:
-        1. Checks /tmp cache to avoid redundant downloads.
-        2. If missing, streams the object from MinIO to /tmp.
+        1. Checks the blob cache to avoid redundant downloads.
+        2. If missing, downloads the object to a temp file and renames it into the cache.
+        3. Concurrent requests for the same object wait for that single download.
+
+        Dev Note: The path stays leased until release_file_path() is called.
         """
-        temp_path = f"/tmp/{file_id}"
-        
-        # Performance Check: Don't re-download if the worker already has it
-        if os.path.exists(temp_path):
-            logger.debug(f"MinIO Cache: File {file_id} already exists in /tmp")
-            return temp_path
-    
         try:
-            logger.info(f"MinIO: Downloading {file_id} to {temp_path} for processing")
-            # fget_object downloads the file directly to the specified path
-            self.client.fget_object(self.bucket, file_id, temp_path)
-            return temp_path
+            return await run_blocking(self.cache.get_or_fetch, file_id, lambda temp_path: self._download(file_id, temp_path))
         except Exception as e:
             logger.error(f"MinIO Download Error for {file_id}: {str(e)}")
             raise
 
+    async def release_file_path(self, file_id: str) -> None:
+        self.cache.release(file_id)
+
+    def _download(self, file_id: str, temp_path: str):
+        """Cache miss: fetches the object (blocking, runs on the storage I/O pool)."""
+        logger.info(f"MinIO: Downloading {file_id} to the blob cache for processing")
+        # fget_object downloads the file directly to the specified path
+        self.client.fget_object(self.bucket, file_id, temp_path)
+
+    async def _ensure_bucket(self):
+        """Verifies the bucket once per process instead of on every upload."""
+        if not self._bucket_ready:
+            await run_blocking(self.ensure_bucket_exists, self.bucket)
+
     def ensure_bucket_exists(self, bucket_name: str):
-        """Standard check-and-create logic for the storage container."""
+        """Standard check-and-create logic for the storage container (blocking)."""
         if not self.client.bucket_exists(bucket_name):
             logger.info(f"MinIO: Creating missing bucket: {bucket_name}")
-            self.client.make_bucket(bucket_name)
\ No newline at end of file
+            self.client.make_bucket(bucket_name)
+        self._bucket_ready = True
\ No newline at end of file
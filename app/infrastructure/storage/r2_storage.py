@@ -1,10 +1,13 @@
-import os
 import logging
 from io import BytesIO
+from typing import AsyncIterator
 import boto3
 
 from app.infrastructure.config import settings
-from app.domain.services.storage_interface import StorageInterface
+from app.domain.services.storage_interface import StorageInterface, StoredObject
+from app.infrastructure.storage.blob_cache import BlobCache
+from app.infrastructure.storage.executor import run_blocking
+from app.infrastructure.storage.streaming import MULTIPART_PART_SIZE, StreamDigest, iter_chunks
 
 logger = logging.getLogger(__name__)
 
@@ -23,13 +26,16 @@ class R2Storage(StorageInterface):
             region_name = settings.s3_region
         )
         self.bucket = settings.s3_bucket
+        # Bounded local copies of downloaded objects (worker side)
+        self.cache = BlobCache(settings.blob_cache_dir, settings.blob_cache_max_mb * 1024 * 1024)
 
     async def upload(self, file_id: str, file_name: str, file_bytes: bytes, content_type: str) -> str:
         
         try: 
             buffer = BytesIO(file_bytes)
 
-            self.client.put_object(
+            await run_blocking(
+                self.client.put_object,
                 Bucket = self.bucket,
                 Key = file_id,
                 Body=buffer,
@@ -44,23 +50,98 @@ class R2Storage(StorageInterface):
             logger.error(f"R2 Upload Error: {str(e)}")
             raise
     
-    async def get_file_path(self, file_id: str):
-        temp_path = f"/tmp/{file_id}"
+    async def upload_stream(
+        self, file_id: str, file_name: str, chunks: AsyncIterator[bytes], content_type: str
+    ) -> StoredObject:
+        """
+        Streams an upload into R2 with S3 multipart upload.
+
+        Chunks are buffered only up to one part (MULTIPART_PART_SIZE). Files
+        smaller than a single part skip multipart and use one put_object call.
+        """
+        digest = StreamDigest()
+        buffer = bytearray()
+        upload_id = None
+        parts = []
 
-        if os.path.exists(temp_path):
-            return temp_path
-        
         try:
-            logger.info(f"R2: Downloading {file_id} to {temp_path}")
+            async for chunk in digest.wrap(iter_chunks(chunks)):
+                buffer.extend(chunk)
 
-            self.client.download_file(
-                Bucket=self.bucket,
-                Key=file_id,
-                Filename=temp_path
-            )
+                if len(buffer) >= MULTIPART_PART_SIZE:
+                    if upload_id is None:
+                        upload_id = (await run_blocking(
+                            self.client.create_multipart_upload,
+                            Bucket=self.bucket, Key=file_id, ContentType=content_type
+                        ))["UploadId"]
+                    parts.append(await run_blocking(
+                        self._upload_part, file_id, upload_id, len(parts) + 1, bytes(buffer)
+                    ))
+                    buffer.clear()
+
+            if upload_id is None:
+                await run_blocking(
+                    self.client.put_object,
+                    Bucket=self.bucket,
+                    Key=file_id,
+                    Body=bytes(buffer),
+                    ContentType=content_type
+                )
+            else:
+                if buffer:
+                    parts.append(await run_blocking(
+                        self._upload_part, file_id, upload_id, len(parts) + 1, bytes(buffer)
+                    ))
+                await run_blocking(
+                    self.client.complete_multipart_upload,
+                    Bucket=self.bucket,
+                    Key=file_id,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts}
+                )
+
+            logger.info(f"R2: Streamed {file_id} ({digest.size} bytes, {len(parts) or 1} part(s))")
+            return digest.stored(file_id)
+
+        except Exception as e:
+            logger.error(f"R2 Upload Error: {str(e)}")
+            if upload_id is not None:
+                # Don't leave orphaned parts (they are billed until aborted)
+                await run_blocking(
+                    self.client.abort_multipart_upload,
+                    Bucket=self.bucket, Key=file_id, UploadId=upload_id
+                )
+            raise
+
+    def _upload_part(self, file_id: str, upload_id: str, part_number: int, data: bytes) -> dict:
+        """Uploads one multipart part (blocking, always called through run_blocking)."""
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=file_id,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data
+        )
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    async def get_file_path(self, file_id: str) -> str:
+        """
+        Downloads the object into the local blob cache and returns its path.
+
+        Dev Note: The path stays leased until release_file_path() is called,
+        so the cache never evicts a file the processor is still reading.
+        """
+        try:
+            return await run_blocking(self.cache.get_or_fetch, file_id, lambda temp_path: self._download(file_id, temp_path))
 
-            return temp_path
-        
         except Exception as e:
             logger.error(f"R2 Download Error: {str(e)}")
             raise
+
+    async def release_file_path(self, file_id: str) -> None:
+        self.cache.release(file_id)
+
+    def _download(self, file_id: str, temp_path: str):
+        """Cache miss: fetches the object (blocking, runs on the storage I/O pool)."""
+        logger.info(f"R2: Downloading {file_id} to the blob cache")
+        self.client.download_file(Bucket=self.bucket, Key=file_id, Filename=temp_path)
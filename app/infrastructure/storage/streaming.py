@@ -0,0 +1,50 @@
+import hashlib
+import inspect
+from typing import AsyncIterator
+
+from app.domain.services.storage_interface import StoredObject
+
+# --- CHUNK SIZES ---
+# Dev Note: Uploads are read 1MB at a time so the API never holds a whole file.
+# S3-compatible multipart parts must be at least 5MB (except the last one).
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
+
+async def iter_chunks(source, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Normalises an upload source into an async stream of byte chunks.
+
+    Accepts an async iterator of bytes, an async file (e.g. FastAPI's
+    UploadFile) or a plain sync file-like object.
+    """
+    if hasattr(source, "__aiter__"):
+        async for chunk in source:
+            if chunk:
+                yield chunk
+        return
+
+    while True:
+        chunk = source.read(chunk_size)
+        if inspect.isawaitable(chunk):
+            chunk = await chunk
+        if not chunk:
+            break
+        yield chunk
+
+
+class StreamDigest:
+    """Computes the size and SHA-256 of a stream in the same pass that uploads it."""
+
+    def __init__(self):
+        self._sha256 = hashlib.sha256()
+        self.size = 0
+
+    async def wrap(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        async for chunk in chunks:
+            self._sha256.update(chunk)
+            self.size += len(chunk)
+            yield chunk
+
+    def stored(self, path: str) -> StoredObject:
+        return StoredObject(path=path, size=self.size, sha256=self._sha256.hexdigest())
@@ -1,11 +1,15 @@
 import uuid
 import os
+import sys
 import logging
-from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from app.api.v1.websocket_manager import manager
 from app.infrastructure.logging import setup_logging, request_id_var
+from app.infrastructure.redis_client import close_async_redis
+from app.infrastructure.metrics import render_latest
 from app.api.v1.router import router as v1_router
 from app.core.limiter import limiter
 from slowapi import _rate_limit_exceeded_handler
@@ -17,6 +21,18 @@ logger = logging.getLogger(__name__)
 
 allowed = os.getenv("ALLOWED_HOSTS", "*").split(",")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Shutdown: stop the shared Redis subscription and close the async Redis pool
+    await manager.close()
+    await close_async_redis()
+    # The Ollama pool only exists if something in this process loaded it
+    # (importing it here would pull the LLM SDK into every API start)
+    llm_client = sys.modules.get("app.infrastructure.processing.llm_client")
+    if llm_client is not None:
+        await llm_client.close_async_ollama()
+
 app = FastAPI(
     title="Document Intelligence Backend",
     description="""
@@ -34,7 +50,8 @@ AI-powered document analysis service using Gemini and Ollama.
 - Analyze content and generate insights
 - Supports scanned PDFs via OCR
 """,
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 
@@ -103,12 +120,15 @@ async def security_and_tracing_middleware(request: Request, call_next):
 app.include_router(v1_router, prefix="/api/v1")
 
 @app.websocket("/ws/{task_id}")
-async def websocket_endpoint(websocket: WebSocket, task_id: str):
+async def websocket_endpoint(websocket: WebSocket, task_id: str, last_event_id: str | None = None):
     """
     Real-time updates for document processing.
     The task_id links the WebSocket to the Celery worker's progress.
+
+    Events carry an 'event_id'. A client that reconnects with
+    ?last_event_id=<id> gets every event it missed before the live ones.
     """
-    await manager.connect(task_id, websocket)
+    await manager.connect(task_id, websocket, last_event_id)
     logger.info(f"WebSocket connection established for task: {task_id}")
     
     try:
@@ -117,10 +137,10 @@ async def websocket_endpoint(websocket: WebSocket, task_id: str):
             await websocket.receive_text()
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected gracefully for task {task_id}")
-        manager.disconnect(task_id)
+        manager.disconnect(task_id, websocket)
     except Exception as e:
         logger.error(f"Unexpected WebSocket error for task {task_id}: {str(e)}")
-        manager.disconnect(task_id)
+        manager.disconnect(task_id, websocket)
 
 @app.get("/healthy", status_code=200)
 def health_check(request: Request):
@@ -130,3 +150,13 @@ def health_check(request: Request):
         "request_id": request.state.request_id,
         "environment": "docker-container"
     }
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus scrape endpoint (text exposition format).
+    Dev Note: Keep it off the public ingress; it needs no live Prometheus,
+    'curl localhost:8000/metrics' works for local inspection.
+    """
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
@@ -1,13 +1,23 @@
-import json
 import redis
 import os
+import time
 import logging
+from celery.exceptions import Retry
 from app.infrastructure.queue.celery_app import celery_app
+from app.infrastructure.queue.pipeline import build_pipeline
+from app.infrastructure.queue.events import publish_task_event
+from app.infrastructure.queue.handoff import StageHandoff
 from app.dependencies import get_document_processor, get_storage_service
 from app.infrastructure.db.session_sync import get_db_sync
 from app.infrastructure.db.models import Document
+from app.infrastructure.processing.dedup import AnalysisDeduplicator, TwinInFlight, release_detached
+from app.domain.extraction import ExtractionResult, OCR
 from app.infrastructure.config import settings
 from app.infrastructure.logging import request_id_var
+from app.infrastructure.metrics import (
+    EXTRACTED_CHARS, OCR_PAGES, QUEUE_WAIT_SECONDS, STAGE_SECONDS,
+    TASK_FAILURES, TASK_RETRIES, failure_reason, record_cache,
+)
 from asgiref.sync import async_to_sync
 
 logger = logging.getLogger(__name__)
@@ -17,85 +27,285 @@ redis_client = redis.from_url(settings.redis_url)
 # Initialize services once
 processor = get_document_processor()
 storage_service = get_storage_service()
+handoff = StageHandoff(redis_client)
+
+
+# --- STAGED PIPELINE ---
+# extract (fetch + text layer) -> ocr (CPU bound) -> llm (I/O bound)
+# Each stage runs on its own queue (see task_routes in celery_app.py), so OCR
+# and LLM workers can be pooled and scaled independently. Stages pass a small
+# 'ref' dict along the chain; the extracted pages themselves stay in Redis.
+# The chain itself is built in app/infrastructure/queue/pipeline.py (by task name).
+
 
 @celery_app.task(bind=True, name="process_document_task", max_retries=3)
 def process_document_task(self, document_id: str, request_id: str = "worker-gen"):
-    """Core background task for document analysis."""
+    """
+    Entry point kept for messages queued before the staged pipeline existed.
+    Replaces itself with the pipeline, keeping its own id as the tracking id.
+    """
+    return self.replace(build_pipeline(document_id, request_id, tracking_id=self.request.id))
+
+
+@celery_app.task(bind=True, name="extract_document_task", max_retries=3)
+def extract_document_task(
+    self,
+    document_id: str,
+    tracking_id: str,
+    request_id: str = "worker-gen",
+    queued_at: float | None = None,
+    dedup_wait_until: float | None = None,
+    dedup_waits: int = 0,
+):
+    """
+    Stage 1: dedup check, download, and text-layer extraction.
+
+    Dev Note: While an identical document is in flight, the task retries itself
+    every 'dedup_poll_seconds' until 'dedup_wait_until' instead of sleeping in
+    its worker slot. 'dedup_waits' counts those retries, so they don't use up
+    the max_retries budget meant for real failures.
+    """
+    started = time.perf_counter()
+    if queued_at and not self.request.retries:
+        # Wall clock: dispatch happened in the API process
+        QUEUE_WAIT_SECONDS.observe(max(0.0, time.time() - queued_at))
+
     token = request_id_var.set(request_id)
     db = get_db_sync()
-    task_id = self.request.id
-    channel = f"notifications_{task_id}"
-    doc = None
+    ref = {
+        "document_id": document_id,
+        "tracking_id": tracking_id,
+        "request_id": request_id,
+        "mime_type": None,
+        "extraction": None,
+        "lock": None,
+        "done": False,
+    }
+    deduplicator = AnalysisDeduplicator(db, redis_client, processor.provider, processor.model_name)
+    file_leased = False
 
     try:
         doc = db.query(Document).filter(Document.id == document_id).first()
         if not doc:
-            logger.error(f"Task {task_id} failed: Document {document_id} not found in database.")
-            return {"error": "Document not found"}
+            logger.error(f"Task {tracking_id} failed: Document {document_id} not found in database.")
+            return {**ref, "done": True, "error": "Document not found"}
 
         doc.status = "PROCESSING"
         db.commit()
-        logger.info(f"Processing document: {document_id} (Task: {task_id})")
+        logger.info(f"Processing document: {document_id} (Task: {tracking_id})")
+        publish_task_event(redis_client, tracking_id, {"task_id": tracking_id, "status": "PROCESSING"})
+
+        # Duplicate upload? Reuse the analysis of identical, already processed content
+        wait_until = dedup_wait_until or time.time() + settings.dedup_wait_seconds
+        try:
+            result = deduplicator.claim(doc, wait=time.time() < wait_until)
+        except TwinInFlight:
+            raise self.retry(
+                countdown=settings.dedup_poll_seconds,
+                max_retries=self.max_retries + dedup_waits + 1,
+                kwargs={**(self.request.kwargs or {}), "dedup_wait_until": wait_until, "dedup_waits": dedup_waits + 1},
+            )
+        record_cache("analysis_dedup", hit=result is not None)
+        if result is not None:
+            _complete(db, doc, result, tracking_id)
+            return {**ref, "done": True}
 
-        # Get file path
         path_to_process = async_to_sync(storage_service.get_file_path)(str(doc.id))
+        file_leased = True
 
         if not os.path.exists(path_to_process):
             logger.error(f"FILE CRITICAL ERROR: Worker cannot find file at {path_to_process}")
             raise FileNotFoundError(f"Could not locate document file at {path_to_process}")
 
-        logger.info(f"Verification successful. Starting AI analysis for {doc.file_name}")
-        
-        # FIXED: Use process_sync for Celery (synchronous context)
-        result = processor.process_sync(path_to_process, mime_type=doc.content)
+        logger.info(f"Verification successful. Extracting text from {doc.file_name}")
+        extraction = processor._extract_text_metadata(path_to_process, doc.content, run_ocr=False)
 
-        # Update document
-        doc.raw_text = result.get("raw_text", "")
-        doc.analysis = result.get("analysis", {})
-        doc.status = "COMPLETED"
-        db.commit()
-        
-        logger.info(f"Successfully analyzed document {document_id}")
-        logger.info(f"Summary preview: {result.get('analysis', {}).get('summary', '')[:100]}...")
-
-        # Notification
-        notification_payload = {
-            "task_id": task_id,
-            "status": "COMPLETED",
-            "analysis": result.get("analysis", {})
-        }
-        redis_client.publish(channel, json.dumps(notification_payload))
+        ref["mime_type"] = doc.content
+        ref["extraction"] = handoff.put(tracking_id, "extraction", extraction.to_dict())
+        # The LLM stage releases the dedup lock once the result is saved
+        ref["lock"] = deduplicator.detach()
+
+        STAGE_SECONDS.labels("extract", doc.content, processor.provider).observe(time.perf_counter() - started)
+        return ref
+
+    except Retry:
+        raise
+
+    except Exception as e:
+        db.rollback()
+        _retry_or_fail(self, e, ref, dedup_waits)
+
+    finally:
+        if file_leased:
+            # Lets the blob cache evict this download again
+            async_to_sync(storage_service.release_file_path)(document_id)
+        deduplicator.release()
+        db.close()
+        request_id_var.reset(token)
+
+
+@celery_app.task(bind=True, name="ocr_document_task", max_retries=3)
+def ocr_document_task(self, ref: dict):
+    """Stage 2: OCR the pages without a usable text layer (no-op for everything else)."""
+    if ref.get("done"):
+        return ref
+
+    started = time.perf_counter()
+    token = request_id_var.set(ref["request_id"])
+    file_leased = False
+
+    try:
+        extraction = ExtractionResult.from_dict(handoff.get(ref["extraction"]))
+        if not extraction.pending_ocr:
+            return ref
+
+        path_to_process = async_to_sync(storage_service.get_file_path)(ref["document_id"])
+        file_leased = True
+
+        processor.ocr_pending_pages(path_to_process, extraction)
+        extraction.timings["total"] = extraction.timings.get("total", 0.0) + extraction.timings.get("ocr", 0.0)
+
+        handoff.put(ref["tracking_id"], "extraction", extraction.to_dict())
+
+        mime_type = ref.get("mime_type") or "unknown"
+        OCR_PAGES.labels(mime_type).inc(sum(1 for page in extraction.pages if page.method == OCR))
+        STAGE_SECONDS.labels("ocr", mime_type, processor.provider).observe(time.perf_counter() - started)
+        return ref
+
+    except Exception as e:
+        _retry_or_fail(self, e, ref)
+
+    finally:
+        if file_leased:
+            async_to_sync(storage_service.release_file_path)(ref["document_id"])
+        request_id_var.reset(token)
+
+
+@celery_app.task(bind=True, name="summarize_document_task", max_retries=3)
+def summarize_document_task(self, ref: dict):
+    """Stage 3: LLM summary, then save the result and notify the client."""
+    document_id = ref["document_id"]
+    if ref.get("error"):
+        return {"error": ref["error"]}
+    if ref.get("done"):
+        return {"document_id": document_id, "status": "COMPLETED"}
+
+    started = time.perf_counter()
+    token = request_id_var.set(ref["request_id"])
+    db = get_db_sync()
+    file_leased = False
+
+    try:
+        extraction = ExtractionResult.from_dict(handoff.get(ref["extraction"]))
+
+        # Gemini reads the original file; Ollama only needs the extracted text
+        path_to_process = None
+        if processor.provider != "ollama":
+            path_to_process = async_to_sync(storage_service.get_file_path)(document_id)
+            file_leased = True
+
+        result = processor.summarize_sync(extraction, path_to_process, ref.get("mime_type"))
+
+        mime_type = ref.get("mime_type") or "unknown"
+        EXTRACTED_CHARS.labels(mime_type).observe(len(extraction.text))
+        STAGE_SECONDS.labels("llm", mime_type, processor.provider).observe(time.perf_counter() - started)
+
+        doc = db.query(Document).filter(Document.id == document_id).first()
+        if not doc:
+            logger.error(f"Task {ref['tracking_id']}: Document {document_id} was deleted during processing.")
+            _clean_up(ref)
+            return {"error": "Document not found"}
+
+        _complete(db, doc, result, ref["tracking_id"])
+        _clean_up(ref)
 
         return {"document_id": document_id, "status": "COMPLETED"}
 
     except Exception as e:
         db.rollback()
-        
-        retries_left = self.request.retries < self.max_retries
-        
-        if not retries_left:
-            logger.critical(f"Task {task_id} permanently failed after {self.max_retries} retries: {str(e)}")
-            if doc:
-                doc.status = "FAILED"
-                db.commit()
-            
-            error_payload = {"task_id": task_id, "status": "FAILED", "error": str(e)}
-            redis_client.publish(channel, json.dumps(error_payload))
-        else:
-            logger.warning(f"Task {task_id} encountered an error. Retrying... Error: {str(e)}")
-            retry_payload = {"task_id": task_id, "status": "RETRYING", "message": "Processing error, retrying..."}
-            redis_client.publish(channel, json.dumps(retry_payload))
-
-        # Retry strategy
-        if "Rate Limit" in str(e) or "429" in str(e):
-            raise self.retry(exc=e, countdown=120)
-        
-        if "Event loop" in str(e):
-            logger.error("Event loop error detected - this should be fixed with sync processing")
-            raise self.retry(exc=e, countdown=30)
-            
-        raise self.retry(exc=e, countdown=60 * (2 ** self.request.retries))
-    
+        _retry_or_fail(self, e, ref)
+
     finally:
+        if file_leased:
+            async_to_sync(storage_service.release_file_path)(document_id)
         db.close()
-        request_id_var.reset(token)
\ No newline at end of file
+        request_id_var.reset(token)
+
+
+# --- SHARED STAGE HELPERS ---
+
+def _complete(db, doc: Document, result: dict, tracking_id: str):
+    """Saves the analysis and notifies the client."""
+    doc.raw_text = result.get("raw_text", "")
+    doc.analysis = result.get("analysis", {})
+    doc.status = "COMPLETED"
+    db.commit()
+
+    logger.info(f"Successfully analyzed document {doc.id}")
+    logger.info(f"Summary preview: {result.get('analysis', {}).get('summary', '')[:100]}...")
+
+    # Notification
+    notification_payload = {
+        "task_id": tracking_id,
+        "status": "COMPLETED",
+        "analysis": result.get("analysis", {})
+    }
+    publish_task_event(redis_client, tracking_id, notification_payload)
+
+
+def _mark_failed(document_id: str):
+    db = get_db_sync()
+    try:
+        doc = db.query(Document).filter(Document.id == document_id).first()
+        if doc:
+            doc.status = "FAILED"
+            db.commit()
+    finally:
+        db.close()
+
+
+def _clean_up(ref: dict):
+    """End of the pipeline (success, failure or deleted document): drop the handoff, free twins."""
+    handoff.delete(ref["tracking_id"], "extraction")
+    release_detached(redis_client, ref.get("lock"))
+
+
+def _retry_or_fail(task, e: Exception, ref: dict, waits: int = 0):
+    """
+    Publishes RETRYING/FAILED for the stage that raised, then hands the error to Celery's retry.
+    'waits' are earlier retries spent waiting for a dedup twin; they are not failures.
+    """
+    tracking_id = ref["tracking_id"]
+    failures = task.request.retries - waits
+    max_retries = task.max_retries + waits
+    retries_left = failures < task.max_retries
+    reason = failure_reason(e)
+
+    if not retries_left:
+        TASK_FAILURES.labels(task.name, reason).inc()
+        logger.critical(f"Task {tracking_id} permanently failed in {task.name} after {task.max_retries} retries: {str(e)}")
+        _mark_failed(ref["document_id"])
+
+        error_payload = {"task_id": tracking_id, "status": "FAILED", "error": str(e)}
+        publish_task_event(redis_client, tracking_id, error_payload)
+
+        _clean_up(ref)
+
+        if task.request.id != tracking_id:
+            # The remaining stages will never run: record the failure under the tracking id
+            celery_app.backend.mark_as_failure(tracking_id, e)
+    else:
+        TASK_RETRIES.labels(task.name, reason).inc()
+        logger.warning(f"Task {tracking_id} encountered an error in {task.name}. Retrying... Error: {str(e)}")
+        retry_payload = {"task_id": tracking_id, "status": "RETRYING", "message": "Processing error, retrying..."}
+        publish_task_event(redis_client, tracking_id, retry_payload)
+
+    # Retry strategy
+    if "Rate Limit" in str(e) or "429" in str(e):
+        raise task.retry(exc=e, countdown=120, max_retries=max_retries)
+
+    if "Event loop" in str(e):
+        logger.error("Event loop error detected - this should be fixed with sync processing")
+        raise task.retry(exc=e, countdown=30, max_retries=max_retries)
+
+    raise task.retry(exc=e, countdown=60 * (2 ** failures), max_retries=max_retries)
@@ -0,0 +1,156 @@
+"""
+Extraction throughput over the synthetic corpus (tests/benchmarks/corpus.py).
+
+Runs DocumentProcessor._extract_text_metadata over every corpus document
+(including the OCR path for scanned PDFs, when tesseract and poppler are
+installed) and reports, per format: latency percentiles, pages/sec and MB/sec,
+plus the peak RSS of the process and its OCR workers.
+
+    ENV=testing AI_PROVIDER=mock python -m tests.benchmarks.bench_extraction \\
+        --output extraction.json --baseline tests/benchmarks/baselines/extraction.json
+
+With --baseline, exits with status 1 if a format's median (p50) latency got
+worse than the baseline by more than --tolerance. Comparing needs --repeat 3
+or more, and scanned PDFs are only compared when both runs had the same OCR
+mode. --update-baseline writes the results to the baseline file instead.
+"""
+import sys
+import json
+import shutil
+import logging
+import platform
+import argparse
+import resource
+import tempfile
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from tests.benchmarks.harness import Stopwatch, summarize
+from tests.benchmarks.corpus import build_corpus
+from app.infrastructure.processing.processor_service import DocumentProcessor
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "extraction.json"
+# Formats whose timings depend on whether OCR ran
+OCR_FORMATS = {"pdf_scanned"}
+# Below this the median of a format is a single noisy run
+MIN_COMPARE_REPEAT = 3
+
+
+def ocr_available() -> bool:
+    return bool(shutil.which("tesseract") and shutil.which("pdftoppm"))
+
+
+def peak_rss_mb() -> dict:
+    # ru_maxrss is in KB on Linux (bytes on macOS)
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "ocr_workers": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+
+def run(corpus_dir: str, repeat: int) -> dict:
+    documents = build_corpus(corpus_dir)
+    processor = DocumentProcessor()
+    run_ocr = ocr_available()
+
+    samples = defaultdict(list)
+    totals = defaultdict(lambda: {"seconds": 0.0, "pages": 0, "bytes": 0, "characters": 0})
+
+    # One untimed pass: imports, the OCR pool and the page cache are warm for everyone
+    for doc in documents:
+        processor._extract_text_metadata(doc.path, doc.mime_type, run_ocr=run_ocr)
+
+    for _ in range(repeat):
+        for doc in documents:
+            with Stopwatch() as sw:
+                result = processor._extract_text_metadata(doc.path, doc.mime_type, run_ocr=run_ocr)
+            samples[doc.format].append(sw.seconds)
+            total = totals[doc.format]
+            total["seconds"] += sw.seconds
+            total["pages"] += result.page_count
+            total["bytes"] += doc.bytes
+            total["characters"] += len(result.text)
+
+    formats = {}
+    for fmt, total in totals.items():
+        formats[fmt] = {
+            **summarize(samples[fmt]),
+            "pages_per_sec": round(total["pages"] / total["seconds"], 2),
+            "mb_per_sec": round(total["bytes"] / 1e6 / total["seconds"], 3),
+            "characters": total["characters"] // repeat,
+        }
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "ocr": "enabled" if run_ocr else "skipped (tesseract/pdftoppm not installed)",
+        "documents": len(documents),
+        "formats": formats,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Returns one message per format that regressed beyond 'tolerance' (0.2 = 20%).
+
+    Dev Note: The gate uses p50, not p95: with a few repeats p95 is the single
+    slowest run, so one scheduler hiccup flagged a regression.
+    """
+    skipped = set()
+    if results.get("ocr") != baseline.get("ocr"):
+        # An OCR run vs. a text-layer-only run measures different work
+        skipped = OCR_FORMATS
+        print(f"Not comparing {', '.join(sorted(skipped))}: OCR was {results.get('ocr')!r}, baseline {baseline.get('ocr')!r}")
+
+    regressions = []
+    for fmt, current in results["formats"].items():
+        before = baseline.get("formats", {}).get(fmt)
+        if not before or fmt in skipped:
+            continue
+        if current["p50_ms"] > before["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{fmt}: p50 {before['p50_ms']}ms -> {current['p50_ms']}ms")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus-dir", default=str(Path(tempfile.gettempdir()) / "extraction-corpus"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against this results file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--update-baseline", action="store_true", help=f"Overwrite {DEFAULT_BASELINE}")
+    args = parser.parse_args(argv)
+    if args.baseline and args.repeat < MIN_COMPARE_REPEAT:
+        parser.error(f"--baseline needs --repeat {MIN_COMPARE_REPEAT} or more to give stable medians")
+
+    # Per-document INFO logs would dominate the output
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = run(args.corpus_dir, args.repeat)
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    if args.update_baseline:
+        DEFAULT_BASELINE.parent.mkdir(exist_ok=True)
+        DEFAULT_BASELINE.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline updated: {DEFAULT_BASELINE}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Cold-start cost of the API process: how long 'import app.main' takes in a
+fresh interpreter, and which worker-only modules it drags in.
+
+    ENV=testing AI_PROVIDER=mock python -m tests.benchmarks.bench_import_time --runs 10
+
+Each run is a new subprocess (nothing cached in sys.modules), which is what an
+autoscaled API pod pays before it can serve its first request.
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+
+from tests.benchmarks.harness import summarize
+
+# Modules only the Celery worker needs
+WORKER_ONLY = [
+    "pandas",
+    "openpyxl",
+    "pytesseract",
+    "pdf2image",
+    "pypdf",
+    "docx",
+    "ollama",
+    "google.genai",
+    "app.workers.document_worker",
+    "app.infrastructure.processing.processor_service",
+]
+
+PROBE = f"""
+import sys, time, json
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {WORKER_ONLY!r} if m in sys.modules]}}))
+"""
+
+
+def probe() -> dict:
+    output = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True, env=os.environ)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(limit: int) -> list[dict]:
+    """Third-party packages by cumulative import time (python -X importtime)."""
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], capture_output=True, text=True, env=os.environ)
+    totals = {}
+    for line in output.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        if not match or "." in match.group(3) or match.group(3) == "app":
+            continue
+        # A package's own line is its outermost import; keep the largest
+        totals[match.group(3)] = max(totals.get(match.group(3), 0), int(match.group(1)))
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [{"module": name, "cumulative_ms": round(us / 1000, 1)} for name, us in ranked]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    runs = [probe() for _ in range(args.runs)]
+    print(json.dumps({
+        "import_app_main": summarize([run["seconds"] for run in runs]),
+        "worker_only_modules_loaded": runs[-1]["loaded"],
+        "slowest_packages": slowest_imports(args.top),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
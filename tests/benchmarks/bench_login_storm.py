@@ -0,0 +1,72 @@
+"""
+Latency of an unrelated endpoint (/healthy) while a burst of logins is running,
+with bcrypt inline on the event loop vs. on the bounded bcrypt pool.
+
+    ENV=testing AI_PROVIDER=mock python -m tests.benchmarks.bench_login_storm [logins] [rounds]
+"""
+import sys
+import json
+import asyncio
+
+from tests.benchmarks.harness import bench_client, summarize, Stopwatch
+from app.infrastructure.auth import password as password_module
+from app.infrastructure.auth.password import password_hasher
+
+
+async def _inline(func, *args):
+    """The old behaviour: bcrypt runs directly on the event loop."""
+    return func(*args)
+
+
+async def run(logins: int, offloaded: bool) -> dict:
+    original = password_hasher._run
+    if not offloaded:
+        password_hasher._run = _inline
+
+    try:
+        async with bench_client() as (client, _):
+            user = {"email": f"storm-{offloaded}@example.com", "password": "password123"}
+            await client.post("/api/v1/auth/register", json=user)
+
+            done = asyncio.Event()
+            probes = []
+
+            async def probe():
+                while not done.is_set():
+                    with Stopwatch() as sw:
+                        await client.get("/healthy")
+                    probes.append(sw.seconds)
+                    await asyncio.sleep(0.005)
+
+            async def login():
+                response = await client.post("/api/v1/auth/login", json=user)
+                return response.status_code
+
+            prober = asyncio.create_task(probe())
+            with Stopwatch() as storm:
+                statuses = await asyncio.gather(*(login() for _ in range(logins)))
+            done.set()
+            await prober
+    finally:
+        password_hasher._run = original
+
+    return {
+        "bcrypt": "bounded pool" if offloaded else "inline",
+        "logins": logins,
+        "login_statuses": {str(code): statuses.count(code) for code in sorted(set(statuses))},
+        "storm_seconds": round(storm.seconds, 3),
+        "healthy_latency": summarize(probes),
+    }
+
+
+async def main(logins: int, rounds: int):
+    password_module.settings.bcrypt_rounds = rounds
+    results = [await run(logins, offloaded=False), await run(logins, offloaded=True)]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 40,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 12,
+    ))
@@ -0,0 +1,52 @@
+"""
+DB round trips and latency per authenticated request, with and without the principal cache.
+
+    ENV=testing AI_PROVIDER=mock python -m tests.benchmarks.bench_principal_cache [requests]
+"""
+import sys
+import json
+import asyncio
+from sqlalchemy import event
+
+from tests.benchmarks.harness import bench_client, register_and_login, summarize, Stopwatch
+from app.infrastructure.auth.principal_cache import principal_cache
+
+
+async def run(requests: int, cache_enabled: bool) -> dict:
+    principal_cache.clear()
+    principal_cache.ttl_seconds = 30 if cache_enabled else 0
+
+    async with bench_client() as (client, engine):
+        headers = await register_and_login(client, f"bench-{cache_enabled}@example.com")
+
+        statements = []
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+
+        samples = []
+        for _ in range(requests):
+            with Stopwatch() as sw:
+                response = await client.get("/api/v1/documents/", headers=headers)
+            assert response.status_code == 200, response.text
+            samples.append(sw.seconds)
+
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    user_queries = sum(1 for s in statements if "FROM users" in s)
+    return {
+        "principal_cache": cache_enabled,
+        "queries_per_request": round(len(statements) / requests, 3),
+        "user_queries_per_request": round(user_queries / requests, 3),
+        **summarize(samples),
+        "cache_stats": principal_cache.stats(),
+    }
+
+
+async def main(requests: int):
+    results = [await run(requests, cache_enabled=False), await run(requests, cache_enabled=True)]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,46 @@
+"""
+Micro-benchmark: sanitize_text vs. the original per-character loop.
+
+    python -m tests.benchmarks.bench_sanitizer
+"""
+import json
+import time
+
+from tests.benchmarks.harness import summarize
+from app.infrastructure.processing.text_sanitizer import sanitize_text
+from tests.benchmarks.reference import reference_sanitize
+
+# ~5MB each
+TEXTS = {
+    "clean_ascii": "Quarterly revenue grew to 4M in the period.\n" * 115_000,
+    "pdf_layer": "Total\x0c amount\x00 due: 1\xa0200 EUR – café\n" * 125_000,
+    "cjk": "文档处理系统 résumé naïve — 第三季度收入\n" * 160_000,
+}
+
+
+def _time(func, text: str, rounds: int) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func(text)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main(rounds: int = 5):
+    results = {}
+    for name, text in TEXTS.items():
+        assert sanitize_text(text) == reference_sanitize(text)
+        before = summarize(_time(reference_sanitize, text, rounds))
+        after = summarize(_time(sanitize_text, text, rounds))
+        results[name] = {
+            "chars": len(text),
+            "reference": before,
+            "sanitize_text": after,
+            "speedup": round(before["p50_ms"] / after["p50_ms"], 1),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Deterministic synthetic document corpus for the extraction benchmarks.
+
+The same seed always produces the same files, so results from different
+commits are comparable. Files are written once and reused (see the manifest).
+"""
+import csv
+import json
+import random
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+from docx import Document as DocxWriter
+from openpyxl import Workbook
+from PIL import Image, ImageDraw, ImageFont
+
+CORPUS_VERSION = 1
+
+WORDS = (
+    "invoice revenue quarterly contract payment supplier customer balance account "
+    "delivery schedule total amount tax report summary budget forecast review "
+    "agreement clause party date signature approval department finance audit"
+).split()
+
+MIME_TYPES = {
+    "pdf_digital": "application/pdf",
+    "pdf_scanned": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "txt": "text/plain",
+}
+
+# format -> size name -> units (pages, paragraphs, rows or KB)
+SIZES = {
+    "pdf_digital": {"small": 1, "medium": 10, "large": 50},
+    "pdf_scanned": {"small": 1, "medium": 3, "large": 8},
+    "docx": {"small": 20, "medium": 200, "large": 2000},
+    "xlsx": {"small": 100, "medium": 500, "large": 5000},
+    "csv": {"small": 100, "medium": 500, "large": 5000},
+    "txt": {"small": 10, "medium": 500, "large": 5000},
+}
+
+EXTENSIONS = {"pdf_digital": ".pdf", "pdf_scanned": ".pdf", "docx": ".docx", "xlsx": ".xlsx", "csv": ".csv", "txt": ".txt"}
+
+
+@dataclass
+class CorpusDocument:
+    path: str
+    format: str
+    size: str
+    mime_type: str
+    pages: int
+    bytes: int
+
+
+def build_corpus(root: str | Path, seed: int = 1234) -> list[CorpusDocument]:
+    """Generates (or reuses) the corpus under 'root' and returns its manifest."""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    manifest_path = root / "manifest.json"
+
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("version") == CORPUS_VERSION and manifest.get("seed") == seed:
+            documents = [CorpusDocument(**entry) for entry in manifest["documents"]]
+            if all(Path(doc.path).exists() for doc in documents):
+                return documents
+
+    rng = random.Random(seed)
+    documents = []
+    for fmt, sizes in SIZES.items():
+        for size, units in sizes.items():
+            path = root / f"{fmt}_{size}{EXTENSIONS[fmt]}"
+            pages = _WRITERS[fmt](path, units, rng)
+            documents.append(CorpusDocument(str(path), fmt, size, MIME_TYPES[fmt], pages, path.stat().st_size))
+
+    manifest_path.write_text(json.dumps(
+        {"version": CORPUS_VERSION, "seed": seed, "documents": [asdict(doc) for doc in documents]}, indent=2
+    ))
+    return documents
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + f" {rng.randint(1, 99999)}."
+
+
+# --- WRITERS (each returns the logical page count) ---
+
+def _write_digital_pdf(path: Path, pages: int, rng: random.Random) -> int:
+    """A minimal PDF with a real text layer (Helvetica, ~45 lines per page)."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for _ in range(pages):
+        lines = [_sentence(rng).replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for _ in range(45)]
+        stream = "BT /F1 10 Tf 50 800 Td 16 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode("latin-1"))
+        content_ref = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_ref} 0 R >>".encode()
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode()
+    path.write_bytes(bytes(out))
+    return pages
+
+
+def _write_scanned_pdf(path: Path, pages: int, rng: random.Random) -> int:
+    """Image-only pages (no text layer), like a scanner produces. 150 DPI A4."""
+    try:
+        font = ImageFont.load_default(size=22)
+    except TypeError:  # Pillow < 10.1
+        font = ImageFont.load_default()
+
+    images = []
+    for _ in range(pages):
+        image = Image.new("L", (1240, 1754), color=255)
+        draw = ImageDraw.Draw(image)
+        for line in range(40):
+            draw.text((80, 80 + line * 40), _sentence(rng, 9), fill=0, font=font)
+        images.append(image)
+    images[0].save(path, "PDF", save_all=True, append_images=images[1:], resolution=150)
+    return pages
+
+
+def _write_docx(path: Path, paragraphs: int, rng: random.Random) -> int:
+    doc = DocxWriter()
+    for _ in range(paragraphs):
+        doc.add_paragraph(" ".join(_sentence(rng) for _ in range(3)))
+    doc.save(path)
+    return 1
+
+
+def _rows(rows: int, rng: random.Random):
+    yield ["id", "date", "customer", "description", "amount"]
+    for number in range(rows):
+        yield [number, f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", rng.choice(WORDS), _sentence(rng, 6), round(rng.uniform(1, 10000), 2)]
+
+
+def _write_xlsx(path: Path, rows: int, rng: random.Random) -> int:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("data")
+    for row in _rows(rows, rng):
+        sheet.append(row)
+    workbook.save(path)
+    return 1
+
+
+def _write_csv(path: Path, rows: int, rng: random.Random) -> int:
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerows(_rows(rows, rng))
+    return 1
+
+
+def _write_txt(path: Path, kilobytes: int, rng: random.Random) -> int:
+    with open(path, "w") as f:
+        written = 0
+        while written < kilobytes * 1024:
+            line = _sentence(rng) + "\n"
+            f.write(line)
+            written += len(line)
+    return 1
+
+
+_WRITERS = {
+    "pdf_digital": _write_digital_pdf,
+    "pdf_scanned": _write_scanned_pdf,
+    "docx": _write_docx,
+    "xlsx": _write_xlsx,
+    "csv": _write_csv,
+    "txt": _write_txt,
+}
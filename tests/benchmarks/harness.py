@@ -0,0 +1,83 @@
+"""
+Shared setup for the API benchmarks in this folder.
+
+Benchmarks are plain scripts (bench_*.py, not collected by pytest). Run them with
+the test environment variables set, e.g.:
+
+    ENV=testing AI_PROVIDER=mock python -m tests.benchmarks.bench_principal_cache
+"""
+import time
+import logging
+import statistics
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+# Rate limits would throttle the benchmark itself
+patch("slowapi.extension.Limiter.limit", side_effect=lambda *args, **kwargs: lambda f: f).start()
+
+from httpx import AsyncClient, ASGITransport  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.infrastructure.db.models import Base  # noqa: E402
+from app.infrastructure.db.session import get_session  # noqa: E402
+
+# Per-request INFO logs would dominate the timings
+logging.getLogger().setLevel(logging.WARNING)
+
+
+@asynccontextmanager
+async def bench_client():
+    """Yields (client, engine) backed by a fresh in-memory SQLite database."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    sessions = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def _get_session():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _get_session
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://localhost") as client:
+            yield client, engine
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+
+async def register_and_login(client: AsyncClient, email: str, password: str = "password123") -> dict:
+    """Returns Authorization headers for a freshly registered user."""
+    await client.post("/api/v1/auth/register", json={"email": email, "password": password})
+    response = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def summarize(samples: list[float]) -> dict:
+    """Latency summary in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[max(0, int(len(ordered) * 0.95) - 1)] * 1000, 3),
+        "p99_ms": round(ordered[max(0, int(len(ordered) * 0.99) - 1)] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+class Stopwatch:
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.started
@@ -0,0 +1,15 @@
+"""
+Original (slow) implementations kept as the ground truth for optimized code.
+
+Shared by the benchmarks and by the tests that check the fast versions
+produce exactly the same output.
+"""
+
+
+def reference_sanitize(text: str) -> str:
+    """The original per-character implementation sanitize_text must match."""
+    if not text:
+        return ""
+    text = text.replace("\x00", "")
+    text = "".join(c for c in text if c.isprintable() or c in "\n\r\t")
+    return text.strip()
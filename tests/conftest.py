@@ -15,6 +15,7 @@ from app.main import app # noqa: E402
 from app.infrastructure.db.models import Base # noqa: E402
 from app.infrastructure.db.session import get_session # noqa: E402
 from app.dependencies import get_storage_service # noqa: E402
+from app.infrastructure.storage.streaming import StreamDigest, iter_chunks # noqa: E402
 
 
 app.state.limiter_enabled = False
@@ -93,6 +94,15 @@ class MockR2Storage:
             "content_type": content_type
         }
         return file_id
+
+    async def upload_stream(self, file_id: str, file_name: str, chunks, content_type: str):
+        """Mock streaming upload - collects the chunks in memory, hashing them like the real adapters"""
+        digest = StreamDigest()
+        data = bytearray()
+        async for chunk in digest.wrap(iter_chunks(chunks)):
+            data.extend(chunk)
+        await self.upload(file_id, file_name, bytes(data), content_type)
+        return digest.stored(file_id)
     
     async def get_file_path(self, file_id: str) -> str:
         """Mock file download - creates a temp file instead of downloading from R2"""
@@ -107,6 +117,10 @@ class MockR2Storage:
             f.write(self.uploaded_files[file_id]["bytes"])
         
         return temp_path
+
+    async def release_file_path(self, file_id: str) -> None:
+        """Mock release - nothing is cached"""
+        return None
     
     def clear(self):
         """Clear all uploaded files (useful between tests)"""
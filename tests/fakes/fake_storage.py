@@ -1,6 +1,18 @@
+from app.infrastructure.storage.streaming import StreamDigest, iter_chunks
+
+
 class FakeStorage:
     async def upload(self, file_id, file_name, file_bytes, content_type):
         return f"fake://{file_id}"
+
+    async def upload_stream(self, file_id, file_name, chunks, content_type):
+        digest = StreamDigest()
+        async for _ in digest.wrap(iter_chunks(chunks)):
+            pass
+        return digest.stored(f"fake://{file_id}")
     
     async def get_file_path(self, file_id):
-        return f"/tmp/{file_id}"
\ No newline at end of file
+        return f"/tmp/{file_id}"
+
+    async def release_file_path(self, file_id):
+        return None
@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from app.infrastructure.storage.blob_cache import BlobCache
+
+
+def _writer(data: bytes, calls: list):
+    def download(temp_path: str):
+        calls.append(temp_path)
+        Path(temp_path).write_bytes(data)
+    return download
+
+
+def test_second_request_is_a_hit(tmp_path):
+    cache = BlobCache(tmp_path, max_bytes=1024)
+    calls = []
+
+    first = cache.get_or_fetch("doc-1", _writer(b"hello", calls))
+    cache.release("doc-1")
+    second = cache.get_or_fetch("doc-1", _writer(b"hello", calls))
+
+    assert first == second
+    assert Path(first).read_bytes() == b"hello"
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_file_is_evicted_above_the_cap(tmp_path):
+    cache = BlobCache(tmp_path, max_bytes=25)
+
+    for key in ["a", "b", "c"]:
+        cache.get_or_fetch(key, _writer(b"x" * 10, []))
+        cache.release(key)
+        if key == "b":
+            # Touch 'a' so 'b' becomes the least recently used entry
+            cache.get_or_fetch("a", _writer(b"x" * 10, []))
+            cache.release("a")
+
+    assert (tmp_path / "a").exists()
+    assert not (tmp_path / "b").exists()
+    assert (tmp_path / "c").exists()
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 20
+
+
+def test_leased_files_are_not_evicted(tmp_path):
+    cache = BlobCache(tmp_path, max_bytes=15)
+
+    cache.get_or_fetch("in-use", _writer(b"x" * 10, []))
+    cache.get_or_fetch("new", _writer(b"x" * 10, []))
+
+    # Over the cap, but both files are still being read
+    assert (tmp_path / "in-use").exists()
+
+    cache.release("in-use")
+    assert not (tmp_path / "in-use").exists()
+    assert (tmp_path / "new").exists()
+
+
+def test_failed_download_leaves_no_partial_file(tmp_path):
+    cache = BlobCache(tmp_path, max_bytes=1024)
+
+    def broken(temp_path: str):
+        Path(temp_path).write_bytes(b"half")
+        raise ConnectionError("reset by peer")
+
+    with pytest.raises(ConnectionError):
+        cache.get_or_fetch("doc-1", broken)
+
+    assert [p.name for p in tmp_path.iterdir() if p.is_file()] == []
+
+
+def test_concurrent_requests_share_one_download(tmp_path):
+    cache = BlobCache(tmp_path, max_bytes=1024)
+    calls = []
+
+    def slow_download(temp_path: str):
+        calls.append(temp_path)
+        time.sleep(0.05)
+        Path(temp_path).write_bytes(b"payload")
+
+    paths = []
+    threads = [
+        threading.Thread(target=lambda: paths.append(cache.get_or_fetch("doc-1", slow_download)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len(set(paths)) == 1
+    assert cache.stats()["hits"] == 4
+
+
+def test_existing_files_are_reindexed_on_startup(tmp_path):
+    (tmp_path / "doc-1").write_bytes(b"cached")
+    (tmp_path / ".doc-2.abc.part").write_bytes(b"crashed")
+    (tmp_path / ".doc-3.def.part").write_bytes(b"another process is downloading this")
+    old = time.time() - 2 * 3600
+    os.utime(tmp_path / ".doc-2.abc.part", (old, old))
+
+    cache = BlobCache(tmp_path, max_bytes=1024)
+    calls = []
+    cache.get_or_fetch("doc-1", _writer(b"cached", calls))
+
+    assert calls == []
+    assert not (tmp_path / ".doc-2.abc.part").exists()
+    assert (tmp_path / ".doc-3.def.part").exists()
+
+
+def test_processes_sharing_the_directory_respect_each_others_leases(tmp_path):
+    # Two instances on one directory behave like two prefork children
+    ocr_child = BlobCache(tmp_path, max_bytes=25)
+    other_child = BlobCache(tmp_path, max_bytes=25)
+
+    ocr_child.get_or_fetch("scanned", _writer(b"x" * 10, []))
+    for key in ["b", "c"]:
+        other_child.get_or_fetch(key, _writer(b"x" * 10, []))
+        other_child.release(key)
+
+    # The cap is shared, but the file being OCR'd elsewhere survives
+    assert (tmp_path / "scanned").exists()
+    assert other_child.stats()["bytes"] == 20
+
+    ocr_child.release("scanned")
+    other_child.get_or_fetch("d", _writer(b"x" * 10, []))
+    other_child.release("d")
+    assert not (tmp_path / "scanned").exists()
+    assert ocr_child.stats()["bytes"] <= 25
@@ -0,0 +1,127 @@
+import uuid
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure.db.models import Base, Document, User
+from app.infrastructure.processing.dedup import AnalysisDeduplicator, TwinInFlight, find_cached_result
+
+CONTENT_HASH = "a" * 64
+
+
+class FakeLock:
+    def __init__(self, available: bool):
+        self.available = available
+        self.released = False
+
+    def acquire(self, blocking=True):
+        return self.available
+
+    def locked(self):
+        return not self.available
+
+    def release(self):
+        self.released = True
+
+
+class FakeRedis:
+    def __init__(self, lock_available: bool = True):
+        self.last_lock = FakeLock(lock_available)
+
+    def lock(self, name, timeout=None):
+        return self.last_lock
+
+
+@pytest.fixture
+def sync_db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _add_document(db, owner, status="PENDING", analysis=None) -> Document:
+    doc = Document(
+        file_name="invoice.pdf",
+        content="application/pdf",
+        owner_id=owner.id,
+        local_path="TEMP",
+        status=status,
+        content_hash=CONTENT_HASH,
+        raw_text="cached text" if status == "COMPLETED" else "",
+        analysis=analysis or {},
+    )
+    db.add(doc)
+    db.commit()
+    return doc
+
+
+def _add_user(db, email: str) -> User:
+    user = User(id=uuid.uuid4(), email=email, hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def owner(sync_db):
+    return _add_user(sync_db, "dedup@example.com")
+
+
+def test_cache_only_matches_same_provider_and_model(sync_db, owner):
+    _add_document(sync_db, owner, "COMPLETED", {"ai_provider": "gemini", "ai_model": "gemini-2.0-flash"})
+    match = _add_document(sync_db, owner, "COMPLETED", {"ai_provider": "ollama", "ai_model": "qwen2.5:1.5b"})
+
+    assert find_cached_result(sync_db, CONTENT_HASH, "ollama", "qwen2.5:1.5b", owner.id).id == match.id
+    assert find_cached_result(sync_db, CONTENT_HASH, "ollama", "llama3", owner.id) is None
+
+
+def test_another_users_analysis_is_never_reused(sync_db, owner):
+    _add_document(sync_db, owner, "COMPLETED", {"ai_provider": "ollama", "ai_model": "m"})
+    stranger = _add_user(sync_db, "stranger@example.com")
+    doc = _add_document(sync_db, stranger)
+
+    assert AnalysisDeduplicator(sync_db, FakeRedis(), "ollama", "m").claim(doc) is None
+
+
+def test_claim_reuses_completed_twin_without_locking(sync_db, owner):
+    _add_document(sync_db, owner, "COMPLETED", {"ai_provider": "ollama", "ai_model": "m", "summary": "- cached"})
+    doc = _add_document(sync_db, owner)
+    redis = FakeRedis()
+
+    result = AnalysisDeduplicator(sync_db, redis, "ollama", "m").claim(doc)
+
+    assert result["raw_text"] == "cached text"
+    assert result["analysis"]["summary"] == "- cached"
+    assert "deduplicated_from" in result["analysis"]
+
+
+def test_claim_takes_the_lock_when_nothing_is_cached(sync_db, owner):
+    doc = _add_document(sync_db, owner)
+    redis = FakeRedis(lock_available=True)
+    deduplicator = AnalysisDeduplicator(sync_db, redis, "ollama", "m")
+
+    assert deduplicator.claim(doc) is None
+    deduplicator.release()
+    assert redis.last_lock.released
+
+
+def test_losing_the_race_asks_the_task_to_check_back_later(sync_db, owner):
+    doc = _add_document(sync_db, owner)
+    deduplicator = AnalysisDeduplicator(sync_db, FakeRedis(lock_available=False), "ollama", "m")
+
+    with pytest.raises(TwinInFlight):
+        deduplicator.claim(doc)
+
+    # The twin finished in the meantime: reuse its analysis
+    _add_document(sync_db, owner, "COMPLETED", {"ai_provider": "ollama", "ai_model": "m"})
+    assert deduplicator.claim(doc)["raw_text"] == "cached text"
+
+
+def test_wait_budget_spent_processes_the_document(sync_db, owner):
+    doc = _add_document(sync_db, owner)
+
+    assert AnalysisDeduplicator(sync_db, FakeRedis(lock_available=False), "ollama", "m").claim(doc, wait=False) is None
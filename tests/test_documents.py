@@ -1,7 +1,12 @@
+import hashlib
 import pytest
+from datetime import datetime, timedelta
+from uuid import UUID
 from httpx import AsyncClient
 from starlette import status
 from unittest.mock import patch
+from sqlalchemy import select
+from app.infrastructure.db.models import Document, User
 
 @pytest.mark.asyncio
 async def test_upload_document_success(client: AsyncClient):
@@ -37,4 +42,85 @@ async def test_upload_unauthorized(client: AsyncClient):
     """Test that uploading without a token fails."""
     files = {"file": ("test.pdf", b"content", "application/pdf")}
     response = await client.post("/api/v1/documents/upload", files=files)
-    assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
\ No newline at end of file
+    assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
+
+@pytest.mark.asyncio
+async def test_upload_records_content_hash(client: AsyncClient, db_session):
+    """The SHA-256 computed while streaming the upload is stored on the document."""
+    user_data = {"email": "hasher@example.com", "password": "password123"}
+    await client.post("/api/v1/auth/register", json=user_data)
+    login_res = await client.post("/api/v1/auth/login", json=user_data)
+    headers = {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+    file_content = b"%PDF-1.4 hashed pdf content"
+
+    with patch("app.api.v1.routes.documents.queue_processing") as mock_queue:
+        mock_queue.return_value = {"task_id": "mock-task-456"}
+        response = await client.post(
+            "/api/v1/documents/upload",
+            headers=headers,
+            files={"file": ("hashed.pdf", file_content, "application/pdf")}
+        )
+
+    assert response.status_code == 201
+    doc = await db_session.get(Document, UUID(response.json()["document_id"]))
+    assert doc.content_hash == hashlib.sha256(file_content).hexdigest()
+
+async def _seed_documents(client: AsyncClient, db_session, email: str, count: int) -> dict:
+    """Registers a user and inserts 'count' documents, one minute apart (newest last)."""
+    user_data = {"email": email, "password": "password123"}
+    await client.post("/api/v1/auth/register", json=user_data)
+    login_res = await client.post("/api/v1/auth/login", json=user_data)
+    user = (await db_session.execute(select(User).where(User.email == email))).scalar_one()
+
+    base = datetime(2026, 1, 1, 12, 0)
+    for i in range(count):
+        db_session.add(Document(
+            file_name=f"doc_{i}.pdf",
+            content="application/pdf",
+            owner_id=user.id,
+            status="COMPLETED" if i % 2 else "FAILED",
+            url="fake://",
+            local_path="fake://",
+            raw_text="x" * 10_000,
+            analysis={"summary": f"summary {i}"},
+            created_at=base + timedelta(minutes=i),
+        ))
+    await db_session.commit()
+    return {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+
+@pytest.mark.asyncio
+async def test_list_documents_pages_with_cursor_and_skips_raw_text(client: AsyncClient, db_session):
+    """Keyset pagination walks every document exactly once, newest first, without raw_text."""
+    headers = await _seed_documents(client, db_session, "lister@example.com", 5)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/v1/documents/", headers=headers, params=params)
+        assert response.status_code == 200
+        body = response.json()
+        assert all("raw_text" not in item and "analysis" not in item for item in body["items"])
+        seen.extend(item["file_name"] for item in body["items"])
+        cursor = body.get("next_cursor")
+        if not cursor:
+            break
+
+    assert seen == [f"doc_{i}.pdf" for i in range(4, -1, -1)]
+
+@pytest.mark.asyncio
+async def test_list_documents_filters_and_opt_in_columns(client: AsyncClient, db_session):
+    """Status/date filters narrow the page; analysis is returned only when asked for."""
+    headers = await _seed_documents(client, db_session, "filterer@example.com", 5)
+
+    response = await client.get(
+        "/api/v1/documents/",
+        headers=headers,
+        params={"status": "completed", "created_after": "2026-01-01T12:02:00", "include_analysis": True},
+    )
+
+    items = response.json()["items"]
+    assert [item["file_name"] for item in items] == ["doc_3.pdf"]
+    assert items[0]["analysis"] == {"summary": "summary 3"}
+
+    bad = await client.get("/api/v1/documents/", headers=headers, params={"cursor": "not-a-cursor"})
+    assert bad.status_code == 400
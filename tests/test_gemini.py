@@ -0,0 +1,139 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from google.genai import errors, types
+
+from app.domain.exceptions import ProcessingError
+from app.infrastructure.config import settings
+from app.infrastructure.processing import gemini as gemini_module
+from app.infrastructure.processing.gemini import FileHandleCache
+from app.infrastructure.processing.processor_service import DocumentProcessor
+from app.infrastructure.processing.summary_cache import SummaryCache
+
+
+class FakeGemini:
+    """The slice of genai.Client().aio the processor uses, kept in memory."""
+
+    def __init__(self, polls_until_active: int = 2, final_state=types.FileState.ACTIVE):
+        self.polls_until_active = polls_until_active
+        self.final_state = final_state
+        self.files = {}
+        self.uploads = []
+        self.gets = 0
+        self.prompts = []
+        self.aio = SimpleNamespace(
+            files=SimpleNamespace(upload=self._upload, get=self._get),
+            models=SimpleNamespace(generate_content=self._generate),
+        )
+
+    async def _upload(self, file, config):
+        name = f"files/{len(self.uploads) + 1}"
+        self.uploads.append(file)
+        self.files[name] = {"polls": 0, "mime_type": config["mime_type"]}
+        return self._file(name, types.FileState.PROCESSING)
+
+    async def _get(self, name):
+        self.gets += 1
+        if name not in self.files:
+            raise errors.ClientError(404, {"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}})
+        entry = self.files[name]
+        entry["polls"] += 1
+        state = self.final_state if entry["polls"] >= self.polls_until_active else types.FileState.PROCESSING
+        return self._file(name, state)
+
+    async def _generate(self, model, contents):
+        prompt, file = contents
+        assert file.state == types.FileState.ACTIVE
+        self.prompts.append(file.name)
+        return SimpleNamespace(text=f"- insight from {file.name}\n")
+
+    @staticmethod
+    def _file(name, state):
+        return types.File(
+            name=name, state=state, expiration_time=datetime.now(timezone.utc) + timedelta(hours=48)
+        )
+
+
+@pytest.fixture
+def gemini(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "gemini_file_poll_seconds", 0.001)
+    fake = FakeGemini()
+    processor = DocumentProcessor()
+    processor.provider = "gemini"
+    processor.gemini_client = fake
+    processor.gemini_files = FileHandleCache()
+    processor.summary_cache = SummaryCache()
+    path = tmp_path / "contract.txt"
+    path.write_text("This agreement is made between Acme Ltd and Globex Corp for $1M.\n" * 3)
+    return processor, fake, str(path)
+
+
+def test_upload_is_polled_until_active_then_summarized(gemini):
+    processor, fake, path = gemini
+
+    result = processor.process_sync(path, "text/plain")
+
+    assert result["analysis"]["summary"] == "- insight from files/1"
+    assert fake.uploads == [path]
+    # PROCESSING -> polled twice -> ACTIVE, no fixed sleep
+    assert fake.gets == 2
+
+
+@pytest.mark.asyncio
+async def test_duplicates_and_retries_reuse_the_upload(gemini, tmp_path):
+    processor, fake, path = gemini
+    copy = tmp_path / "copy.txt"
+    copy.write_bytes(open(path, "rb").read())
+
+    await processor._run_gemini_summary(path, "text/plain")
+    # Same bytes, another file on disk (e.g. a duplicate upload)
+    second = await processor._run_gemini_summary(str(copy), "text/plain")
+
+    assert second == "- insight from files/1"
+    assert len(fake.uploads) == 1
+    assert fake.prompts == ["files/1", "files/1"]
+
+
+def test_deleted_upload_is_replaced(gemini):
+    processor, fake, path = gemini
+    processor._run_gemini_summary_sync(path, "text/plain")
+    fake.files.clear()
+
+    assert processor._run_gemini_summary_sync(path, "text/plain") == "- insight from files/2"
+    assert len(fake.uploads) == 2
+
+
+def test_failed_file_processing_is_not_retryable(gemini):
+    processor, fake, path = gemini
+    fake.final_state = types.FileState.FAILED
+
+    with pytest.raises(ProcessingError, match="NON_RETRYABLE"):
+        processor._run_gemini_summary_sync(path, "text/plain")
+
+
+def test_file_handle_cache_survives_concurrent_threads(monkeypatch):
+    # upload_once() reaches the cache from executor threads; force interleaving
+    monkeypatch.setattr(gemini_module, "LOCAL_ENTRIES", 4)
+    cache = FileHandleCache()
+    file = FakeGemini._file("files/1", types.FileState.ACTIVE)
+
+    def hammer(worker: int):
+        for n in range(2000):
+            digest = f"d{n % 12}"
+            cache.set(digest, file)
+            cache.get(digest)
+            if n % 5 == worker % 5:
+                cache.invalidate(digest)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(hammer, range(8)))
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert len(cache._entries) <= 4
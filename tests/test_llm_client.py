@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from app.domain.exceptions import ServiceOverloaded
+from app.infrastructure.processing import llm_client
+from app.infrastructure.processing.llm_client import AsyncOllamaClient
+
+
+class FakeAsyncClient:
+    """Stands in for ollama.AsyncClient; holds every call until released."""
+
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.active = 0
+        self.peak = 0
+        self.release = asyncio.Event()
+        self.closed = False
+        FakeAsyncClient.instances.append(self)
+
+    async def chat(self, model, options, messages, keep_alive=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await self.release.wait()
+        self.active -= 1
+        return {"message": {"content": f"{model}:{messages[0]['content']}"}}
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_ollama(monkeypatch):
+    FakeAsyncClient.instances = []
+    monkeypatch.setattr(llm_client, "AsyncClient", FakeAsyncClient)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_and_one_pool_is_reused():
+    client = AsyncOllamaClient("http://ollama:11434", max_concurrency=2, max_waiting=10)
+
+    tasks = [asyncio.create_task(client.chat("m", f"p{i}")) for i in range(5)]
+    await asyncio.sleep(0.01)
+
+    assert client.stats()["in_flight"] == 2
+    assert client.stats()["waiting"] == 3
+
+    FakeAsyncClient.instances[0].release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert results == [f"m:p{i}" for i in range(5)]
+    assert len(FakeAsyncClient.instances) == 1
+    assert FakeAsyncClient.instances[0].peak == 2
+    assert FakeAsyncClient.instances[0].kwargs["limits"].max_keepalive_connections == 2
+
+
+@pytest.mark.asyncio
+async def test_full_wait_queue_fails_fast():
+    client = AsyncOllamaClient("http://ollama:11434", max_concurrency=1, max_waiting=1)
+
+    running = asyncio.create_task(client.chat("m", "first"))
+    waiting = asyncio.create_task(client.chat("m", "second"))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(ServiceOverloaded):
+        await client.chat("m", "third")
+    assert client.rejected == 1
+
+    FakeAsyncClient.instances[0].release.set()
+    assert await asyncio.gather(running, waiting) == ["m:first", "m:second"]
+
+
+@pytest.mark.asyncio
+async def test_clients_are_shared_per_host_and_closed_on_shutdown():
+    first = llm_client.get_async_ollama("http://a:11434")
+
+    assert llm_client.get_async_ollama("http://a:11434") is first
+    assert llm_client.get_async_ollama("http://b:11434") is not first
+
+    # Open the pool on this loop
+    first._bind()
+    await llm_client.close_async_ollama()
+
+    assert FakeAsyncClient.instances[0].closed
+    assert llm_client._clients == {}
@@ -8,4 +8,10 @@ async def test_return_health_check(client): # Using the 'client' fixture from co
     data = response.json()
     assert data["status"] == "online"
     assert data["environment"] == "docker-container"
-    assert "request_id" in data
\ No newline at end of file
+    assert "request_id" in data
+
+def test_api_does_not_import_the_worker_stack():
+    """The API dispatches tasks by name; pandas, OCR and LLM SDKs stay in the worker."""
+    from tests.benchmarks.bench_import_time import probe
+
+    assert probe()["loaded"] == []
@@ -0,0 +1,38 @@
+import pytest
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from unittest.mock import patch
+
+from app.infrastructure.metrics import failure_reason
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_failure_reasons_are_low_cardinality():
+    assert failure_reason(Exception("429 Too Many Requests")) == "rate_limit"
+    assert failure_reason(RuntimeError("Event loop is closed")) == "event_loop"
+    assert failure_reason(FileNotFoundError("/tmp/x")) == "FileNotFoundError"
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_upload_histograms(client: AsyncClient):
+    user = {"email": "metrics@example.com", "password": "password123"}
+    await client.post("/api/v1/auth/register", json=user)
+    login = await client.post("/api/v1/auth/login", json=user)
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    before = _sample("document_upload_bytes_sum", mime_type="application/pdf")
+
+    with patch("app.api.v1.routes.documents.queue_processing") as mock_queue:
+        mock_queue.return_value = {"task_id": "mock-task", "document_id": "x"}
+        files = {"file": ("m.pdf", b"%PDF-1.4 metrics", "application/pdf")}
+        await client.post("/api/v1/documents/upload", headers=headers, files=files)
+
+    assert _sample("document_upload_bytes_sum", mime_type="application/pdf") - before == len(b"%PDF-1.4 metrics")
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'document_upload_seconds_count{mime_type="application/pdf"}' in response.text
+    assert "pipeline_stage_seconds" in response.text
@@ -0,0 +1,46 @@
+import time
+from unittest.mock import MagicMock, patch
+
+from app.infrastructure.processing.ocr_engine import OcrEngine
+
+
+def _fake_rasterize(file_path, dpi, first_page, last_page, grayscale):
+    image = MagicMock()
+    image.page = first_page
+    return [image]
+
+
+def _fake_tesseract(image):
+    # Later pages finish first, so ordering has to come from the engine, not timing
+    time.sleep(0.05 * (6 - image.page))
+    return f"text of page {image.page}"
+
+
+def test_parallel_ocr_keeps_page_order():
+    engine = OcrEngine(max_workers=3)
+
+    try:
+        with patch("app.infrastructure.processing.ocr_engine.convert_from_path", side_effect=_fake_rasterize), \
+             patch("pytesseract.image_to_string", side_effect=_fake_tesseract):
+            results = engine.ocr_pdf("scan.pdf", [5, 1, 3, 2, 4])
+    finally:
+        engine.shutdown()
+
+    assert [r.number for r in results] == [1, 2, 3, 4, 5]
+    assert [r.text for r in results] == [f"text of page {n}" for n in range(1, 6)]
+    assert all(r.seconds >= 0 for r in results)
+
+
+def test_pages_are_rasterized_one_window_at_a_time():
+    engine = OcrEngine(max_workers=1, dpi=150, grayscale=True)
+
+    with patch("app.infrastructure.processing.ocr_engine.convert_from_path", side_effect=_fake_rasterize) as rasterize, \
+         patch("pytesseract.image_to_string", return_value="hello") as tesseract:
+        results = engine.ocr_pdf("scan.pdf", [1, 2])
+
+    assert engine._executor is None
+    assert tesseract.call_count == 2
+    assert [r.text for r in results] == ["hello", "hello"]
+    assert [c.kwargs["first_page"] for c in rasterize.call_args_list] == [1, 2]
+    assert all(c.kwargs["first_page"] == c.kwargs["last_page"] for c in rasterize.call_args_list)
+    assert all(c.kwargs["dpi"] == 150 and c.kwargs["grayscale"] for c in rasterize.call_args_list)
@@ -0,0 +1,160 @@
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.domain.exceptions import ServiceOverloaded
+from app.infrastructure.processing.ollama_pool import OllamaPool, _is_host_error
+
+
+class FakeOllama:
+    """A local HTTP server speaking just enough of the Ollama API."""
+
+    def __init__(self, name: str, status: int = 200):
+        self.name = name
+        self.status = status
+        self.requests = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fake.requests.append(self.path)
+                self._reply({"models": []})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                fake.requests.append((self.path, body))
+                self._reply({"model": body["model"], "message": {"role": "assistant", "content": fake.name}, "done": True})
+
+            def _reply(self, payload):
+                data = json.dumps(payload if fake.status == 200 else {"error": "boom"}).encode()
+                self.send_response(fake.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fakes():
+    servers = []
+
+    def start(name, status=200):
+        servers.append(FakeOllama(name, status))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def _dead_url() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+def test_prompts_go_to_the_least_loaded_host(fakes):
+    a, b = fakes("a"), fakes("b")
+    pool = OllamaPool([a.url, b.url])
+    pool.hosts[0].outstanding = 2
+
+    assert pool.complete("m", "hi") == "b"
+
+    # Equal load: the host with the lower moving-average latency wins
+    pool.hosts[0].outstanding = 0
+    pool.hosts[0].latency, pool.hosts[1].latency = 0.1, 5.0
+    assert pool.complete("m", "hi") == "a"
+
+
+def test_failing_host_is_ejected_then_readmitted_on_probation(fakes):
+    flaky, healthy = fakes("flaky", status=500), fakes("healthy")
+    pool = OllamaPool([flaky.url, healthy.url], eject_after=2, eject_seconds=60)
+
+    # Every prompt fails over to the healthy host; two failures eject the flaky one
+    assert [pool.complete("m", "hi") for _ in range(3)] == ["healthy"] * 3
+    assert pool.stats()[0]["ejected"] is True
+    assert len(flaky.requests) == 2
+
+    # Cool-down over and the host recovered: one success readmits it
+    flaky.status = 200
+    pool.hosts[0].ejected_until = 0.0
+    pool.hosts[1].outstanding = 1
+    assert pool.complete("m", "hi") == "flaky"
+    assert pool.stats()[0]["failures"] == 0
+
+    # Readmission resets the failure budget
+    flaky.status = 500
+    assert pool.complete("m", "hi") == "healthy"
+    assert pool.stats()[0]["ejected"] is False
+
+
+def test_server_errors_fail_over_and_raise_the_last_host_error(fakes):
+    broken = fakes("broken", status=500)
+    pool = OllamaPool([broken.url, _dead_url()], eject_after=1)
+
+    # Both hosts were tried: the caller sees why the last one failed
+    with pytest.raises(Exception) as failure:
+        pool.complete("m", "hi")
+    assert not isinstance(failure.value, ServiceOverloaded)
+    assert _is_host_error(failure.value)
+    assert all(host["ejected"] for host in pool.stats())
+
+    # Every host is ejected now: nothing is tried, the pool is overloaded
+    with pytest.raises(ServiceOverloaded):
+        pool.complete("m", "hi")
+
+
+def test_warm_up_probes_and_loads_the_model_with_keep_alive(fakes):
+    up = fakes("up")
+    pool = OllamaPool([up.url, _dead_url()], eject_after=3)
+
+    warmed = pool.warm_up("qwen")
+
+    assert list(warmed.values()) == [True, False]
+    assert up.requests[0] == "/api/tags"
+    path, body = up.requests[1]
+    assert path == "/api/generate" and body["model"] == "qwen" and "keep_alive" in body
+    # A failed probe ejects immediately
+    assert pool.stats()[1]["ejected"] is True
+
+
+@pytest.mark.asyncio
+async def test_async_prompts_use_the_same_routing(fakes):
+    a, b = fakes("a"), fakes("b")
+    pool = OllamaPool([_dead_url(), a.url, b.url], eject_after=1)
+
+    assert await pool.acomplete("m", "hi") == "a"
+    assert pool.stats()[0]["ejected"] is True
+
+
+@pytest.mark.asyncio
+async def test_full_queues_raise_overloaded_but_never_hide_a_host_error(fakes):
+    class FullQueue:
+        async def chat(self, model, prompt, options=None):
+            raise ServiceOverloaded("queue full")
+
+    pool = OllamaPool([fakes("a").url, fakes("b").url])
+    for host in pool.hosts:
+        host.aclient = FullQueue()
+    with pytest.raises(ServiceOverloaded):
+        await pool.acomplete("m", "hi")
+
+    pool = OllamaPool([fakes("busy").url, _dead_url()], eject_after=3)
+    pool.hosts[0].aclient = FullQueue()
+    with pytest.raises(Exception) as failure:
+        await pool.acomplete("m", "hi")
+    assert _is_host_error(failure.value)
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.domain.exceptions import ServiceOverloaded
+from app.infrastructure.auth import password as password_module
+from app.infrastructure.auth.password import PasswordHasher, hash_password, needs_rehash
+from app.infrastructure.db.models import User
+
+
+def test_needs_rehash_compares_the_cost_factor(monkeypatch):
+    monkeypatch.setattr(password_module.settings, "bcrypt_rounds", 5)
+
+    assert not needs_rehash(hash_password("password123", rounds=5))
+    assert needs_rehash(hash_password("password123", rounds=4))
+    assert needs_rehash("not-a-bcrypt-hash")
+
+
+@pytest.mark.asyncio
+async def test_hashing_runs_off_the_event_loop():
+    hasher = PasswordHasher(max_workers=1, max_queue=4)
+    loop_thread = threading.get_ident()
+    threads = []
+
+    def spy(password):
+        threads.append(threading.get_ident())
+        return hash_password(password, rounds=4)
+
+    hashed = await hasher._run(spy, "password123")
+
+    assert threads and threads[0] != loop_thread
+    assert await hasher.verify("password123", hashed)
+    assert not await hasher.verify("wrong-password", hashed)
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_limit_rejects_instead_of_queueing():
+    hasher = PasswordHasher(max_workers=1, max_queue=2)
+    release = threading.Event()
+
+    def slow(_):
+        release.wait(1)
+        return "done"
+
+    pending = [asyncio.create_task(hasher._run(slow, None)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(ServiceOverloaded):
+        await hasher._run(slow, None)
+
+    release.set()
+    assert await asyncio.gather(*pending) == ["done", "done"]
+    assert hasher.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_hashes_made_with_an_old_cost_factor(client: AsyncClient, db_session, monkeypatch):
+    user = {"email": "rehash@example.com", "password": "password123"}
+    monkeypatch.setattr(password_module.settings, "bcrypt_rounds", 4)
+    await client.post("/api/v1/auth/register", json=user)
+
+    monkeypatch.setattr(password_module.settings, "bcrypt_rounds", 5)
+    response = await client.post("/api/v1/auth/login", json=user)
+    assert response.status_code == 200
+
+    db_session.expire_all()
+    stored = (await db_session.execute(select(User).where(User.email == user["email"]))).scalar_one()
+    assert stored.hashed_password.split("$")[2] == "05"
@@ -0,0 +1,229 @@
+import uuid
+
+import pytest
+from celery.exceptions import Retry
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.domain.extraction import ExtractionResult, PageText, OCR
+from app.infrastructure.db.models import Base, Document, User
+from app.infrastructure.config import settings
+from app.infrastructure.processing.dedup import TwinInFlight
+from app.infrastructure.queue.handoff import StageHandoff
+from app.workers import document_worker
+
+
+class FakeRedis:
+    """Just enough of redis-py for the handoff and task events."""
+
+    def __init__(self):
+        self.data = {}
+        self.events = []
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def xadd(self, stream, fields, maxlen=None, approximate=True):
+        self.events.append(fields["data"])
+        return f"{len(self.events)}-0"
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def expire(self, key, seconds):
+        pass
+
+    def publish(self, channel, message):
+        pass
+
+    def execute(self):
+        pass
+
+
+class FakeDeduplicator:
+    def __init__(self, *args):
+        pass
+
+    def claim(self, doc, wait=True):
+        return None
+
+    def detach(self):
+        return None
+
+    def release(self):
+        pass
+
+
+class FakeProcessor:
+    provider = "ollama"
+    model_name = "m"
+
+    def __init__(self):
+        self.calls = []
+
+    def _extract_text_metadata(self, file_path, mime_type=None, run_ocr=True):
+        self.calls.append(("extract", run_ocr))
+        return ExtractionResult(
+            pages=[PageText(1, "text layer"), PageText(2, "")],
+            timings={"total": 0.1},
+            pending_ocr=[2],
+        )
+
+    def ocr_pending_pages(self, file_path, result):
+        self.calls.append(("ocr", result.pending_ocr))
+        result.pages[1] = PageText(2, "scanned", method=OCR, seconds=1.0)
+        result.pending_ocr = []
+        result.timings["ocr"] = 1.0
+
+    def summarize_sync(self, extraction, file_path=None, mime_type=None):
+        self.calls.append(("summarize", file_path))
+        return {"raw_text": extraction.text, "analysis": {"summary": "- done"}}
+
+
+class FakeStorage:
+    def __init__(self, path):
+        self.path = path
+        self.released = 0
+
+    async def get_file_path(self, document_id):
+        return self.path
+
+    async def release_file_path(self, document_id):
+        self.released += 1
+
+
+def test_handoff_round_trip_is_compressed_and_deletable():
+    redis = FakeRedis()
+    handoff = StageHandoff(redis)
+    payload = ExtractionResult(pages=[PageText(1, "x" * 5000)], pending_ocr=[3]).to_dict()
+
+    key = handoff.put("task-1", "extraction", payload)
+
+    assert key == "pipeline:task-1:extraction"
+    assert len(redis.data[key]) < 1000
+    assert ExtractionResult.from_dict(handoff.get(key)).pending_ocr == [3]
+
+    handoff.delete("task-1", "extraction")
+    with pytest.raises(LookupError):
+        handoff.get(key)
+
+
+@pytest.fixture
+def pipeline_env(monkeypatch, tmp_path):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    redis = FakeRedis()
+    processor = FakeProcessor()
+    file_path = tmp_path / "scan.pdf"
+    file_path.write_bytes(b"%PDF")
+    storage = FakeStorage(str(file_path))
+
+    monkeypatch.setattr(document_worker, "get_db_sync", session_factory)
+    monkeypatch.setattr(document_worker, "redis_client", redis)
+    monkeypatch.setattr(document_worker, "handoff", StageHandoff(redis))
+    monkeypatch.setattr(document_worker, "processor", processor)
+    monkeypatch.setattr(document_worker, "storage_service", storage)
+    monkeypatch.setattr(document_worker, "AnalysisDeduplicator", FakeDeduplicator)
+
+    db = session_factory()
+    owner = User(id=uuid.uuid4(), email="pipeline@example.com", hashed_password="x")
+    doc = Document(file_name="scan.pdf", content="application/pdf", owner=owner, local_path="TEMP", status="PENDING")
+    db.add_all([owner, doc])
+    db.commit()
+    yield session_factory, doc.id, redis, processor, storage
+    db.close()
+    engine.dispose()
+
+
+def test_stages_pass_the_extraction_by_reference(pipeline_env):
+    session_factory, doc_id, redis, processor, storage = pipeline_env
+
+    ocr_pages_before = REGISTRY.get_sample_value("pipeline_ocr_pages_total", {"mime_type": "application/pdf"}) or 0
+
+    # Celery hands the worker a string id; sqlite's UUID column needs the object
+    ref = document_worker.extract_document_task(doc_id, "track-1", "rid")
+    assert ref["extraction"] == "pipeline:track-1:extraction"
+    assert "pages" not in ref  # only the key travels through the broker
+
+    ref = document_worker.ocr_document_task(ref)
+    result = document_worker.summarize_document_task(ref)
+
+    assert result == {"document_id": doc_id, "status": "COMPLETED"}
+    assert processor.calls == [("extract", False), ("ocr", [2]), ("summarize", None)]
+    # Every download is released, and the handoff is cleaned up
+    assert storage.released == 2
+    assert redis.data == {}
+
+    doc = session_factory().get(Document, doc_id)
+    assert doc.status == "COMPLETED"
+    assert doc.raw_text == "text layer\nscanned"
+    assert '"PROCESSING"' in redis.events[0]
+    assert '"COMPLETED"' in redis.events[-1]
+    assert REGISTRY.get_sample_value("pipeline_ocr_pages_total", {"mime_type": "application/pdf"}) == ocr_pages_before + 1
+    assert REGISTRY.get_sample_value(
+        "pipeline_stage_seconds_count", {"stage": "llm", "mime_type": "application/pdf", "provider": "ollama"}
+    ) >= 1
+
+
+def test_missing_document_short_circuits_later_stages(pipeline_env):
+    _, _, _, processor, _ = pipeline_env
+
+    ref = document_worker.extract_document_task(uuid.uuid4(), "track-2")
+    ref = document_worker.ocr_document_task(ref)
+
+    assert document_worker.summarize_document_task(ref) == {"error": "Document not found"}
+    assert processor.calls == []
+
+
+def test_document_deleted_mid_pipeline_still_cleans_up(pipeline_env, monkeypatch):
+    session_factory, doc_id, redis, processor, _ = pipeline_env
+    released = []
+    monkeypatch.setattr(FakeDeduplicator, "detach", lambda self: "dedup-lock-token")
+    monkeypatch.setattr(document_worker, "release_detached", lambda client, lock: released.append(lock))
+
+    ref = document_worker.ocr_document_task(document_worker.extract_document_task(doc_id, "track-4"))
+    db = session_factory()
+    db.delete(db.get(Document, doc_id))
+    db.commit()
+
+    assert document_worker.summarize_document_task(ref) == {"error": "Document not found"}
+    # The twins' lock is freed and the stored extraction is gone
+    assert released == ["dedup-lock-token"]
+    assert redis.data == {}
+
+
+def test_in_flight_twin_retries_the_task_instead_of_sleeping(pipeline_env, monkeypatch):
+    _, doc_id, _, processor, _ = pipeline_env
+    retries = []
+
+    def twin_in_flight(self, doc, wait=True):
+        assert wait
+        raise TwinInFlight(str(doc.id))
+
+    def retry(**kwargs):
+        retries.append(kwargs)
+        return Retry()
+
+    monkeypatch.setattr(FakeDeduplicator, "claim", twin_in_flight)
+    monkeypatch.setattr(document_worker.extract_document_task, "retry", retry)
+
+    with pytest.raises(Retry):
+        document_worker.extract_document_task(doc_id, "track-3", dedup_waits=2)
+
+    assert processor.calls == []
+    assert retries[0]["countdown"] == settings.dedup_poll_seconds
+    assert retries[0]["kwargs"]["dedup_waits"] == 3
+    assert retries[0]["kwargs"]["dedup_wait_until"] > 0
+    # Waiting doesn't eat into the failure budget
+    assert retries[0]["max_retries"] == document_worker.extract_document_task.max_retries + 3
@@ -0,0 +1,93 @@
+import json
+import uuid
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from starlette import status
+
+from app.domain.principal import Principal
+from app.infrastructure.auth.principal_cache import PrincipalCache
+from tests.conftest import engine
+
+
+def _principal(**overrides) -> Principal:
+    return Principal(**{"id": uuid.uuid4(), "email": "p@example.com", "role": "user", "is_active": True, **overrides})
+
+
+class FakeAsyncRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.mark.asyncio
+async def test_local_tier_expires_and_evicts_least_recently_used(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.infrastructure.auth.principal_cache.time.monotonic", lambda: now[0])
+    cache = PrincipalCache(ttl_seconds=30, max_entries=2, use_redis=False)
+    a, b, c = _principal(), _principal(), _principal()
+
+    for p in (a, b):
+        await cache.set(p)
+    await cache.get(str(a.id))          # 'a' is now most recently used
+    await cache.set(c)                  # evicts 'b'
+
+    assert await cache.get(str(b.id)) is None
+    assert await cache.get(str(a.id)) == a
+
+    now[0] += 31
+    assert await cache.get(str(a.id)) is None
+    assert cache.stats()["local_hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_warms_other_processes_and_invalidates_everywhere():
+    redis = FakeAsyncRedis()
+    pod_a = PrincipalCache(ttl_seconds=30, use_redis=True, redis_factory=lambda: redis)
+    pod_b = PrincipalCache(ttl_seconds=30, use_redis=True, redis_factory=lambda: redis)
+    principal = _principal()
+
+    await pod_a.set(principal)
+    assert json.loads(redis.data[f"principal:{principal.id}"])["email"] == "p@example.com"
+    assert await pod_b.get(str(principal.id)) == principal
+    assert pod_b.stats()["redis_hits"] == 1
+
+    await pod_a.invalidate(principal.id)
+    assert redis.data == {}
+    assert await pod_a.get(str(principal.id)) is None
+
+
+@pytest.mark.asyncio
+async def test_authenticated_requests_skip_the_user_query_until_revoked(client: AsyncClient):
+    user = {"email": "cached@example.com", "password": "password123"}
+    await client.post("/api/v1/auth/register", json=user)
+    login = await client.post("/api/v1/auth/login", json=user)
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        await client.get("/api/v1/documents/", headers=headers)
+        await client.get("/api/v1/documents/", headers=headers)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    user_lookups = [s for s in statements if "FROM users" in s]
+    assert len(user_lookups) == 1
+
+    # Deleting the account invalidates the cached principal right away
+    await client.delete("/api/v1/auth/delete-account", headers=headers)
+    response = await client.get("/api/v1/documents/", headers=headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,128 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.domain.extraction import ExtractionResult, PageText, TEXT_LAYER, OCR, HYBRID
+from app.infrastructure.processing.ocr_engine import OcrPageResult
+from app.infrastructure.processing.processor_service import OCR_FAILED_TEXT, DocumentProcessor
+from app.infrastructure.processing.summary_cache import SummaryCache
+
+
+def _ollama_processor() -> DocumentProcessor:
+    processor = DocumentProcessor()
+    processor.provider = "ollama"
+    processor.ollama_pool = MagicMock()
+    processor.ollama_pool.complete.return_value = "- one\n- two\n- three\n- four"
+    processor.ollama_pool.acomplete = AsyncMock(return_value="- one\n- two\n- three\n- four")
+    # Local tier only: never share summaries with a Redis that happens to be running
+    processor.summary_cache = SummaryCache()
+    return processor
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    path = tmp_path / "report.txt"
+    path.write_text("Quarterly revenue grew to $4M. Contact finance@example.com for details.\n" * 5)
+    return str(path)
+
+
+def test_process_sync_extracts_document_once(text_file):
+    """The summarizer and the analysis builder must share one extraction pass."""
+    processor = _ollama_processor()
+
+    with patch.object(processor, "_extract_text_metadata", wraps=processor._extract_text_metadata) as spy:
+        result = processor.process_sync(text_file, mime_type="text/plain")
+
+    assert spy.call_count == 1
+    assert "Quarterly revenue" in result["raw_text"]
+    assert result["analysis"]["extraction_method"] == TEXT_LAYER
+    assert result["analysis"]["contains_money"] is True
+    assert "summary" in result["analysis"]["timings"]
+
+
+@pytest.mark.asyncio
+async def test_process_async_extracts_document_once(text_file):
+    processor = _ollama_processor()
+
+    with patch.object(processor, "_extract_text_metadata", wraps=processor._extract_text_metadata) as spy:
+        result = await processor.process(text_file, mime_type="text/plain")
+
+    assert spy.call_count == 1
+    assert result["analysis"]["summary"].startswith("- one")
+    # The async path awaits the shared client instead of a blocking executor call
+    processor.ollama_pool.acomplete.assert_awaited_once()
+    processor.ollama_pool.complete.assert_not_called()
+
+
+def test_retried_summary_stage_does_not_call_the_llm_again(text_file):
+    processor = _ollama_processor()
+    extraction = processor._extract_text_metadata(text_file, "text/plain")
+
+    first = processor.summarize_sync(extraction)
+    # e.g. the DB commit failed and Celery retries the LLM stage
+    second = processor.summarize_sync(extraction)
+
+    assert processor.ollama_pool.complete.call_count == 1
+    assert first["analysis"]["summary_cached"] is False
+    assert second["analysis"]["summary_cached"] is True
+    assert second["analysis"]["summary"] == first["analysis"]["summary"]
+
+
+def test_gemini_summaries_are_keyed_by_file_not_by_extracted_text(tmp_path):
+    processor = _ollama_processor()
+    processor.provider = "gemini"
+    scan_a, scan_b = tmp_path / "a.pdf", tmp_path / "b.pdf"
+    scan_a.write_bytes(b"%PDF- first user's scan")
+    scan_b.write_bytes(b"%PDF- another user's scan")
+
+    unreadable = ExtractionResult(pages=[PageText(number=1, text=OCR_FAILED_TEXT, method=OCR)])
+    # Every unreadable scan has the same placeholder text: never cached
+    assert processor._summary_key(unreadable, str(scan_a), "application/pdf") is None
+
+    same_text = ExtractionResult(pages=[PageText(number=1, text="Identical extracted text. " * 5)])
+    key_a = processor._summary_key(same_text, str(scan_a), "application/pdf")
+    key_b = processor._summary_key(same_text, str(scan_b), "application/pdf")
+    assert key_a and key_b and key_a != key_b
+    assert processor._summary_key(same_text, str(scan_a), "application/pdf") == key_a
+
+
+def _fake_pdf_reader(page_texts):
+    reader = MagicMock()
+    reader.pages = []
+    for text in page_texts:
+        page = MagicMock()
+        page.extract_text.return_value = text
+        reader.pages.append(page)
+    return reader
+
+
+def test_mixed_pdf_only_ocrs_pages_without_text_layer():
+    digital = "This page has a perfectly good text layer with plenty of characters."
+    processor = DocumentProcessor()
+    processor.ocr_engine = MagicMock()
+    processor.ocr_engine.ocr_pdf.side_effect = lambda path, numbers: [
+        OcrPageResult(number=n, text=f"Scanned page {n} recovered by tesseract OCR engine.", seconds=0.1)
+        for n in numbers
+    ]
+
+    reader = _fake_pdf_reader([digital, "", digital, "  "])
+    with patch("app.infrastructure.processing.processor_service.PdfReader", return_value=reader):
+        result = processor._extract_text_metadata("mixed.pdf", "application/pdf")
+
+    processor.ocr_engine.ocr_pdf.assert_called_once_with("mixed.pdf", [2, 4])
+    assert result.method == HYBRID
+    assert [p.method for p in result.pages] == [TEXT_LAYER, OCR, TEXT_LAYER, OCR]
+    assert result.text.index("Scanned page 2") < result.text.index("Scanned page 4")
+    assert result.describe()["ocr_pages"] == 2
+
+
+def test_digital_pdf_never_touches_ocr():
+    processor = DocumentProcessor()
+    processor.ocr_engine = MagicMock()
+
+    reader = _fake_pdf_reader(["A digital page with more than enough characters to skip OCR."] * 3)
+    with patch("app.infrastructure.processing.processor_service.PdfReader", return_value=reader):
+        result = processor._extract_text_metadata("digital.pdf", "application/pdf")
+
+    processor.ocr_engine.ocr_pdf.assert_not_called()
+    assert result.method == TEXT_LAYER
+    assert result.page_count == 3
@@ -0,0 +1,93 @@
+import hashlib
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.infrastructure.storage.local_storage import LocalStorage
+from app.infrastructure.storage.minio_service import MinioStorage
+from app.infrastructure.storage.r2_storage import R2Storage
+from app.infrastructure.storage.streaming import MULTIPART_PART_SIZE
+
+
+async def _chunks(data: bytes, size: int = 1024 * 1024):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+@pytest.mark.asyncio
+async def test_local_upload_stream_writes_chunks_and_hashes(tmp_path):
+    data = b"x" * (3 * 1024 * 1024 + 17)
+
+    with patch("app.infrastructure.storage.local_storage.LOCAL_UPLOAD_DIR", tmp_path):
+        stored = await LocalStorage().upload_stream("doc-1", "big.txt", _chunks(data), "text/plain")
+
+    assert stored.size == len(data)
+    assert stored.sha256 == hashlib.sha256(data).hexdigest()
+    assert (tmp_path / "doc-1").read_bytes() == data
+    assert not (tmp_path / "doc-1.part").exists()
+
+
+@pytest.mark.asyncio
+async def test_local_upload_stream_removes_the_part_file_when_a_write_fails(tmp_path):
+    async def failing_chunks():
+        yield b"first chunk"
+        raise PermissionError("volume became read-only")
+
+    with patch("app.infrastructure.storage.local_storage.LOCAL_UPLOAD_DIR", tmp_path):
+        with pytest.raises(PermissionError):
+            await LocalStorage().upload_stream("doc-1", "big.txt", failing_chunks(), "text/plain")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def _r2_storage() -> R2Storage:
+    storage = R2Storage.__new__(R2Storage)
+    storage.client = MagicMock()
+    storage.client.create_multipart_upload.return_value = {"UploadId": "up-1"}
+    storage.client.upload_part.side_effect = lambda **kw: {"ETag": f"etag-{kw['PartNumber']}"}
+    storage.bucket = "test-bucket"
+    return storage
+
+
+@pytest.mark.asyncio
+async def test_r2_small_upload_uses_a_single_put():
+    storage = _r2_storage()
+
+    stored = await storage.upload_stream("doc-2", "small.pdf", _chunks(b"%PDF-1.4 small"), "application/pdf")
+
+    storage.client.put_object.assert_called_once()
+    storage.client.create_multipart_upload.assert_not_called()
+    assert stored.size == 14
+
+
+@pytest.mark.asyncio
+async def test_r2_large_upload_is_sent_as_multipart():
+    storage = _r2_storage()
+    data = b"y" * (MULTIPART_PART_SIZE * 2 + 10)
+
+    stored = await storage.upload_stream("doc-3", "large.pdf", _chunks(data), "application/pdf")
+
+    assert storage.client.upload_part.call_count == 3
+    parts = storage.client.complete_multipart_upload.call_args.kwargs["MultipartUpload"]["Parts"]
+    assert [p["PartNumber"] for p in parts] == [1, 2, 3]
+    assert stored.sha256 == hashlib.sha256(data).hexdigest()
+    storage.client.put_object.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_minio_calls_run_off_the_event_loop_and_bucket_check_is_cached():
+    storage = MinioStorage.__new__(MinioStorage)
+    storage.client = MagicMock()
+    storage.client.bucket_exists.return_value = True
+    storage.bucket = "test-bucket"
+    storage._bucket_ready = False
+    put_threads = []
+    storage.client.put_object.side_effect = lambda **kw: put_threads.append(threading.current_thread().name)
+
+    for i in range(3):
+        await storage.upload_stream(f"doc-{i}", "a.pdf", _chunks(b"%PDF-1.4 data"), "application/pdf")
+
+    storage.client.bucket_exists.assert_called_once_with("test-bucket")
+    assert len(put_threads) == 3
+    assert all(name.startswith("storage-io") for name in put_threads)
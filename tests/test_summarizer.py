@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.domain.extraction import PageText
+from app.infrastructure.processing.summarizer import ChunkedSummarizer, chunk_pages
+
+
+def _pages(count: int, paragraph: str = "word " * 60) -> list[PageText]:
+    return [PageText(number=n, text=f"Page {n} intro.\n\n{paragraph.strip()}") for n in range(1, count + 1)]
+
+
+def test_chunks_break_on_paragraph_boundaries_and_respect_size():
+    chunks = chunk_pages(_pages(10), chunk_size=1000, overlap=0)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    # No paragraph is cut in half when it fits in a chunk
+    assert all(not chunk.startswith("ord") for chunk in chunks)
+    assert chunks[0].startswith("Page 1 intro.")
+    assert all(f"Page {n} intro." in "".join(chunks) for n in range(1, 11))
+
+
+def test_overlap_repeats_the_tail_of_the_previous_chunk():
+    chunks = chunk_pages(_pages(6), chunk_size=800, overlap=100)
+
+    assert len(chunks) > 1
+    assert chunks[0][-40:] in chunks[1]
+
+
+def test_short_document_uses_a_single_request():
+    prompts = []
+    summarizer = ChunkedSummarizer(lambda p: prompts.append(p) or "- a", chunk_size=8000, overlap=0, concurrency=2)
+
+    result = summarizer.summarize(_pages(1))
+
+    assert len(prompts) == 1
+    assert result.chunks == 1
+    assert "summary" in result.timings
+
+
+def test_long_document_is_map_reduced_with_bounded_concurrency():
+    in_flight, peak = 0, 0
+    lock = threading.Lock()
+
+    def complete(prompt: str) -> str:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return "- final" if prompt.startswith("Below are notes") else "- note"
+
+    summarizer = ChunkedSummarizer(complete, chunk_size=1000, overlap=0, concurrency=3)
+    result = summarizer.summarize(_pages(20))
+
+    assert result.text == "- final"
+    assert result.chunks > 3
+    assert peak <= 3
+    assert {"summary_map", "summary_reduce", "summary"} <= result.timings.keys()
+
+
+def test_documents_over_the_chunk_limit_record_the_sampling():
+    mapped = []
+
+    def complete(prompt: str) -> str:
+        mapped.append(prompt)
+        return "- note"
+
+    summarizer = ChunkedSummarizer(complete, chunk_size=1000, overlap=0, concurrency=1, max_chunks=4)
+    result = summarizer.summarize(_pages(20))
+
+    # 4 map prompts + 1 reduce, but the analysis says the document was longer
+    assert len(mapped) == 5
+    assert result.chunks == 4
+    assert result.total_chunks > 4
+    assert result.sampled
+
+
+@pytest.mark.asyncio
+async def test_async_map_reduce_bounds_concurrency():
+    in_flight, peak, mapped = 0, 0, []
+
+    async def acomplete(prompt: str) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if prompt.startswith("Below are notes"):
+            return "- final"
+        mapped.append(prompt)
+        return "- note"
+
+    summarizer = ChunkedSummarizer(lambda p: "unused", chunk_size=1000, overlap=0, concurrency=3, acomplete=acomplete)
+    result = await summarizer.asummarize(_pages(20))
+
+    assert result.text == "- final"
+    assert result.chunks > 3
+    assert peak <= 3
+    assert len(mapped) >= result.chunks
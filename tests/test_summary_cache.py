@@ -0,0 +1,126 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.domain.summary import SummaryResult
+from app.infrastructure.processing.summary_cache import REDIS_INDEX, SummaryCache, summary_key
+
+
+class FakeRedis:
+    """Strings with TTL ignored, plus the sorted-set commands used for eviction."""
+
+    def __init__(self):
+        self.data = {}
+        self.index = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def zadd(self, name, mapping):
+        self.index.update(mapping)
+
+    def zremrangebyscore(self, name, low, high):
+        for key in [k for k, score in self.index.items() if low <= score <= high]:
+            del self.index[key]
+
+    def zcard(self, name):
+        return len(self.index)
+
+    def zpopmin(self, name, count):
+        oldest = sorted(self.index.items(), key=lambda item: item[1])[:count]
+        for key, _ in oldest:
+            del self.index[key]
+        return oldest
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def execute(self):
+        pass
+
+
+class DownRedis:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, key):
+        self.calls += 1
+        raise RedisConnectionError("connection refused")
+
+
+def test_key_ignores_whitespace_but_not_model_or_prompt_version():
+    base = summary_key("Quarterly  revenue\n\ngrew.", "ollama", "qwen", 0.2, "1")
+
+    assert base == summary_key("Quarterly revenue grew.", "ollama", "qwen", 0.2, "1")
+    assert base != summary_key("Quarterly revenue grew.", "ollama", "llama3", 0.2, "1")
+    assert base != summary_key("Quarterly revenue grew.", "ollama", "qwen", 0.2, "2")
+    assert base != summary_key("Quarterly revenue grew.", "ollama", "qwen", 0.7, "1")
+
+
+def test_redis_tier_is_shared_and_evicts_the_oldest_entries():
+    redis = FakeRedis()
+    writer = SummaryCache(lambda: redis, max_entries=2)
+    for n in range(3):
+        writer.set(f"k{n}", SummaryResult(text=f"- summary {n}", chunks=n + 1, total_chunks=n + 5))
+        time.sleep(0.001)
+
+    # Another process: nothing local, served from Redis
+    reader = SummaryCache(lambda: redis, max_entries=2)
+    assert reader.get("k0") is None
+    hit = reader.get("k2")
+    assert (hit.text, hit.chunks, hit.total_chunks, hit.cached) == ("- summary 2", 3, 7, True)
+    assert set(redis.index) == {"k1", "k2"}
+    assert REDIS_INDEX not in redis.data
+
+
+def test_local_tier_is_lru_bounded_and_oversized_summaries_are_skipped():
+    cache = SummaryCache(local_entries=2, max_bytes=100)
+    cache.set("a", SummaryResult(text="- a"))
+    cache.set("b", SummaryResult(text="- b"))
+    cache.get("a")
+    cache.set("c", SummaryResult(text="- c"))
+    cache.set("huge", SummaryResult(text="x" * 200))
+
+    assert cache.get("b") is None
+    assert cache.get("a").text == "- a"
+    assert cache.get("huge") is None
+
+
+def test_local_tier_survives_concurrent_threads():
+    # Switch threads as often as possible to force interleaving
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    cache = SummaryCache(local_entries=8, ttl_seconds=0.001)
+
+    def hammer(worker: int):
+        for n in range(2000):
+            key = f"k{n % 16}"
+            cache.set(key, SummaryResult(text=f"- {worker}"))
+            cache.get(key)
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(hammer, range(8)))
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert len(cache._entries) <= 8
+
+
+def test_redis_outage_falls_back_to_the_local_tier_without_retrying_every_call():
+    redis = DownRedis()
+    cache = SummaryCache(lambda: redis)
+
+    assert cache.get("k") is None
+    assert cache.get("k") is None
+    assert redis.calls == 1
+
@@ -0,0 +1,96 @@
+from datetime import datetime
+
+import pytest
+from openpyxl import Workbook
+
+from app.infrastructure.config import settings
+from app.infrastructure.processing.processor_service import DocumentProcessor
+from app.infrastructure.processing.tabular import extract_csv, extract_spreadsheet
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    workbook = Workbook()
+    invoices = workbook.active
+    invoices.title = "Invoices"
+    invoices.append(["number", "issued", "customer", "amount"])
+    for n in range(1, 31):
+        invoices.append([n, datetime(2025, 1, n), "acme" if n % 3 else None, n * 10.5])
+
+    notes = workbook.create_sheet("Notes")
+    notes.append(["note"])
+    notes.append(["second sheet is read too"])
+
+    path = tmp_path / "book.xlsx"
+    workbook.save(path)
+    return str(path)
+
+
+def test_spreadsheet_streams_every_sheet_and_profiles_all_rows(workbook_path, monkeypatch):
+    monkeypatch.setattr(settings, "tabular_max_rows", 10)
+    monkeypatch.setattr(settings, "tabular_chunk_rows", 7)
+
+    result = extract_spreadsheet(workbook_path)
+
+    invoices, notes = result.sections
+    assert invoices.splitlines()[:3] == [
+        "## Sheet: Invoices",
+        "number | issued | customer | amount",
+        "1 | 2025-01-01 | acme | 10.5",
+    ]
+    assert invoices.endswith("... 20 more rows (see column profile)")
+    # The 10-row budget is shared by the whole workbook
+    assert "second sheet" not in notes
+
+    number, issued, customer, amount = result.tables[0]["columns"]
+    assert result.tables[0]["rows"] == 30
+    assert (number["type"], number["min"], number["max"]) == ("number", 1, 30)
+    assert (issued["type"], issued["min"], issued["max"]) == ("datetime", "2025-01-01", "2025-01-30")
+    assert customer["null_ratio"] == round(10 / 30, 4)
+    assert customer["top_values"] == [["acme", 20]]
+    assert amount["max"] == 315
+    assert result.tables[1]["sheet"] == "Notes"
+
+
+def test_csv_detects_the_delimiter_and_treats_blanks_as_null(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("city;temp\nLagos;31\nAbuja;\nLagos;n/a\n")
+
+    result = extract_csv(str(path))
+
+    assert result.sections[0] == "city | temp\nLagos | 31\nAbuja | \nLagos | n/a"
+    city, temp = result.tables[0]["columns"]
+    assert city["top_values"][0] == ["Lagos", 2]
+    assert temp["type"] == "mixed"
+    assert temp["null_ratio"] == round(1 / 3, 4)
+
+
+def test_profile_does_not_depend_on_the_dtype_pandas_infers(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "tabular_chunk_rows", 3)
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["when", "score"])
+    # First chunk: dates mixed with text (object dtype); second chunk: dates only
+    for when, score in [
+        (datetime(2024, 1, 1), 5.0), (datetime(2024, 3, 5, 10, 30), 5.0), ("n/a", 7.5),
+        (datetime(2024, 1, 1), 5.0), (datetime(2024, 2, 1), 7.5),
+    ]:
+        sheet.append([when, score])
+    path = tmp_path / "mixed.xlsx"
+    workbook.save(path)
+
+    when, score = extract_spreadsheet(str(path)).tables[0]["columns"]
+
+    assert (when["type"], when["min"], when["max"]) == ("mixed", "2024-01-01", "2024-03-05 10:30:00")
+    assert when["top_values"][0] == ["2024-01-01", 2]
+    assert "n/a" in dict(when["top_values"])
+    assert dict(score["top_values"]) == {"5": 3, "7.5": 2}
+
+
+def test_processor_keeps_one_page_per_sheet(workbook_path):
+    mime = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+    result = DocumentProcessor()._extract_text_metadata(workbook_path, mime)
+
+    assert result.page_count == 2
+    assert result.describe()["tables"][0]["rows"] == 30
@@ -0,0 +1,59 @@
+import json
+import pytest
+from httpx import AsyncClient
+from unittest.mock import patch
+
+
+class FakeResultBackend:
+    def __init__(self, data: dict):
+        self.data = data
+        self.calls = []
+
+    async def mget(self, keys):
+        self.calls.append(keys)
+        return [self.data.get(key) for key in keys]
+
+
+@pytest.mark.asyncio
+async def test_batch_status_resolves_all_tasks_with_one_mget(client: AsyncClient):
+    user = {"email": "poller@example.com", "password": "password123"}
+    await client.post("/api/v1/auth/register", json=user)
+    login = await client.post("/api/v1/auth/login", json=user)
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    backend = FakeResultBackend({
+        "celery-task-meta-done": json.dumps({"status": "SUCCESS", "result": {"document_id": "d1", "status": "COMPLETED"}}),
+        "celery-task-meta-broken": json.dumps({"status": "FAILURE", "result": {"exc_type": "ProcessingError", "exc_message": "AI Engine failed"}}),
+        "celery-task-meta-busy": json.dumps({"status": "RETRY", "result": None}),
+    })
+
+    with patch("app.application.use_case.get_task_status.get_async_result_backend", return_value=backend):
+        response = await client.post(
+            "/api/v1/tasks/status",
+            headers=headers,
+            json={"task_ids": ["done", "broken", "busy", "queued", "done"]},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["tasks"] == {
+        "done": {"status": "SUCCESS", "result": {"document_id": "d1", "status": "COMPLETED"}},
+        "broken": {"status": "FAILURE", "error": "AI Engine failed"},
+        "busy": {"status": "RETRY"},
+        "queued": {"status": "PENDING"},
+    }
+    assert len(backend.calls) == 1
+    assert len(backend.calls[0]) == 4
+
+
+@pytest.mark.asyncio
+async def test_batch_status_requires_auth_and_bounded_input(client: AsyncClient):
+    response = await client.post("/api/v1/tasks/status", json={"task_ids": ["a"]})
+    assert response.status_code in (401, 403)
+
+    user = {"email": "poller2@example.com", "password": "password123"}
+    await client.post("/api/v1/auth/register", json=user)
+    login = await client.post("/api/v1/auth/login", json=user)
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    response = await client.post("/api/v1/tasks/status", headers=headers, json={"task_ids": [str(i) for i in range(101)]})
+    assert response.status_code == 422
@@ -0,0 +1,30 @@
+import random
+import sys
+
+import pytest
+
+from app.infrastructure.processing.text_sanitizer import MAX_REPLACE_PASSES, sanitize_text
+from tests.benchmarks.reference import reference_sanitize
+
+# Characters PDFs and OCR actually produce: controls, NBSP, soft hyphen, BOM, ZWSP, line separators
+TRICKY = "ab \n\r\t\x00\x07\x0b\x0c\x1b\x7f\x85\xa0\xad\u200b\u2028\u3000\ufeff\ud800é文"
+
+
+def _random_text(rng: random.Random, length: int, alphabet_size: int) -> str:
+    alphabet = [chr(rng.randrange(sys.maxunicode + 1)) for _ in range(alphabet_size)] + list(TRICKY)
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_reference_on_random_unicode(seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        # Small alphabets take the replace() path, large ones the regex path
+        text = _random_text(rng, rng.randrange(200), rng.choice([1, 5, MAX_REPLACE_PASSES * 4]))
+        assert sanitize_text(text) == reference_sanitize(text)
+
+
+def test_keeps_whitespace_and_strips_controls():
+    assert sanitize_text("\x00 Total:\x0c 12\xa0€\n\tnext\x07 ") == "Total: 12€\n\tnext"
+    assert sanitize_text("") == ""
+    assert sanitize_text(None) == ""
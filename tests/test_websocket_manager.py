@@ -0,0 +1,214 @@
+import asyncio
+import json
+import pytest
+
+from app.api.v1.websocket_manager import ConnectionManager
+from app.infrastructure.queue.events import publish_task_event
+
+
+class FakePubSub:
+    def __init__(self, hub):
+        self.hub = hub
+        self.patterns = []
+
+    async def psubscribe(self, pattern):
+        self.patterns.append(pattern)
+
+    async def listen(self):
+        # Like Redis, confirm the subscription (after a delay) before delivering anything
+        await asyncio.sleep(self.hub.subscribe_delay)
+        self.hub.subscribed.set()
+        yield {"type": "psubscribe", "pattern": None, "channel": self.patterns[0], "data": 1}
+        while True:
+            channel, data = await self.hub.messages.get()
+            yield {"type": "pmessage", "pattern": self.patterns[0], "channel": channel, "data": data}
+
+    async def punsubscribe(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakeRedis:
+    """Counts pubsub connections and lets the test publish messages."""
+    def __init__(self, subscribe_delay: float = 0.0):
+        self.pubsubs = []
+        self.messages = asyncio.Queue()
+        self.subscribed = asyncio.Event()
+        self.subscribe_delay = subscribe_delay
+        self.streams = {}
+
+    def pubsub(self):
+        pubsub = FakePubSub(self)
+        self.pubsubs.append(pubsub)
+        return pubsub
+
+    def publish(self, task_id, data):
+        # Pub/Sub is fire-and-forget: nobody subscribed yet means nobody hears it
+        if not self.subscribed.is_set():
+            return
+        self.messages.put_nowait((f"notifications_{task_id}", json.dumps(data)))
+
+    def store(self, task_id, data, event_id):
+        self.streams.setdefault(f"task_events:{task_id}", []).append((event_id, {"data": json.dumps(data)}))
+
+    async def xrange(self, name, min="-", max="+"):
+        entries = self.streams.get(name, [])
+        if min == "-":
+            return entries
+        return [(i, f) for i, f in entries if tuple(map(int, i.split("-"))) >= tuple(map(int, min.split("-")))]
+
+
+class FakeSocket:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, data):
+        await asyncio.sleep(self.delay)
+        self.sent.append(data)
+
+
+async def _connect(manager, task_id, socket):
+    task = asyncio.create_task(manager.connect(task_id, socket))
+    await asyncio.sleep(0)
+    return task
+
+
+@pytest.mark.asyncio
+async def test_sockets_share_one_subscription_and_every_tab_gets_updates():
+    redis = FakeRedis()
+    manager = ConnectionManager(redis_factory=lambda: redis, queue_size=8)
+    tab_1, tab_2, other = FakeSocket(), FakeSocket(), FakeSocket()
+
+    tasks = [
+        await _connect(manager, "task-1", tab_1),
+        await _connect(manager, "task-1", tab_2),
+        await _connect(manager, "task-2", other),
+    ]
+    await asyncio.wait_for(redis.subscribed.wait(), 1)
+    assert len(manager.active_connections["task-1"]) == 2
+
+    redis.publish("task-1", {"status": "COMPLETED"})
+    redis.publish("task-2", {"status": "FAILED"})
+    await asyncio.wait_for(asyncio.gather(*tasks), 1)
+
+    assert len(redis.pubsubs) == 1
+    assert redis.pubsubs[0].patterns == ["notifications_*"]
+    assert tab_1.sent == tab_2.sent == [{"status": "COMPLETED"}]
+    assert other.sent == [{"status": "FAILED"}]
+    assert manager.active_connections == {}
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_block_others_and_keeps_latest_updates():
+    redis = FakeRedis()
+    manager = ConnectionManager(redis_factory=lambda: redis, queue_size=2)
+    slow, fast = FakeSocket(delay=0.05), FakeSocket()
+
+    tasks = [await _connect(manager, "task-1", slow), await _connect(manager, "task-1", fast)]
+    await asyncio.wait_for(redis.subscribed.wait(), 1)
+
+    for i in range(5):
+        redis.publish("task-1", {"status": "PROCESSING", "step": i})
+        await asyncio.sleep(0.005)
+    redis.publish("task-1", {"status": "COMPLETED"})
+
+    # The fast tab finishes while the slow one is still on its first send
+    await asyncio.wait_for(tasks[1], 0.04)
+    assert [m.get("step") for m in fast.sent] == [0, 1, 2, 3, 4, None]
+
+    await asyncio.wait_for(tasks[0], 1)
+    # Updates were dropped for the slow tab, but never the terminal one
+    assert len(slow.sent) < len(fast.sent)
+    assert slow.sent[-1] == {"status": "COMPLETED"}
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_late_client_replays_a_finished_task_from_the_stream():
+    redis = FakeRedis()
+    manager = ConnectionManager(redis_factory=lambda: redis)
+    redis.store("task-1", {"status": "PROCESSING"}, "1-0")
+    redis.store("task-1", {"status": "COMPLETED"}, "2-0")
+    socket = FakeSocket()
+
+    await asyncio.wait_for(manager.connect("task-1", socket), 1)
+
+    assert socket.sent == [
+        {"status": "PROCESSING", "event_id": "1-0"},
+        {"status": "COMPLETED", "event_id": "2-0"},
+    ]
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_resumes_after_last_event_without_duplicates():
+    redis = FakeRedis()
+    manager = ConnectionManager(redis_factory=lambda: redis)
+    for event_id, status in [("1-0", "PROCESSING"), ("2-0", "RETRYING"), ("3-0", "PROCESSING")]:
+        redis.store("task-1", {"status": status}, event_id)
+    socket = FakeSocket()
+
+    task = asyncio.create_task(manager.connect("task-1", socket, last_event_id="1-0"))
+    await asyncio.wait_for(redis.subscribed.wait(), 1)
+
+    # Live copy of an already replayed event, then the next new one
+    redis.publish("task-1", {"status": "PROCESSING", "event_id": "3-0"})
+    redis.publish("task-1", {"status": "COMPLETED", "event_id": "4-0"})
+    await asyncio.wait_for(task, 1)
+
+    assert [m["event_id"] for m in socket.sent] == ["2-0", "3-0", "4-0"]
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_event_published_before_the_subscription_is_confirmed_is_replayed():
+    redis = FakeRedis(subscribe_delay=0.05)
+    manager = ConnectionManager(redis_factory=lambda: redis)
+    socket = FakeSocket()
+
+    task = await _connect(manager, "task-1", socket)
+    # The worker finishes while the first client's subscription is still pending
+    redis.store("task-1", {"status": "COMPLETED"}, "1-0")
+    redis.publish("task-1", {"status": "COMPLETED", "event_id": "1-0"})
+    await asyncio.wait_for(task, 1)
+
+    assert socket.sent == [{"status": "COMPLETED", "event_id": "1-0"}]
+    await manager.close()
+
+
+def test_publish_task_event_stores_expires_and_publishes():
+    class FakeSyncRedis:
+        def __init__(self):
+            self.calls = []
+
+        def xadd(self, name, fields, maxlen=None, approximate=True):
+            self.calls.append(("xadd", name, maxlen))
+            return b"1700000000000-0"
+
+        def pipeline(self, transaction=True):
+            return self
+
+        def expire(self, name, seconds):
+            self.calls.append(("expire", name, seconds))
+
+        def publish(self, channel, message):
+            self.calls.append(("publish", channel, json.loads(message)))
+
+        def execute(self):
+            pass
+
+    redis = FakeSyncRedis()
+    event_id = publish_task_event(redis, "task-1", {"task_id": "task-1", "status": "COMPLETED"})
+
+    assert event_id == "1700000000000-0"
+    assert [c[0] for c in redis.calls] == ["xadd", "expire", "publish"]
+    assert redis.calls[0][1] == "task_events:task-1"
+    assert redis.calls[2][1] == "notifications_task-1"
+    assert redis.calls[2][2]["event_id"] == event_id